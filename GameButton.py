@@ -1,6 +1,7 @@
-import arcade
 from arcade.gui import UITextureButton, UITextureButtonStyle
 
+from client.TextureRegistry import TextureRegistry
+
 
 class GameButton(UITextureButton):
     """A UITextureButton that uses ARCO font by default with color selection."""
@@ -26,9 +27,9 @@ class GameButton(UITextureButton):
             color = "red"  # Fallback to red if invalid color
 
         # Load textures for the specified color
-        self.texture = arcade.load_texture(self.BUTTON_TEXTURES[color]["normal"])
-        self.texture_hovered = arcade.load_texture(self.BUTTON_TEXTURES[color]["hover"])
-        self.texture_pressed = arcade.load_texture(self.BUTTON_TEXTURES[color]["press"])
+        self.texture = TextureRegistry.get(self.BUTTON_TEXTURES[color]["normal"])
+        self.texture_hovered = TextureRegistry.get(self.BUTTON_TEXTURES[color]["hover"])
+        self.texture_pressed = TextureRegistry.get(self.BUTTON_TEXTURES[color]["press"])
 
     def __init__(
             self,
@@ -48,9 +49,9 @@ class GameButton(UITextureButton):
             color = "red"  # Fallback to red if invalid color specified
 
         # Load textures for the specified color
-        texture_normal = arcade.load_texture(self.BUTTON_TEXTURES[color]["normal"])
-        texture_hover = arcade.load_texture(self.BUTTON_TEXTURES[color]["hover"])
-        texture_press = arcade.load_texture(self.BUTTON_TEXTURES[color]["press"])
+        texture_normal = TextureRegistry.get(self.BUTTON_TEXTURES[color]["normal"])
+        texture_hover = TextureRegistry.get(self.BUTTON_TEXTURES[color]["hover"])
+        texture_press = TextureRegistry.get(self.BUTTON_TEXTURES[color]["press"])
 
         # Convert style if it's a single UITextureButtonStyle object
         if isinstance(style, UITextureButtonStyle):
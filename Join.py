@@ -2,6 +2,7 @@ import threading
 import arcade
 import client.Client as Client
 from Lobby import LobbyView
+from network.Discovery import discover_servers
 from arcade.gui import (
     UIView,
     UIAnchorLayout,
@@ -36,9 +37,16 @@ class JoinGameView(UIView):
 
         self.last_ip = self.load_last_ip()
 
+        # LAN discovery state
+        self.discovering = False
+        self.discovered_servers = []
+
         # Setup UI
         self.setup_ui()
 
+        # Look for servers on the LAN right away
+        self.refresh_servers()
+
     def setup_ui(self):
         """Setup the user interface"""
         self.main_layout = UIBoxLayout(vertical=True, space_between=20)
@@ -66,6 +74,17 @@ class JoinGameView(UIView):
         self.btn_join.on_click = self.join_server
         self.main_layout.add(self.btn_join)
 
+        # LAN servers found by discovery, fastest first
+        lan_label = UILabel(text="LAN servery:", font_size=24, text_color=arcade.color.WHITE)
+        self.main_layout.add(lan_label)
+
+        self.server_list_layout = UIBoxLayout(vertical=True, space_between=10)
+        self.main_layout.add(self.server_list_layout)
+
+        self.btn_refresh = GameButton(text="Refresh", color="green", width=200, height=40)
+        self.btn_refresh.on_click = lambda event: self.refresh_servers()
+        self.main_layout.add(self.btn_refresh)
+
         self.loading_label = UILabel(
             text="Connecting to server...",
             font_size=20,
@@ -127,6 +146,55 @@ class JoinGameView(UIView):
 
         self.btn_join.disabled = False
 
+    def refresh_servers(self):
+        """Broadcast a discovery beacon and probe all responders in a background thread"""
+        if self.discovering:
+            return
+        self.discovering = True
+        self.btn_refresh.disabled = True
+
+        def discovery_thread():
+            try:
+                servers = discover_servers()
+            except Exception as e:
+                print(f"LAN discovery failed: {e}")
+                servers = []
+            arcade.schedule_once(lambda dt: self.on_servers_discovered(servers), 0)
+
+        threading.Thread(target=discovery_thread, daemon=True).start()
+
+    def on_servers_discovered(self, servers):
+        self.discovering = False
+        self.btn_refresh.disabled = False
+        self.discovered_servers = servers
+        self.server_list_layout.clear()
+
+        if not servers:
+            self.server_list_layout.add(
+                UILabel(text="No servers found", font_size=16, text_color=arcade.color.LIGHT_GRAY))
+            return
+
+        for server in servers[:4]:
+            rtt_text = f"{server.rtt * 1000:.0f} ms" if server.rtt is not None else "? ms"
+            status = "in game" if server.in_game else f"{server.players}/{server.max_players}"
+            button = GameButton(
+                text=f"{server.name}  {status}  {rtt_text}",
+                color="green" if server.joinable else "red",
+                width=360,
+                height=45
+            )
+            button.on_click = lambda event, s=server: self.join_discovered_server(s)
+            self.server_list_layout.add(button)
+
+    def join_discovered_server(self, server):
+        """Connect to a server picked from the LAN list"""
+        if self.connecting:
+            return
+        address = f"{server.ip}:{server.port}"
+        self.server_ip_input.text = address
+        self.save_last_ip(address)
+        self.connect_to(server.ip, server.port)
+
     def join_server(self, event):
         """Handle join server button click"""
         if self.connecting:
@@ -156,7 +224,10 @@ class JoinGameView(UIView):
             return
 
         self.save_last_ip(server_ip)
+        self.connect_to(ip, port)
 
+    def connect_to(self, ip, port):
+        """Connect in a background thread and move to the lobby on success"""
         self.show_loading()
 
         def connect_thread():
@@ -11,6 +11,7 @@ from pathlib import Path
 from GameButton import GameButton
 import json
 from LobbyPlayer import TankButton
+from client.AssetPreloader import AssetPreloader
 
 project_root = Path(__file__).resolve().parent
 path = project_root / "client" / "assets"
@@ -71,6 +72,13 @@ class LobbyView(UIView):
         anchor.add(child=exit_button, anchor_x="right", anchor_y="top", align_x=-10, align_y=-10)
         self.ui.add(anchor)
 
+        # Map download progress (clients fetch missing maps from the server)
+        self.download_text = arcade.Text("", 10, 10, arcade.color.LIGHT_GRAY, 14)
+
+        # Decode the match assets in the background while players gather
+        AssetPreloader.preload_common()
+        self.preload_text = arcade.Text("", 10, 30, arcade.color.LIGHT_GRAY, 14)
+
         # INSTANT LOADING: Load initial players immediately
         self.load_initial_players()
 
@@ -260,6 +268,15 @@ class LobbyView(UIView):
         )
 
     def on_draw_after_ui(self):
+        downloader = getattr(self.client_or_server, 'map_downloader', None) if self.is_client else None
+        if downloader and not downloader.is_ready():
+            self.download_text.text = f"Downloading maps... {downloader.progress() * 100:.0f}%"
+            self.download_text.draw()
+
+        if not AssetPreloader.is_ready():
+            self.preload_text.text = f"Loading assets... {AssetPreloader.progress() * 100:.0f}%"
+            self.preload_text.draw()
+
         if self.show_loading:
             arcade.draw_lbwh_rectangle_filled(0, 0, self.width, self.height, Color(0, 0, 0, 170))
 
@@ -268,6 +285,9 @@ class LobbyView(UIView):
             self.show_loading = True
 
             self.client_or_server.broadcast_selected_map()
+            if self.client_or_server.picked_map:
+                AssetPreloader.preload_map(self.client_or_server.picked_map,
+                                           quality=settings.get("background_quality", "high"))
 
             # Send with acknowledgment requirement
 
@@ -1,6 +1,7 @@
-import arcade
 from arcade.gui import UIBoxLayout, UITextureButton, UILabel
 
+from client.TextureRegistry import TextureRegistry
+
 
 class TankButton(UIBoxLayout):
     """A composite widget with a tank texture button and name text below."""
@@ -30,7 +31,7 @@ class TankButton(UIBoxLayout):
         # Validate and load texture
         if color not in self.TANK_TEXTURES:
             color = "blue"
-        texture_normal = arcade.load_texture(self.TANK_TEXTURES[color])
+        texture_normal = TextureRegistry.get(self.TANK_TEXTURES[color])
 
         # Create tank button
         self.tank_button = UITextureButton(
@@ -56,7 +57,7 @@ class TankButton(UIBoxLayout):
 
     def set_color(self, color):
         if color in self.TANK_TEXTURES:
-            texture = arcade.load_texture(self.TANK_TEXTURES[color])
+            texture = TextureRegistry.get(self.TANK_TEXTURES[color])
             self.tank_button.texture = texture
             self.current_color = color
 
@@ -12,6 +12,7 @@ from Join import JoinGameView
 from Create import CreateGameView
 from SettingsWindow import background_music, music_player
 from GameButton import GameButton
+from core.Profiler import Profiler
 
 project_root = Path(__file__).resolve().parent
 path = project_root / "client" / "assets"
@@ -207,6 +208,10 @@ if __name__ == "__main__":
     # Load user settings
     settings = load_settings()
 
+    # Frame and network phase timings, exported as a Chrome trace with P in game and at exit
+    if settings.get("profiler", False):
+        Profiler.configure(True, settings.get("profiler_capacity", 65536))
+
     # Create a window with user-defined settings using our custom GameWindow class
     window = GameWindow(
         title="Tactical Tank's",
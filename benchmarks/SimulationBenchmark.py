@@ -0,0 +1,345 @@
+"""
+Headless simulation benchmark: steps the core world of a match without a
+window at a configurable scale and writes per-step timings as JSON.
+
+    python -m benchmarks.SimulationBenchmark --tanks 4 16 --bullets 64 256 --entities 0 200
+    python -m benchmarks.SimulationBenchmark --baseline .cache/benchmarks/main.json
+
+Every combination of map, tank, bullet and entity count is one run. Tanks
+press and release fire on a random schedule like players do and never die,
+bullets are topped up to the requested number every tick, so the load stays
+steady. Runs are seeded and repeat the same simulation on every branch.
+"""
+import argparse
+import json
+import math
+import platform
+import random
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import arcade
+import numpy as np
+
+from client.AssetPreloader import GAME_SIZE
+from client.assets.effects.EffectsManager import EffectsManager
+from client.assets.effects.ExplosionEffect import ExplosionEffect
+from client.assets.effects.FireEffect import FireEffect
+from core.Arena import Arena
+from core.CollisionGrid import bake_collision_grid
+from core.Profiler import Profiler
+from core.State import TankState
+from core.World import World, step
+from non_player.StaticEntity import StaticEntity
+
+project_root = Path(__file__).resolve().parent.parent
+path = project_root / "client" / "assets"
+arcade.resources.add_resource_handle("assets", str(path.resolve()))
+
+MAPS_DIR = project_root / ".config" / "maps"
+BENCHMARK_DIR = project_root / ".cache" / "benchmarks"
+
+TICK = 1 / 60
+BOUNDARY_THICKNESS = 20  # GameView's, the grid margin is rounded up to it
+
+# Reported phase -> Profiler scopes it adds up. Movement excludes the static
+# collision checks nested in it, those are reported on their own.
+PHASES = {
+    "movement": ("world.movement",),
+    "tank_static_collision": ("world.static_collision",),
+    "bullet_move": ("world.bullet_move",),
+    "bullet_tank_hits": ("world.bullet_tank_hits",),
+    "bullet_static_hits": ("world.bullet_static_hits",),
+    "effects": ("bench.effects",),
+}
+
+
+def percentile(values, share):
+    return values[min(len(values) - 1, int(len(values) * share))]
+
+
+def git_commit():
+    try:
+        result = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=project_root,
+                                capture_output=True, text=True, timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return result.stdout.strip() or None
+
+
+class SimulationBenchmark:
+    """One run: a map loaded into a fresh world with the given numbers of tanks, bullets and entities"""
+
+    def __init__(self, map_name, tanks=8, bullets=128, entities=100, ticks=600, warmup=60,
+                 grid_resolution=8, seed=0):
+        self.map_name = map_name
+        self.tank_count = tanks
+        self.bullet_count = bullets
+        self.entity_count = entities
+        self.ticks = ticks
+        self.warmup = warmup
+        self.grid_resolution = grid_resolution
+        self.seed = seed
+
+        # Own generator for inputs and bullets, create_random_entity draws from the module one
+        self.rng = random.Random(seed)
+        random.seed(seed)
+
+        with open(MAPS_DIR / f"{map_name}.json", "r") as file:
+            self.map_data = json.load(file)
+
+        width, height = GAME_SIZE
+        self.world = World(width, height)
+        self.world.arena = Arena.from_map(self.map_data, width, height)
+        self.effects_manager = EffectsManager(arcade.SpriteList(lazy=True))
+        self.input_ticks = {}  # TankState -> tick of its next press or release
+
+        self.load_entities()
+        self.bake_ms = self.load_collision_grid()
+        self.add_tanks()
+
+    def load_entities(self):
+        """The map's own entities, then random ones of the types the map uses"""
+        entity_types = set()
+        for entity_data in self.map_data.get("static_entities", []):
+            position = entity_data.get("position", {"x": 500, "y": 500})
+            entity_type = entity_data.get("type", "bush_small")
+            entity_types.add(entity_type)
+            entity = StaticEntity(position["x"], position["y"], entity_type, entity_data.get("hp", 1),
+                                  entity_data.get("scale", 1.0), entity_data.get("rotation", 0))
+            self.world.add_entity(entity.state)
+
+        entity_types = sorted(entity_types & StaticEntity.ENTITY_ASSETS.keys()) or None
+        for _ in range(self.entity_count):
+            entity = StaticEntity.create_random_entity(self.world.width, self.world.height, entity_types)
+            self.world.add_entity(entity.state)
+
+    def load_collision_grid(self):
+        """Bake the grid like GameView does, returns the baking time in ms or None without a grid"""
+        resolution = self.grid_resolution
+        if not resolution:
+            return None
+        start = time.perf_counter()
+        margin = math.ceil(BOUNDARY_THICKNESS / resolution) * resolution
+        grid = bake_collision_grid(
+            self.world.entities, self.world.arena, -margin, -margin,
+            self.world.width + 2 * margin, self.world.height + 2 * margin, resolution
+        )
+        self.world.set_collision_grid(grid)
+        return (time.perf_counter() - start) * 1000
+
+    def add_tanks(self):
+        """Tanks on the map's spawn points first, the rest wherever they fit"""
+        spawns = [(spawn["position"]["x"], spawn["position"]["y"], spawn.get("rotation", 0))
+                  for spawn in self.map_data.get("tank_spawns", []) if "position" in spawn]
+        arena = self.world.arena
+        for index in range(self.tank_count):
+            tank = TankState(player_id=f"bench-{index}")
+            tank.health = sys.maxsize  # Never destroyed, the load stays the same for the whole run
+            if index < len(spawns):
+                tank.x, tank.y, tank.angle = spawns[index]
+            else:
+                for _ in range(100):
+                    tank.x = self.rng.uniform(arena.left, arena.right)
+                    tank.y = self.rng.uniform(arena.bottom, arena.top)
+                    tank.angle = self.rng.uniform(0, 360)
+                    if not self.world.tank_blocked(tank, tank.x, tank.y):
+                        break
+            self.world.add_tank(tank)
+            self.input_ticks[tank] = self.rng.randint(1, 60)
+
+    def drive_tanks(self):
+        """Press and release fire on each tank's random schedule, firing on press like Tank does"""
+        tick = self.world.tick
+        shots = 0
+        for tank, next_tick in self.input_ticks.items():
+            if tick < next_tick:
+                continue
+            self.input_ticks[tank] = tick + self.rng.randint(12, 60)
+            if tank.is_moving:
+                tank.release()
+            elif tank.press() and tank.fire(self.world.bullets) is not None:
+                shots += 1
+                # Muzzle flash 40 px beyond the barrel, same as Tank.fire
+                barrel_x, barrel_y = tank.barrel_position()
+                angle_rad = math.radians(tank.angle)
+                self.effects_manager.add_effect(FireEffect.spawn(
+                    barrel_x + math.sin(angle_rad) * 40, barrel_y + math.cos(angle_rad) * 40, tank.angle))
+        return shots
+
+    def top_up_bullets(self):
+        """Spawn bullets at random points in the arena until the requested number is in flight"""
+        bullets, arena, tanks = self.world.bullets, self.world.arena, self.world.tanks
+        if not tanks:
+            return
+        while bullets.count < self.bullet_count:
+            x = self.rng.uniform(arena.left, arena.right)
+            y = self.rng.uniform(arena.bottom, arena.top)
+            if arena.contains_point(x, y):
+                bullets.spawn(x, y, self.rng.uniform(0, 360), self.rng.choice(tanks))
+
+    def tick(self):
+        """One frame of the simulation as GameView runs it, returns (shots, hits)"""
+        shots = self.drive_tanks()
+        self.top_up_bullets()
+        with Profiler.scope("bench.effects"):
+            self.effects_manager.update(TICK)
+        hits = step(self.world, TICK)
+        for impact_x, impact_y, kind, target in hits:
+            self.effects_manager.add_effect(ExplosionEffect.spawn(impact_x, impact_y))
+        return shots, hits
+
+    def run(self, capacity=None):
+        """Warm up, then time every tick with the world's phases recorded by the Profiler"""
+        Profiler.configure(enabled=False, capacity=1, export_at_exit=False)
+        for _ in range(self.warmup):
+            self.tick()
+
+        # Room for every span: a few per tick plus up to three collision checks per tank
+        Profiler.configure(enabled=True, capacity=capacity or self.ticks * (3 * self.tank_count + 16),
+                           export_at_exit=False)
+        entities_before = len(self.world.spatial_hash.polygons)
+        step_times = []
+        hit_counts = {"tank": 0, "entity": 0, "wall": 0}
+        shots = 0
+        bullets_in_flight = 0
+        effects_peak = 0
+
+        for _ in range(self.ticks):
+            start = time.perf_counter()
+            tick_shots, hits = self.tick()
+            step_times.append((time.perf_counter() - start) * 1000)
+
+            shots += tick_shots
+            for hit in hits:
+                hit_counts[hit[2]] += 1
+            bullets_in_flight += self.world.bullets.count
+            effects_peak = max(effects_peak, len(self.effects_manager.effects_list))
+        Profiler.enabled = False
+
+        totals = {}
+        for name, _, duration, _ in Profiler.events():
+            totals[name] = totals.get(name, 0.0) + duration
+        phases = {phase: sum(totals.get(scope, 0.0) for scope in scopes) * 1000 / self.ticks
+                  for phase, scopes in PHASES.items()}
+        phases["movement"] -= phases["tank_static_collision"]
+        phases = {phase: round(ms, 4) for phase, ms in phases.items()}
+
+        times = sorted(step_times)
+        return {
+            "map": self.map_name,
+            "tanks": self.tank_count,
+            "bullets": self.bullet_count,
+            "entities": self.entity_count,
+            "grid_resolution": self.grid_resolution,
+            "ticks": self.ticks,
+            "step_ms": {
+                "mean": round(sum(times) / len(times), 4),
+                "p50": round(percentile(times, 0.5), 4),
+                "p95": round(percentile(times, 0.95), 4),
+                "p99": round(percentile(times, 0.99), 4),
+                "max": round(times[-1], 4),
+            },
+            "phase_ms": phases,
+            "counts": {
+                "map_entities": len(self.world.entities) - self.entity_count,
+                "entities_destroyed": entities_before - len(self.world.spatial_hash.polygons),
+                "shots": shots,
+                "hits": hit_counts,
+                "bullets_mean": round(bullets_in_flight / self.ticks, 1),
+                "effects_peak": effects_peak,
+            },
+            "bake_ms": None if self.bake_ms is None else round(self.bake_ms, 1),
+        }
+
+
+def run_key(result):
+    return result["map"], result["tanks"], result["bullets"], result["entities"], result["grid_resolution"]
+
+
+def compare(results, baseline_path, threshold):
+    """Print the mean step time of every run against the baseline file, returns the regressed runs"""
+    with open(baseline_path, "r") as file:
+        baseline = {run_key(result): result for result in json.load(file)["results"]}
+
+    regressions = []
+    for result in results:
+        before = baseline.get(run_key(result))
+        if before is None:
+            print(f"  {result['map']:8} {result['tanks']:4} tanks: not in baseline")
+            continue
+        old, new = before["step_ms"]["mean"], result["step_ms"]["mean"]
+        change = (new - old) / old if old else 0.0
+        flag = "  REGRESSION" if change > threshold else ""
+        print(f"  {result['map']:8} {result['tanks']:4} tanks {result['bullets']:5} bullets "
+              f"{result['entities']:5} entities: {old:.3f} -> {new:.3f} ms ({change:+.1%}){flag}")
+        if flag:
+            regressions.append(result)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless benchmark of the game simulation")
+    parser.add_argument("--maps", nargs="+", default=sorted(p.stem for p in MAPS_DIR.glob("*.json")),
+                        help="map names from .config/maps (default: all)")
+    parser.add_argument("--tanks", nargs="+", type=int, default=[8])
+    parser.add_argument("--bullets", nargs="+", type=int, default=[128], help="bullets kept in flight")
+    parser.add_argument("--entities", nargs="+", type=int, default=[100],
+                        help="random static entities on top of the map's own")
+    parser.add_argument("--ticks", type=int, default=600, help="measured ticks per run")
+    parser.add_argument("--warmup", type=int, default=60)
+    parser.add_argument("--grid-resolution", type=int, default=8,
+                        help="collision grid cell size, 0 for per-entity checks")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, help="JSON file (default: .cache/benchmarks/simulation-*.json)")
+    parser.add_argument("--baseline", type=Path, help="earlier JSON output to compare against")
+    parser.add_argument("--threshold", type=float, default=0.1,
+                        help="mean step time increase counted as a regression")
+    parser.add_argument("--trace", action="store_true", help="also export each run as a Chrome trace")
+    args = parser.parse_args(argv)
+
+    results = []
+    for map_name in args.maps:
+        for tanks in args.tanks:
+            for bullets in args.bullets:
+                for entities in args.entities:
+                    benchmark = SimulationBenchmark(map_name, tanks, bullets, entities, args.ticks,
+                                                    args.warmup, args.grid_resolution, args.seed)
+                    result = benchmark.run()
+                    results.append(result)
+                    phases = "  ".join(f"{phase} {ms:.3f}" for phase, ms in result["phase_ms"].items())
+                    print(f"{map_name:8} {tanks:4} tanks {bullets:5} bullets {entities:5} entities: "
+                          f"step {result['step_ms']['mean']:.3f} ms (p99 {result['step_ms']['p99']:.3f})  |  {phases}")
+                    if args.trace:
+                        Profiler.export(BENCHMARK_DIR / f"trace-{map_name}-{tanks}-{bullets}-{entities}.json")
+
+    report = {
+        "benchmark": "simulation",
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "numpy": np.__version__,
+        "arcade": arcade.version.VERSION,
+        "settings": {"ticks": args.ticks, "warmup": args.warmup, "tick_seconds": TICK,
+                     "grid_resolution": args.grid_resolution, "seed": args.seed},
+        "results": results,
+    }
+    output = args.output or BENCHMARK_DIR / f"simulation-{time.strftime('%Y%m%d-%H%M%S')}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w") as file:
+        json.dump(report, file, indent=2)
+    print(f"Wrote {len(results)} benchmark results to {output}")
+
+    if args.baseline:
+        regressions = compare(results, args.baseline, args.threshold)
+        if regressions:
+            print(f"WARNING: {len(regressions)} runs more than {args.threshold:.0%} slower than the baseline")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
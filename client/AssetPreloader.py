@@ -0,0 +1,108 @@
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from pathlib import Path
+
+from client.BackgroundCache import BackgroundCache
+from client.BulletManager import BULLET_TEXTURE
+from client.SoundBank import SoundBank
+from client.Tank import Tank
+from client.TextureRegistry import TextureRegistry
+from client.assets.effects.ExplosionEffect import EXPLOSION_FRAMES
+from client.assets.effects.FireEffect import FIRE_TEXTURE
+from non_player.StaticEntity import StaticEntity
+
+project_root = Path(__file__).resolve().parent.parent
+MAPS_DIR = project_root / ".config" / "maps"
+
+# GameView's fixed game resolution, backgrounds are pre-resized to it
+GAME_SIZE = (1920, 1080)
+
+
+def texture_groups():
+    """Every texture a match uses, shared by the preloader and GameView's atlas packing"""
+    return (
+        list(Tank.TANK_TEXTURES.values()), [Tank.DEAD_TEXTURE, BULLET_TEXTURE, FIRE_TEXTURE],
+        EXPLOSION_FRAMES, list(StaticEntity.ENTITY_ASSETS.values())
+    )
+
+
+class AssetPreloader:
+    """
+    Decodes the images and sounds of the next match on worker threads while
+    the lobby is open. Textures land in the TextureRegistry, backgrounds in
+    the BackgroundCache and sounds in the SoundBank, so GameView only
+    binds them. Packing the atlas needs the GL context and stays on the main
+    thread.
+    """
+
+    max_workers = 4
+    _executor = None
+    _jobs = {}  # key -> Future, every asset is submitted once per process
+
+    @classmethod
+    def _submit(cls, key, function, *args):
+        if key in cls._jobs:
+            return
+        if cls._executor is None:
+            cls._executor = ThreadPoolExecutor(max_workers=cls.max_workers, thread_name_prefix="preload")
+        cls._jobs[key] = cls._executor.submit(cls._run, key, function, *args)
+
+    @staticmethod
+    def _run(key, function, *args):
+        try:
+            function(*args)
+        except Exception as e:
+            print(f"ERROR: Failed to preload {key}: {e}")
+
+    @classmethod
+    def preload_common(cls):
+        """Tank, bullet, effect and entity textures plus the game sounds, the same for every map"""
+        for paths in texture_groups():
+            for path in paths:
+                cls._submit(path, TextureRegistry.get, path)
+        for path in (Tank.SHOT_SOUND, StaticEntity.DESTROY_SOUND):
+            cls._submit(path, SoundBank.load, path)
+
+    @classmethod
+    def preload_map(cls, map_name, downloader=None, quality="high"):
+        """The map's pre-resized background, read through the client's map cache when given a downloader"""
+        cls.preload_common()
+        cls._submit(("map", map_name, quality), cls._load_map, map_name, downloader, quality)
+
+    @staticmethod
+    def _load_map(map_name, downloader, quality):
+        map_path = downloader.resolve_map(map_name) if downloader else None
+        with open(map_path or MAPS_DIR / f"{map_name}.json", "r") as file:
+            map_data = json.load(file)
+
+        background = map_data.get("map_info", {}).get("background")
+        if background:
+            if downloader:
+                background = downloader.resolve_asset(map_name, background)
+            BackgroundCache.get(background, *GAME_SIZE, quality)
+
+    @classmethod
+    def progress(cls):
+        """Finished share of everything submitted so far, 1.0 when nothing was"""
+        if not cls._jobs:
+            return 1.0
+        return sum(job.done() for job in list(cls._jobs.values())) / len(cls._jobs)
+
+    @classmethod
+    def is_ready(cls):
+        return all(job.done() for job in list(cls._jobs.values()))
+
+    @classmethod
+    def wait(cls, timeout=None):
+        """Block until the submitted assets are loaded, returns whether all finished"""
+        jobs = list(cls._jobs.values())
+        if not jobs:
+            return True
+        start = time.perf_counter()
+        done, pending = wait(jobs, timeout)
+        if pending:
+            print(f"WARNING: {len(pending)} assets still loading, GameView loads them itself")
+        else:
+            print(f"Preloaded assets ready, waited {(time.perf_counter() - start) * 1000:.0f} ms")
+        return not pending
@@ -0,0 +1,91 @@
+import os
+import time
+from pathlib import Path
+
+import arcade
+import numpy as np
+from PIL import Image
+
+from network.MapSync import hash_file
+
+project_root = Path(__file__).resolve().parent.parent
+
+# Backgrounds resized to the game resolution, stored as raw pixels that load without decoding
+BACKGROUND_CACHE_DIR = project_root / ".cache" / "backgrounds"
+
+# Fraction of the game resolution a background is stored at, the sprite stretches the rest
+QUALITY_TIERS = {
+    "high": 1.0,
+    "medium": 0.5,
+    "low": 0.25,
+}
+
+
+class BackgroundCache:
+    """
+    Map backgrounds pre-resized to the game resolution (or a quality tier of
+    it). A texture is built once per process and the resized pixels are kept
+    on disk keyed by the source file's hash, so neither a restart of the
+    round nor of the game decodes and rescales the source image again.
+    """
+
+    textures = {}  # (source hash, width, height) -> Texture
+    _hashes = {}  # path -> (mtime_ns, size, sha256), saves rehashing an unchanged file
+
+    @classmethod
+    def source_hash(cls, path):
+        stat = os.stat(path)
+        cached = cls._hashes.get(path)
+        if cached and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+            return cached[2]
+        digest = hash_file(path)
+        cls._hashes[path] = (stat.st_mtime_ns, stat.st_size, digest)
+        return digest
+
+    @classmethod
+    def get(cls, source, width, height, quality="high"):
+        """Texture of the background at `source` resized for a width x height game at the given quality"""
+        path = str(arcade.resources.resolve(source))
+        if quality not in QUALITY_TIERS:
+            print(f"WARNING: Unknown background quality {quality}, using high")
+            quality = "high"
+        scale = QUALITY_TIERS[quality]
+        width, height = max(1, round(width * scale)), max(1, round(height * scale))
+
+        digest = cls.source_hash(path)[:16]
+        key = (digest, width, height)
+        texture = cls.textures.get(key)
+        if texture is not None:
+            return texture
+
+        start = time.perf_counter()
+        stem = Path(path).stem
+        cache_path = BACKGROUND_CACHE_DIR / f"{stem}-{digest}-{width}x{height}.npy"
+        pixels = None
+        if cache_path.exists():
+            try:
+                pixels = np.load(cache_path)
+                source_kind = "cache"
+            except (OSError, ValueError) as e:
+                print(f"WARNING: Unreadable background cache {cache_path.name}: {e}")
+
+        if pixels is None:
+            with Image.open(path) as image:
+                pixels = np.asarray(image.convert("RGB").resize((width, height), Image.Resampling.LANCZOS))
+            source_kind = "source"
+            try:
+                BACKGROUND_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+                # Older versions of this background at this size are stale now
+                for old_path in BACKGROUND_CACHE_DIR.glob(f"{stem}-*-{width}x{height}.npy"):
+                    old_path.unlink(missing_ok=True)
+                np.save(cache_path, pixels)
+            except OSError as e:
+                print(f"ERROR: Failed to cache background {stem}: {e}")
+
+        # Backgrounds never collide, a bounding box hit box spares scanning every pixel
+        texture = arcade.Texture(Image.fromarray(pixels), hash=f"background-{digest}-{width}x{height}",
+                                 hit_box_algorithm=arcade.hitbox.algo_bounding_box)
+        cls.textures[key] = texture
+        print(f"Background {stem} {width}x{height} ({quality}) from {source_kind} "
+              f"in {(time.perf_counter() - start) * 1000:.0f} ms")
+        return texture
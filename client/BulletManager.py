@@ -0,0 +1,67 @@
+import numpy as np
+
+from client.Bullet import Bullet
+from client.ObjectPool import ObjectPool
+from client.TextureRegistry import TextureRegistry
+from core.BulletStore import BulletStore, BULLET_SPEED
+
+BULLET_TEXTURE = ":assets:images/bullet.png"
+BULLET_SCALE = 0.5
+
+
+class BulletManager(BulletStore):
+    """
+    The world's BulletStore plus sprite views. Bullet sprites only mirror
+    the live slots for drawing and follow their slot through swap-removes.
+    """
+
+    def __init__(self, world_width, world_height, capacity=256, pool_size=128):
+        super().__init__(world_width, world_height, capacity)
+
+        # Slot -> sprite, taken from and returned to the sprite pool
+        self.sprite_pool = ObjectPool(lambda: Bullet(TextureRegistry.get(BULLET_TEXTURE), BULLET_SCALE),
+                                      pool_size, "bullet")
+        self.sprites = []
+        self.sprite_list = TextureRegistry.sprite_list(capacity=max(capacity, pool_size))
+
+    def spawn(self, x, y, angle, owner, speed=BULLET_SPEED, damage=1):
+        index = super().spawn(x, y, angle, owner, speed, damage)
+
+        sprite = self.sprite_pool.acquire()
+        self.sprites.append(sprite)
+        sprite.position = (x, y)
+        sprite.angle = angle
+        sprite.source_tank = owner
+        self.sprite_list.append(sprite)
+        return index
+
+    def _slot_removed(self, index, last):
+        sprite = self.sprites[index]
+        self.sprite_list.remove(sprite)
+        self.sprite_pool.release(sprite)
+        if index != last:
+            self.sprites[index] = self.sprites[last]
+        self.sprites.pop()
+
+    def clear(self):
+        for sprite in self.sprites:
+            self.sprite_pool.release(sprite)
+        self.sprites = []
+        self.sprite_list.clear()
+        super().clear()
+
+    def sync_sprites(self, alpha=1.0):
+        """Copy positions to the sprites before drawing, interpolated between the last two ticks"""
+        n = self.count
+        render = self._render[:, :n]
+        for row, current, previous in ((render[0], self.x[:n], self.prev_x[:n]),
+                                       (render[1], self.y[:n], self.prev_y[:n])):
+            np.subtract(current, previous, out=row)
+            row *= alpha
+            row += previous
+        for sprite, x, y in zip(self.sprites, render[0].tolist(), render[1].tolist()):
+            sprite.position = (x, y)
+
+    def draw(self, alpha=1.0):
+        self.sync_sprites(alpha)
+        self.sprite_list.draw()
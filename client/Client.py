@@ -6,6 +6,15 @@ from pathlib import Path
 
 import arcade
 
+from network.NetStats import ConnectionStats, message_type_of
+from network.Compression import CompressionError, decode_datagram
+from network.MapSync import MapCache, MapDownloader, is_chunk
+from client.AssetPreloader import AssetPreloader
+from core.Profiler import Profiler
+
+# Large enough for compressed control messages, the map manifest and file chunks
+RECV_BUFFER_SIZE = 65535
+
 
 class Client:
     def __init__(self, ip='127.0.0.1', port=5000, window=None):
@@ -15,6 +24,8 @@ class Client:
         self.server_port = port
         self.server_address = (self.server_ip, int(self.server_port))
         self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        # Held while sending and while _reconnect swaps the socket
+        self.socket_lock = threading.Lock()
         self.connected = False
         self.running = False
 
@@ -26,10 +37,28 @@ class Client:
 
         # Heartbeat
         self.last_heartbeat_sent = 0
-        self.heartbeat_interval = 3.0  # Send heartbeat every 3 seconds
+        self.heartbeat_interval = 1.0  # Send heartbeat every second (also used for RTT sampling)
+
+        # Reconnect: the server identifies us by session token, not by address
+        self.session_token = None
+        self.last_packet_received = 0
+        self.reconnect_after = 3.0  # Seconds of silence before trying to reconnect
+        self.reconnect_timeout = 15.0
+
+        # Network statistics for the server connection
+        self.stats = ConnectionStats()
 
         # Load settings
         project_root = Path(__file__).resolve().parent.parent
+
+        # Content-addressed map cache, filled from the server during the lobby
+        self.map_cache = MapCache(
+            project_root / ".cache" / "maps",
+            project_root / ".config" / "maps",
+            arcade.resources.resolve
+        )
+        self.map_downloader = MapDownloader(self.map_cache, self.send_data)
+
         SETTINGS_FILE = project_root / ".config" / "settings.json"
         settings = {}
         try:
@@ -41,6 +70,7 @@ class Client:
             settings = {}
 
         self.player_name = settings.get("player_name")
+        self.background_quality = settings.get("background_quality", "high")
 
         self.server_name = None
         self.server_color = "blue"  # Default server color
@@ -48,36 +78,43 @@ class Client:
         self.client_id = None
 
         self.current_map = None
+        self.current_map_hash = None
 
         self.latest_player_list = []
 
-    def connect(self, timeout=5.0):
-        """Connect to server with proper handshake and timeout"""
+    def connect(self, timeout=5.0, retry_interval=0.25):
+        """Connect to server with proper handshake and timeout.
+        The request is retransmitted every retry_interval seconds until answered."""
         try:
             # Create a new socket for each connection
             self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
             self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-            self.socket.settimeout(timeout)
+            self.socket.settimeout(retry_interval)
 
             # Set connection state to pending
             self.connection_state = "pending"
             self.connection_error = None
 
-            # Send connection request
             message = f"connection,{self.player_name}"
-            self.socket.sendto(message.encode('utf-8'), self.server_address)
-            print(f"Sent connection request to {self.server_ip}:{self.server_port}")
+            last_sent = 0
 
             # Wait for server response
             start_time = time.time()
             while time.time() - start_time < timeout:
+                # (Re)send connection request - a single lost datagram no longer costs the whole timeout
+                if time.time() - last_sent >= retry_interval:
+                    self._send_raw(message.encode('utf-8'), "connection")
+                    last_sent = time.time()
+                    print(f"Sent connection request to {self.server_ip}:{self.server_port}")
+
                 try:
-                    data, addr = self.socket.recvfrom(1024)
-                    decoded = data.decode()
+                    data, addr = self.socket.recvfrom(RECV_BUFFER_SIZE)
+                    decoded = decode_datagram(data)
 
                     try:
                         message = json.loads(decoded)
                         message_type = message.get("type")
+                        self.stats.record_received(message_type, len(data))
 
                         if message_type == "connection_accepted":
                             self.connection_state = "accepted"
@@ -85,11 +122,7 @@ class Client:
                             self.running = True
 
                             # Store connection details
-                            self.client_id = message.get("client_id")
-                            self.assigned_color = message.get("assigned_color")
-                            assigned_name = message.get("assigned_name")
-                            if assigned_name:
-                                self.player_name = assigned_name
+                            self.store_connection_details(message)
 
                             print(
                                 f"Connection accepted! Name: {self.player_name}, Color: {self.assigned_color}, ID: {self.client_id}")
@@ -128,6 +161,74 @@ class Client:
                 self.socket.close()
                 self.socket = None
 
+    def store_connection_details(self, message):
+        """Remember the slot the server gave us in a connection_accepted message"""
+        self.client_id = message.get("client_id")
+        self.assigned_color = message.get("assigned_color")
+        self.session_token = message.get("session_token") or self.session_token
+        assigned_name = message.get("assigned_name")
+        if assigned_name:
+            self.player_name = assigned_name
+
+    def _reconnect(self, retry_interval=0.25):
+        """
+        Rebind to a fresh socket and reclaim our slot with the session token.
+        Runs on the listener thread. Returns True once the server accepted us again.
+        """
+        print("Connection to server lost, trying to reconnect...")
+        self.connection_state = "reconnecting"
+        message = f"reconnect,{self.session_token}".encode()
+
+        try:
+            new_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            new_socket.settimeout(retry_interval)
+        except OSError as e:
+            print(f"Cannot open socket for reconnect: {e}")
+            return False
+        # The main thread may be sending right now, swap only between two sends
+        with self.socket_lock:
+            old_socket, self.socket = self.socket, new_socket
+        try:
+            old_socket.close()
+        except OSError:
+            pass
+
+        last_sent = 0
+        start_time = time.time()
+        while self.running and time.time() - start_time < self.reconnect_timeout:
+            if time.time() - last_sent >= retry_interval:
+                try:
+                    self._send_raw(message, "reconnect")
+                except OSError as e:
+                    print(f"Reconnect send failed: {e}")
+                last_sent = time.time()
+
+            try:
+                data, addr = self.socket.recvfrom(RECV_BUFFER_SIZE)
+                response = json.loads(decode_datagram(data))
+            except socket.timeout:
+                continue
+            except (UnicodeDecodeError, CompressionError, json.JSONDecodeError, OSError):
+                # Stale game traffic or a chunk, keep waiting for the answer
+                continue
+
+            if response.get("type") == "connection_accepted":
+                self.store_connection_details(response)
+                self.connection_state = "accepted"
+                self.last_packet_received = time.time()
+                self.socket.settimeout(0.5)
+                print(f"Reconnected as {self.player_name}")
+                return True
+
+            if response.get("type") == "connection_rejected":
+                self.connection_error = response.get("reason", "Reconnect rejected by server")
+                print(f"Reconnect rejected: {self.connection_error}")
+                return False
+
+        self.connection_error = "Connection lost - server did not respond"
+        print(self.connection_error)
+        return False
+
     def get_connection_error(self):
         """Get the last connection error message"""
         return self.connection_error
@@ -136,18 +237,46 @@ class Client:
         """Continuously listen for server commands in the background"""
         print("Starting listener thread")
         self.socket.settimeout(0.5)
+        self.last_packet_received = time.time()
+        message_lap = Profiler.lap("client.handle_message")
 
         while self.running and self.connected:
+            message_lap.stop()
             try:
-                data, addr = self.socket.recvfrom(1024)
+                # Server went silent - our address may have changed, ask for our slot back
+                if (self.session_token and
+                        time.time() - self.last_packet_received > self.reconnect_after):
+                    if not self._reconnect():
+                        arcade.schedule_once(lambda dt: self._return_to_main_menu(), 0)
+                        break
+
+                # Heartbeats must go out even while game traffic keeps the socket busy
+                if time.time() - self.last_heartbeat_sent > self.heartbeat_interval:
+                    self.send_heartbeat()
+
+                # Re-request stalled map file chunks
+                self.map_downloader.tick()
+
+                data, addr = self.socket.recvfrom(RECV_BUFFER_SIZE)
+                message_lap.start()
                 if not data:
                     print("Server closed the connection")
                     self.disconnect()
                     break
 
+                self.last_packet_received = time.time()
+
+                # Binary map file chunks bypass text decoding
+                if is_chunk(data):
+                    self.stats.record_received("file_chunk", len(data))
+                    self.map_downloader.handle_chunk(data)
+                    continue
+
                 # Process the data
                 try:
-                    decoded = data.decode()
+                    # Control messages may arrive zlib-compressed
+                    decoded = decode_datagram(data)
+                    self.stats.record_received(message_type_of(decoded), len(data))
 
                     # Handle the "players:" fallback response HERE instead of in get_players_list
                     if decoded.startswith("players:"):
@@ -178,6 +307,9 @@ class Client:
                             self.handle_command(message)
 
                         elif message_get == "heartbeat_ack":
+                            sent_at = message.get("timestamp")
+                            if sent_at is not None:
+                                self.stats.record_rtt(time.time() - sent_at)
                             continue
 
                         elif message_get == "name_assignment":
@@ -187,11 +319,7 @@ class Client:
                                 self.player_name = assigned_name
 
                         elif message_get == "connection_accepted":
-                            self.client_id = message.get("client_id")
-                            self.assigned_color = message.get("assigned_color")
-                            assigned_name = message.get("assigned_name")
-                            if assigned_name:
-                                self.player_name = assigned_name
+                            self.store_connection_details(message)
                             print(
                                 f"Connection accepted. Name: {self.player_name}, Color: {self.assigned_color}, ID: {self.client_id}")
 
@@ -205,9 +333,11 @@ class Client:
                                 print("Error getting server name:", e)
 
                         elif message_get == "tank_state":
+                            self.stats.record_sequence(message.get("player_id"), message.get("seq"))
                             with self.tank_updates_lock:
                                 # print(f"Client received tank state: {message}")
                                 self.pending_tank_updates.append(message)
+                                self.stats.set_queue_depth("tank_updates", len(self.pending_tank_updates))
 
                         # Handle real-time player list updates
                         elif message_get == "player_list_update":
@@ -226,12 +356,10 @@ class Client:
                         # Not JSON and not players: format, treat as regular message
                         print(f"Received unknown message: {decoded}")
 
-                except UnicodeDecodeError:
+                except (UnicodeDecodeError, CompressionError):
                     print("Received binary data")
 
             except socket.timeout:
-                if time.time() - self.last_heartbeat_sent > self.heartbeat_interval:
-                    self.send_heartbeat()
                 continue
 
             except Exception as e:
@@ -241,6 +369,7 @@ class Client:
                 else:
                     break
 
+        message_lap.stop()
         print("Listener thread exiting")
 
     def send_heartbeat(self):
@@ -251,8 +380,13 @@ class Client:
 
         if current_time - self.last_heartbeat_sent > self.heartbeat_interval:
             try:
-                heartbeat_msg = json.dumps({"type": "heartbeat", "timestamp": current_time})
-                self.socket.sendto(heartbeat_msg.encode(), self.server_address)
+                # Report our smoothed RTT so the server can show it too
+                heartbeat_msg = json.dumps({
+                    "type": "heartbeat",
+                    "timestamp": current_time,
+                    "rtt": self.stats.smoothed_rtt
+                })
+                self._send_raw(heartbeat_msg.encode(), "heartbeat")
                 self.last_heartbeat_sent = current_time
             except Exception as e:
                 print(f"Error sending heartbeat: {e}")
@@ -261,6 +395,20 @@ class Client:
         """Return server IP address as Tuple"""
         return self.server_ip, self.server_port
 
+    def _send_raw(self, payload, msg_type=None):
+        """Send bytes to the server and record them in the connection stats"""
+        with self.socket_lock:
+            self.socket.sendto(payload, self.server_address)
+        if msg_type is None:
+            msg_type = message_type_of(payload.decode(errors="ignore"))
+        self.stats.record_sent(msg_type, len(payload))
+
+    def get_network_stats(self):
+        """Return a snapshot of the connection statistics keyed by connection label"""
+        with self.tank_updates_lock:
+            self.stats.set_queue_depth("tank_updates", len(self.pending_tank_updates))
+        return {"server": self.stats.snapshot()}
+
     def check_socket_connection(self):
         if not self.connected or self.socket is None:
             return False
@@ -292,15 +440,15 @@ class Client:
         try:
             # Save current timeout
             current_timeout = self.socket.gettimeout()
-            self.socket.sendto(command, self.server_address)
+            self._send_raw(command)
 
             # Set a timeout to avoid hanging indefinitely
             self.socket.settimeout(2.0)  # Increased timeout
 
             # Get response directly
             try:
-                data, addr = self.socket.recvfrom(1024)
-                decoded = data.decode()
+                data, addr = self.socket.recvfrom(RECV_BUFFER_SIZE)
+                decoded = decode_datagram(data)
                 print(f"Received response for command: {decoded}")
                 return decoded
             except socket.timeout:
@@ -322,7 +470,7 @@ class Client:
         """Simplified fallback method - just send request, response handled in listener"""
         try:
             print("Requesting fallback player list...")
-            self.socket.sendto(b"get_players", self.server_address)
+            self._send_raw(b"get_players", "get_players")
 
             # Wait a short time for the response to be processed by the listener
             import time
@@ -346,10 +494,17 @@ class Client:
             if not self.connected:
                 print("Not connected, can't send data")
                 return
+            if self.connection_state == "reconnecting":
+                # The server has not rebound our session to the new socket yet. Game state
+                # goes out again every frame and map chunks are re-requested, so drop it.
+                return
 
+            msg_type = None
+            if isinstance(data, dict):
+                msg_type = data.get("type")
             if isinstance(data, (dict, list)):
                 data = json.dumps(data)
-            self.socket.sendto(data.encode(), self.server_address)
+            self._send_raw(data.encode(), msg_type)
             # print(f"Sent: {data}")
         except Exception as e:
             print(f"Error sending data: {e}")
@@ -365,14 +520,23 @@ class Client:
             # Send acknowledgment if required
             if require_ack and cmd_id:
                 ack_msg = json.dumps({"type": "ack", "id": cmd_id})
-                self.socket.sendto(ack_msg.encode(), self.server_address)
+                self._send_raw(ack_msg.encode(), "ack")
                 print(f"Sent ACK for command: {command}")
 
-            if command == "map_selected":
+            if command == "map_manifest":
+                self.map_downloader.set_manifest(command_data.get("maps", {}))
+
+            elif command == "map_selected":
                 map_name = command_data.get("map_name")
                 if map_name:
                     self.current_map = map_name
+                    self.current_map_hash = command_data.get("map_hash")
                     print(f"Received selected map: {self.current_map}")
+                    if not self.map_downloader.is_ready(map_name):
+                        print(f"WARNING: Map {map_name} is still downloading")
+                    else:
+                        # Decode the background before the game view asks for it
+                        AssetPreloader.preload_map(map_name, self.map_downloader, self.background_quality)
 
                     # Trigger immediate map load on game view
                     current_view = self.window.current_view
@@ -382,6 +546,12 @@ class Client:
                     print("ERROR: Received map_selected command without map_name")
 
 
+            elif command == "state_snapshot":
+                # Sent after a reconnect, bring the game view back in sync
+                current_view = self.window.current_view
+                if hasattr(current_view, 'apply_state_snapshot'):
+                    arcade.schedule_once(lambda dt: current_view.apply_state_snapshot(command_data), 0)
+
             elif command == "server_disconnect":
                 print("Server is disconnecting, returning to main menu...")
                 arcade.schedule_once(lambda dt: self._return_to_main_menu(), 0)
@@ -0,0 +1,130 @@
+import time
+from collections import deque
+
+PACING_MODES = ("vsync", "capped", "uncapped")
+
+# Per-frame time budgets in ms. Simulation and network application stop early
+# when they run over and continue next frame, draw overruns are only counted.
+DEFAULT_BUDGETS_MS = {
+    "simulation": 8.0,
+    "network": 2.0,
+    "draw": 8.0,
+}
+
+# The last stretch before a frame deadline is spun instead of slept, OS sleeps overshoot
+SPIN_SECONDS = 0.002
+
+
+class FramePacer:
+    """
+    Frame pacing of the game window and frame-time reporting.
+
+    vsync: the driver paces frames to the display, fps_cap is only a ceiling
+    capped: no vsync, every frame waits precisely until its 1 / fps_cap slot
+    uncapped: no vsync and no waiting, for reproducible render benchmarks
+    """
+
+    def __init__(self, window, mode="vsync", fps_cap=120, budgets_ms=None, history_length=240):
+        if mode not in PACING_MODES:
+            print(f"WARNING: Unknown frame pacing mode {mode}, using vsync")
+            mode = "vsync"
+        self.window = window
+        self.mode = mode
+        self.fps_cap = max(1, fps_cap)
+        self.budgets_ms = dict(DEFAULT_BUDGETS_MS)
+        self.budgets_ms.update(budgets_ms or {})
+
+        self.phase_ms = {phase: 0.0 for phase in self.budgets_ms}  # Last measured time of each phase
+        self.overruns = {phase: 0 for phase in self.budgets_ms}
+        self.frame_times = deque(maxlen=history_length)
+        self.last_frame = None
+        self.deadline = None
+
+        self.apply()
+
+    def apply(self):
+        """Configure vsync and arcade's update / draw rates for the mode"""
+        if self.mode == "vsync":
+            rate = 1 / self.fps_cap
+        elif self.mode == "capped":
+            # Tick arcade faster than the cap, frame_done() does the waiting precisely
+            rate = 1 / 1000
+        else:
+            rate = 1 / 10000
+        self.window.set_vsync(self.mode == "vsync")
+        self.window.set_update_rate(rate)
+        self.window.set_draw_rate(rate)
+        self.last_frame = None
+        self.deadline = None
+        print(f"Frame pacing: {self.mode}" + ("" if self.mode == "uncapped" else f", cap {self.fps_cap} fps"))
+
+    def restore(self):
+        """Back to arcade's default 60 Hz cadence with vsync, for the menus"""
+        self.window.set_vsync(True)
+        self.window.set_update_rate(1 / 60)
+        self.window.set_draw_rate(1 / 60)
+
+    def budget_left(self, phase, start):
+        """Is the phase that started at perf_counter() `start` still within its budget?"""
+        return (time.perf_counter() - start) * 1000 < self.budgets_ms[phase]
+
+    def record(self, phase, start):
+        """Store how long a phase took this frame and count it if it ran over budget"""
+        elapsed = (time.perf_counter() - start) * 1000
+        self.phase_ms[phase] = elapsed
+        if elapsed > self.budgets_ms[phase]:
+            self.overruns[phase] += 1
+        return elapsed
+
+    def frame_done(self):
+        """Call at the end of a frame: records the frame time and, when capped, waits for the next slot"""
+        if self.mode == "capped":
+            period = 1 / self.fps_cap
+            now = time.perf_counter()
+            # A late frame moves the schedule instead of rushing the following ones
+            self.deadline = now + period if self.deadline is None else max(self.deadline + period, now)
+            self.sleep_until(self.deadline)
+
+        now = time.perf_counter()
+        if self.last_frame is not None:
+            self.frame_times.append((now - self.last_frame) * 1000)
+        self.last_frame = now
+
+    @staticmethod
+    def sleep_until(deadline):
+        while True:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                return
+            if remaining > SPIN_SECONDS:
+                time.sleep(remaining - SPIN_SECONDS)
+
+    def stats(self):
+        """Frame time percentiles over the recent frames plus the phase times and budget overruns"""
+        times = sorted(self.frame_times)
+        stats = {
+            "mode": self.mode,
+            "frames": len(times),
+            "phase_ms": {phase: round(ms, 2) for phase, ms in self.phase_ms.items()},
+            "overruns": dict(self.overruns),
+        }
+        if times:
+            average = sum(times) / len(times)
+            stats.update({
+                "fps": round(1000 / average, 1) if average else 0.0,
+                "avg_ms": round(average, 2),
+                "p50_ms": round(times[len(times) // 2], 2),
+                "p95_ms": round(times[min(len(times) - 1, int(len(times) * 0.95))], 2),
+                "p99_ms": round(times[min(len(times) - 1, int(len(times) * 0.99))], 2),
+                "max_ms": round(times[-1], 2),
+            })
+        return stats
+
+    def summary(self):
+        """One line for the frame stats overlay"""
+        stats = self.stats()
+        if not stats["frames"]:
+            return f"{self.mode}: measuring..."
+        phases = "  ".join(f"{phase} {ms:.1f}" for phase, ms in stats["phase_ms"].items())
+        return (f"{self.mode} {stats['fps']:.0f} fps  avg {stats['avg_ms']:.1f}  p95 {stats['p95_ms']:.1f}"
+                f"  p99 {stats['p99_ms']:.1f}  max {stats['max_ms']:.1f} ms  |  {phases}")
@@ -0,0 +1,129 @@
+import time
+from collections import deque
+
+import arcade
+from arcade.types import Color
+
+
+class NetGraph:
+    """
+    Optional on-screen network statistics overlay.
+    Polls get_network_stats() from the Client or Server a few times per second
+    and draws a text summary plus an RTT graph per connection.
+    """
+
+    def __init__(self, client_or_server, refresh_interval=0.25, history_length=120):
+        self.client_or_server = client_or_server
+        self.refresh_interval = refresh_interval
+        self.history_length = history_length
+
+        self.last_refresh = 0
+        self.snapshots = {}
+        self.rtt_history = {}  # label -> deque of smoothed RTT in ms
+
+        self.width = 360
+        self.line_height = 16
+        self.graph_height = 40
+        self.font_size = 10
+
+        # Text objects are reused between refreshes to avoid rebuilding layouts every frame
+        self.text_lines = []
+        self.visible_lines = 0
+
+    def refresh(self):
+        """Pull a fresh statistics snapshot if the refresh interval elapsed"""
+        now = time.time()
+        if now - self.last_refresh < self.refresh_interval:
+            return
+        self.last_refresh = now
+
+        if not self.client_or_server or not hasattr(self.client_or_server, "get_network_stats"):
+            self.snapshots = {}
+            return
+
+        try:
+            self.snapshots = self.client_or_server.get_network_stats()
+        except Exception as e:
+            print(f"Error collecting network stats: {e}")
+            self.snapshots = {}
+            return
+
+        for label, snapshot in self.snapshots.items():
+            history = self.rtt_history.setdefault(label, deque(maxlen=self.history_length))
+            history.append(snapshot["rtt_ms"]["smoothed"] or 0.0)
+
+        # Forget connections that went away
+        for label in list(self.rtt_history):
+            if label not in self.snapshots:
+                del self.rtt_history[label]
+
+        self._rebuild_text()
+
+    @staticmethod
+    def _format_ms(value):
+        return "-" if value is None else f"{value:.0f}"
+
+    def _summary_lines(self, label, snapshot):
+        rtt = snapshot["rtt_ms"]
+        lines = [
+            f"{label}",
+            f"  rtt {self._format_ms(rtt['smoothed'])} ms  p50 {self._format_ms(rtt['p50'])}"
+            f"  p95 {self._format_ms(rtt['p95'])}  p99 {self._format_ms(rtt['p99'])}",
+            f"  jitter {snapshot['jitter_ms']:.1f} ms  loss {snapshot['loss_percent']:.1f}%"
+            f"  retx {snapshot['retransmits']}",
+            f"  in {snapshot['receive_rate_bps'] / 1024:.1f} KB/s  out {snapshot['send_rate_bps'] / 1024:.1f} KB/s",
+        ]
+
+        # Top message types by bytes sent
+        by_type = sorted(snapshot["sent_by_type"].items(), key=lambda item: item[1][1], reverse=True)
+        for msg_type, (packets, num_bytes) in by_type[:3]:
+            lines.append(f"  > {msg_type}: {packets} pkt {num_bytes / 1024:.1f} KB")
+
+        if snapshot["queue_depths"]:
+            queues = "  ".join(f"{name} {depth}" for name, depth in snapshot["queue_depths"].items())
+            lines.append(f"  queues: {queues}")
+        return lines
+
+    def _rebuild_text(self):
+        lines = []
+        for label, snapshot in self.snapshots.items():
+            lines.extend(self._summary_lines(label, snapshot))
+        if not lines:
+            lines = ["no connections"]
+
+        # Grow the pool of text objects if needed, then just update their contents
+        while len(self.text_lines) < len(lines):
+            self.text_lines.append(arcade.Text("", 0, 0, arcade.color.WHITE, self.font_size))
+        for text_obj, line in zip(self.text_lines, lines):
+            text_obj.text = line
+        self.visible_lines = len(lines)
+
+    def draw(self, left, top):
+        """Draw the overlay with its top-left corner at (left, top) in UI camera coordinates"""
+        self.refresh()
+        visible_lines = self.visible_lines
+        graphs = len(self.rtt_history)
+        height = visible_lines * self.line_height + graphs * (self.graph_height + 6) + 10
+
+        arcade.draw_lbwh_rectangle_filled(left, top - height, self.width, height, Color(0, 0, 0, 160))
+
+        y = top - self.line_height
+        for text_obj in self.text_lines[:visible_lines]:
+            text_obj.x = left + 6
+            text_obj.y = y
+            text_obj.draw()
+            y -= self.line_height
+
+        # RTT graph per connection, scaled to the largest sample shown
+        for history in self.rtt_history.values():
+            bottom = y - self.graph_height + self.line_height / 2
+            if len(history) >= 2:
+                peak = max(max(history), 1.0)
+                step = (self.width - 12) / (self.history_length - 1)
+                points = [
+                    (left + 6 + i * step, bottom + (value / peak) * self.graph_height)
+                    for i, value in enumerate(history)
+                ]
+                arcade.draw_line_strip(points, arcade.color.LIME_GREEN, 1)
+            arcade.draw_line(left + 6, bottom, left + self.width - 6, bottom, arcade.color.GRAY, 1)
+            y -= self.graph_height + 6
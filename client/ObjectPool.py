@@ -0,0 +1,46 @@
+class ObjectPool:
+    """
+    Reusable instances handed out by acquire() and returned by release().
+    The pool starts with `size` preallocated objects and keeps everything
+    released to it, so after warm-up it holds the peak number in use.
+    """
+
+    def __init__(self, factory, size=0, name="pool"):
+        """
+        Args:
+            factory (callable): Creates a new instance when the pool is empty
+            size (int): Number of instances to preallocate
+            name (str): Label used in statistics
+        """
+        self.factory = factory
+        self.name = name
+        self.free = []
+        self.hits = 0
+        self.misses = 0
+        self.created = 0
+        self.reserve(size)
+
+    def reserve(self, size):
+        """Preallocate until at least `size` instances are idle"""
+        while len(self.free) < size:
+            self.free.append(self.factory())
+            self.created += 1
+
+    def acquire(self):
+        if self.free:
+            self.hits += 1
+            return self.free.pop()
+        self.misses += 1
+        self.created += 1
+        return self.factory()
+
+    def release(self, obj):
+        self.free.append(obj)
+
+    def stats(self):
+        return {
+            "free": len(self.free),
+            "created": self.created,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
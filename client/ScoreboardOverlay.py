@@ -0,0 +1,131 @@
+import arcade
+import pyglet
+from arcade.shape_list import ShapeElementList, create_ellipse_filled, create_rectangle_filled, \
+    create_rectangle_outline
+from arcade.types import Color
+
+from client.assets.effects.OutlinedText import OutlinedText
+
+
+class ScoreboardOverlay:
+    """
+    Darkened full-screen scoreboard. Shapes go into one ShapeElementList and
+    all text into one pyglet batch; both are rebuilt only when the scores,
+    player colors or window size change, so a frame draws just the two.
+    """
+
+    def __init__(self):
+        self.key = None
+        self.shapes = None
+        self.batch = None
+        self.texts = []  # Text objects live in the batch, keep them referenced
+        self.builds = 0
+
+        self.entry_height = 70
+        self.color_rect_width = 40
+        self.score_width = 60  # Approximate width for scores
+
+    def draw(self, rows, width, height):
+        """
+        Args:
+            rows: (player_id, score, rgb) tuples, highest score first
+            width, height: Window size
+        """
+        key = (tuple(rows), width, height)
+        if key != self.key:
+            self._build(rows, width, height)
+            self.key = key
+        self.shapes.draw()
+        self.batch.draw()
+
+    def invalidate(self):
+        self.key = None
+
+    def _build(self, rows, width, height):
+        self.builds += 1
+        self.shapes = ShapeElementList()
+        self.batch = pyglet.graphics.Batch()
+        self.texts = []
+
+        # Darkened background
+        self.shapes.append(create_rectangle_filled(width / 2, height / 2, width, height, Color(0, 0, 0, 170)))
+        if not rows:
+            return
+
+        # Calculate layout dimensions
+        title_y = height // 2 + 150
+        start_y = title_y - 100
+
+        self.texts.append(OutlinedText(
+            "SCOREBOARD",
+            width // 2, title_y,
+            text_color=arcade.color.WHITE,
+            outline_color=arcade.color.BLACK,
+            font_size=48,
+            stroke_width=8,
+            anchor_x="center",
+            anchor_y="center",
+            batch=self.batch
+        ))
+
+        # Entry layout calculations
+        name_start_x = width // 2 - 250
+        color_rect_x = name_start_x - self.color_rect_width - 10
+        score_end_x = width // 2 + 250
+        dots_end_x = score_end_x - self.score_width - 10
+
+        names = [OutlinedText(
+            player_id,
+            name_start_x, start_y - (i * self.entry_height),
+            text_color=arcade.color.WHITE,
+            outline_color=arcade.color.BLACK,
+            font_size=24,
+            stroke_width=3,
+            anchor_x="left",
+            anchor_y="center",
+            batch=self.batch
+        ) for i, (player_id, _, _) in enumerate(rows)]
+        self.texts.extend(names)
+
+        # Dots all start after the widest name
+        dots_start_x = name_start_x + max(name.width for name in names) + 20
+
+        for i, (player_id, score, color_rgb) in enumerate(rows):
+            y_pos = start_y - (i * self.entry_height)
+
+            # Tank color indicator with a black border
+            rect_center_x = color_rect_x + self.color_rect_width / 2
+            self.shapes.append(create_rectangle_filled(rect_center_x, y_pos, self.color_rect_width, 30, color_rgb))
+            self.shapes.append(create_rectangle_outline(rect_center_x, y_pos, self.color_rect_width, 30,
+                                                        arcade.color.BLACK, 2))
+
+            self.texts.append(arcade.Text(
+                f"{score}",
+                score_end_x, y_pos,
+                arcade.color.WHITE,
+                font_size=24,
+                anchor_x="right",
+                anchor_y="center",
+                font_name="ARCO",
+                batch=self.batch
+            ))
+
+            self._add_connecting_dots(dots_start_x, y_pos, dots_end_x)
+
+    def _add_connecting_dots(self, start_x, y, end_x):
+        """Dots between player name and score, spread evenly"""
+        available_width = end_x - start_x
+        if available_width <= 0:
+            return
+
+        dot_diameter = 3
+        ideal_spacing = 12
+        num_dots = int(available_width // ideal_spacing)
+        if num_dots <= 0:
+            return
+
+        actual_spacing = available_width / num_dots
+        size = (dot_diameter // 2) * 2
+        for i in range(num_dots):
+            dot_x = start_x + (i * actual_spacing) + (actual_spacing / 2)
+            self.shapes.append(create_ellipse_filled(dot_x, y, size, size, arcade.color.GRAY))
@@ -0,0 +1,112 @@
+import threading
+import time
+
+import arcade
+import pyglet
+
+
+class Voice(pyglet.media.Player):
+    """A player that keeps its source and driver player when the clip ends, ready to replay"""
+
+    started_at = 0.0
+
+    def on_eos(self):
+        # The default advances the playlist and deletes the driver player
+        self.pause()
+        self.seek(0.0)
+
+
+class SoundBank:
+    """
+    Every sound effect decoded once, each with a fixed set of voices created
+    on the main thread the first time the clip plays. Playing reuses an idle
+    voice of the clip; when all are busy, or the global budget is used up,
+    the oldest playing voice is cut off and restarted, so shots and
+    explosions never pile up players. A clip that fails to decode is
+    remembered and never retried.
+    """
+
+    max_voices_per_clip = 4
+    max_voices = 16
+
+    sounds = {}  # path -> Sound decoded into memory, or None if decoding failed
+    voices = {}  # path -> [Voice]
+    steals = 0
+    _lock = threading.Lock()
+
+    @classmethod
+    def configure(cls, max_voices_per_clip=4, max_voices=16):
+        """Set the voice limits, clips get the voices they are missing on their next play"""
+        cls.max_voices_per_clip = max_voices_per_clip
+        cls.max_voices = max_voices
+
+    @classmethod
+    def load(cls, path):
+        """Decode a clip once, safe to call from a worker thread. Returns None if it cannot be decoded."""
+        if path in cls.sounds:
+            return cls.sounds[path]
+        try:
+            sound = arcade.load_sound(path, streaming=False)
+        except Exception as e:
+            sound = None
+            error = e
+        with cls._lock:
+            if path not in cls.sounds:
+                cls.sounds[path] = sound
+                if sound is None:
+                    print(f"ERROR: Failed to load sound {path}: {error}")
+        return cls.sounds[path]
+
+    @classmethod
+    def ensure_voices(cls, path):
+        """Voices of a clip, decoding it and creating missing voices first. Main thread only."""
+        sound = cls.load(path)
+        if sound is None:
+            return None
+        voices = cls.voices.setdefault(path, [])
+        while len(voices) < cls.max_voices_per_clip:
+            voice = Voice()
+            voice.queue(sound.source)
+            voices.append(voice)
+        return voices[:cls.max_voices_per_clip]
+
+    @classmethod
+    def play(cls, path, volume=1.0, pan=0.0):
+        """Play a loaded clip, returns the voice or None if the clip is not available"""
+        voices = cls.ensure_voices(path)
+        if voices is None:
+            return None
+
+        voice = next((voice for voice in voices if not voice.playing), None)
+        if voice is None:
+            # Every voice of the clip is busy, restart the one that has played longest
+            voice = min(voices, key=lambda v: v.started_at)
+            cls.steals += 1
+        elif cls.playing() >= cls.max_voices:
+            # Mixer budget used up, silence the oldest voice of any clip first
+            playing = [v for clip in cls.voices.values() for v in clip if v.playing]
+            min(playing, key=lambda v: v.started_at).pause()
+            cls.steals += 1
+
+        voice.pause()
+        voice.seek(0.0)
+        voice.volume = volume
+        voice.position = (pan, 0.0, (1 - pan * pan) ** 0.5)  # Same 3D panning trick as arcade.Sound.play
+        voice.started_at = time.perf_counter()
+        voice.play()
+        return voice
+
+    @classmethod
+    def playing(cls):
+        return sum(voice.playing for clip in cls.voices.values() for voice in clip)
+
+    @classmethod
+    def stats(cls):
+        """Loaded clips, voices and how many playbacks had to cut another one off"""
+        return {
+            "clips": sum(sound is not None for sound in cls.sounds.values()),
+            "failed": sum(sound is None for sound in cls.sounds.values()),
+            "voices": sum(len(clip) for clip in cls.voices.values()),
+            "playing": cls.playing(),
+            "steals": cls.steals,
+        }
@@ -0,0 +1,61 @@
+import arcade
+
+
+class SpriteView:
+    """
+    Mixin for sprites that present a core state object with x, y and angle.
+    The state is the source of truth: position and angle read from it, writes
+    go to both, and sync() copies what the simulation changed into the sprite.
+    Create `self.state` before calling the sprite constructor.
+    """
+
+    state = None
+
+    @property
+    def position(self):
+        return self.state.x, self.state.y
+
+    @position.setter
+    def position(self, value):
+        self.state.x, self.state.y = value
+        arcade.Sprite.position.fset(self, value)
+
+    @property
+    def center_x(self):
+        return self.state.x
+
+    @center_x.setter
+    def center_x(self, value):
+        self.position = (value, self.state.y)
+
+    @property
+    def center_y(self):
+        return self.state.y
+
+    @center_y.setter
+    def center_y(self, value):
+        self.position = (self.state.x, value)
+
+    @property
+    def angle(self):
+        return self.state.angle
+
+    @angle.setter
+    def angle(self, value):
+        self.state.angle = value
+        arcade.Sprite.angle.fset(self, value)
+
+    def local_hit_box(self):
+        """Scaled hit box points relative to the center, the shape the state collides with"""
+        scale_x, scale_y = self.scale_x, self.scale_y
+        return [(x * scale_x, y * scale_y) for x, y in self.hit_box.points]
+
+    def show_pose(self, x, y, angle):
+        """Draw the sprite somewhere else without touching the state, e.g. for interpolation"""
+        arcade.Sprite.position.fset(self, (x, y))
+        arcade.Sprite.angle.fset(self, angle)
+
+    def sync(self):
+        """Mirror the state into the sprite after a simulation step"""
+        arcade.Sprite.position.fset(self, (self.state.x, self.state.y))
+        arcade.Sprite.angle.fset(self, self.state.angle)
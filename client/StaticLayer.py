@@ -0,0 +1,48 @@
+import arcade
+from arcade.texture_atlas import DefaultTextureAtlas
+
+
+class StaticLayer:
+    """
+    The map background and static entities rendered once into an offscreen
+    texture at game resolution, then drawn as a single sprite. It is only
+    rendered again when the background or the entity list changes, i.e. a
+    map loads or a destructible entity is destroyed.
+    """
+
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.texture = arcade.Texture.create_empty("static_layer", (width, height))
+        self.sprite = arcade.Sprite(self.texture, center_x=width / 2, center_y=height / 2)
+        # Own atlas, the layer cannot render into the atlas its sprites are drawn from
+        self.atlas = None
+        self.sprite_list = None
+        self.key = None
+        self.renders = 0
+
+    def invalidate(self):
+        self.key = None
+
+    def draw(self, background, entities):
+        """Draw the layer, rendering it first if the background or entities changed"""
+        if self.sprite_list is None:
+            # Needs a window, so not done in the constructor
+            self.atlas = DefaultTextureAtlas((self.width + 2, self.height + 2))
+            self.sprite_list = arcade.SpriteList(atlas=self.atlas, capacity=1)
+            self.sprite_list.append(self.sprite)
+
+        # Entities only ever leave the list during a round, a new map brings a new background
+        key = (background, len(entities))
+        if key != self.key:
+            self.render(background, entities)
+            self.key = key
+        self.sprite_list.draw()
+
+    def render(self, background, entities):
+        self.renders += 1
+        with self.atlas.render_into(self.texture) as fbo:
+            fbo.clear()
+            if background:
+                arcade.draw_sprite(background)
+            entities.draw()
@@ -1,214 +1,126 @@
 import math
 import arcade
-import time
-from client.Bullet import Bullet
+from client.BulletManager import BULLET_SPEED
+from client.SoundBank import SoundBank
+from client.SpriteView import SpriteView
+from client.TextureRegistry import TextureRegistry
 from client.assets.effects.FireEffect import FireEffect
-from client.assets.effects.ExplosionEffect import ExplosionEffect
-
-
-class Tank(arcade.Sprite):
-
-    def __init__(self, tank_color="blue", bullet_type="normal", scale=0.4, player_id=None):
+from core.State import TankState, state_property
+
+
+class Tank(SpriteView, arcade.Sprite):
+    """Sprite view of a TankState: texture, shot sound and muzzle flashes"""
+
+    TANK_TEXTURES = {
+        "blue": ":assets:images/tanks/blue_tank.png",
+        "green": ":assets:images/tanks/green_tank.png",
+        "red": ":assets:images/tanks/red_tank.png",
+        "yellow": ":assets:images/tanks/yellow_tank.png",
+    }
+    DEAD_TEXTURE = ":assets:images/tanks/dead.png"
+    SHOT_SOUND = ":assets:sounds/shot.mp3"
+
+    # Simulation fields live on the state
+    player_id = state_property("player_id")
+    speed = state_property("speed")
+    rotation_speed = state_property("rotation_speed")
+    is_rotating = state_property("is_rotating")
+    is_moving = state_property("is_moving")
+    clockwise = state_property("clockwise")
+    barrel_length = state_property("barrel_length")
+    health = state_property("health")
+    fire_cooldown = state_property("fire_cooldown")
+    is_recoiling = state_property("is_recoiling")
+
+    def __init__(self, tank_color="blue", bullet_type="normal", scale=0.4, player_id=None, bullet_manager=None,
+                 state=None):
+        self.state = state or TankState(player_id=player_id, tank_color=tank_color)
+        self.state.view = self
+        self.shown_destroyed = False
         self.tank_color = tank_color
         self.bullet_type = bullet_type
 
-        self.effects_list = arcade.SpriteList()
-
-        if self.tank_color == "blue":
-            self.tank_texture= ":assets:images/tanks/blue_tank.png"
-        elif self.tank_color == "green":
-            self.tank_texture = ":assets:images/tanks/green_tank.png"
-        elif self.tank_color == "red":
-            self.tank_texture = ":assets:images/tanks/red_tank.png"
-        elif self.tank_color == "yellow":
-            self.tank_texture = ":assets:images/tanks/yellow_tank.png"
+        self.tank_texture = self.TANK_TEXTURES.get(tank_color, self.TANK_TEXTURES["blue"])
 
-        super().__init__(self.tank_texture, scale)
+        super().__init__(TextureRegistry.get(self.tank_texture), scale)
+        self.state.hit_box = tuple(self.local_hit_box())
+        self.sync()
 
+        # Bullets are owned by the world's BulletManager
+        self.bullet_manager = bullet_manager
 
-        # Movement properties
-        self.rotation_speed = 100  # degrees per second
-        self.is_rotating = True
-        self.is_moving = False
-        self.speed = 200  # pixels per second
-        self.clockwise = True
-        self.barrel_length = 50
-
-        # Game properties
-        self.player_id = player_id
-        self.health = 1
-        self.destroyed = False
+        self.new_bullets = []
 
-        # Bullet management
-        self.bullet_type = bullet_type
-        self.bullet_list = arcade.SpriteList()
-        self.last_fire_time = 0
-        self.fire_cooldown = 0.5  # SHOOTING COOLDOWN
+        # Decoded once in the shared sound bank, usually already during the lobby
+        SoundBank.ensure_voices(self.SHOT_SOUND)
 
-        self.new_bullets = []
-        self.last_fire_time = 0
+        self.effects_list = TextureRegistry.sprite_list()
 
-        # Recoil properties
-        self.is_recoiling = False
-        self.recoil_start_time = 0
-        self.recoil_duration = 0.2
-        self.recoil_distance = 170
+    @property
+    def destroyed(self):
+        return self.state.destroyed
 
-        if self.bullet_type == "normal":
-            self.bullet_image = ":assets:images/bullet.png"
+    @destroyed.setter
+    def destroyed(self, value):
+        self.state.destroyed = value
+        self.sync()
 
-        self.shot_sound = arcade.load_sound(":assets:sounds/shot.mp3")
+    def sync(self):
+        super().sync()
+        if self.state.destroyed != self.shown_destroyed:
+            self.shown_destroyed = self.state.destroyed
+            self.texture = TextureRegistry.get(self.DEAD_TEXTURE if self.shown_destroyed else self.tank_texture)
+            if self.shown_destroyed:
+                print(f"Tank {self.player_id} destroyed!")
 
-        self.effects_list = arcade.SpriteList()
+    def update(self, delta_time: float, skip_movement=False):
+        """Standalone update of the state and effects, the game steps states through the world instead"""
+        self.update_effects(delta_time)
+        self.state.update(delta_time, skip_movement)
+        self.sync()
 
-    def update(self, delta_time: float, window_width=None, window_height=None, skip_movement=False):
-        # Handle recoil and effects first
+    def update_effects(self, delta_time):
         for effect in self.effects_list:
-            effect.update()
-
-        # Update bullets
-        self.bullet_list.update(delta_time)
-
-        # Clean up out-of-bounds bullets
-        if window_width and window_height:
-            self.cleanup_bullets(window_width, window_height)
-
-        if self.destroyed:
-            return
-
-        # Handle recoil if active
-        if hasattr(self, 'is_recoiling') and self.is_recoiling:
-            current_time = time.time()
-            elapsed = current_time - self.recoil_start_time
-            if elapsed < self.recoil_duration:
-                # Move in the opposite direction of the barrel
-                angle_rad = math.radians(self.angle + 180)  # Opposite direction
-                # Calculate smooth ease-out effect
-                progress = elapsed / self.recoil_duration
-                ease_factor = 1 - (1 - progress) * (1 - progress)  # Quadratic ease-out
-                # Apply recoil movement
-                recoil_speed = (self.recoil_distance / self.recoil_duration) * (1 - ease_factor)
-                self.center_x += recoil_speed * math.sin(angle_rad) * delta_time
-                self.center_y += recoil_speed * math.cos(angle_rad) * delta_time
-            else:
-                # End recoil
-                self.is_recoiling = False
-
-        # Always handle rotation, regardless of skip_movement
-        if self.is_rotating:
-            if self.clockwise:
-                self.angle += self.rotation_speed * delta_time
-            else:
-                self.angle -= self.rotation_speed * delta_time
-
-        # Only handle movement if not skipped
-        if not skip_movement and self.is_moving:
-            angle_rad = math.radians(self.angle)
-            self.center_x += self.speed * math.sin(angle_rad) * delta_time
-            self.center_y += self.speed * math.cos(angle_rad) * delta_time
+            effect.update(delta_time)
 
     def get_barrel_position(self):
         """Returns the position at the end of the barrel"""
-        angle_rad = math.radians(self.angle)
-        offset_x = math.sin(angle_rad) * self.barrel_length
-        offset_y = math.cos(angle_rad) * self.barrel_length
-        return self.center_x + offset_x, self.center_y + offset_y
+        return self.state.barrel_position()
 
     def fire(self):
         """Fire a bullet if cooldown has elapsed"""
-        current_time = time.time()
-        if current_time - self.last_fire_time < self.fire_cooldown:
+        bullet_index = self.state.fire(self.bullet_manager)
+        if bullet_index is None:
             return None
 
-        self.last_fire_time = current_time
-
-        arcade.play_sound(self.shot_sound)
-
-        # Initialize recoil effect
-        self.is_recoiling = True
-        self.recoil_start_time = current_time
-
-
-        # Get barrel position
-        barrel_x, barrel_y = self.get_barrel_position()
+        SoundBank.play(self.SHOT_SOUND)
 
         # Create fire effect at barrel end but slightly farther out
+        barrel_x, barrel_y = self.get_barrel_position()
         angle_rad = math.radians(self.angle)
         fire_distance = 40  # pixels beyond barrel end
         fire_x = barrel_x + math.sin(angle_rad) * fire_distance
         fire_y = barrel_y + math.cos(angle_rad) * fire_distance
 
-        fire_effect = FireEffect(":assets:images/fire.png", 0.5, fire_x, fire_y, self.angle)
-        self.effects_list.append(fire_effect)
-
-        # Create and return the bullet
-        bullet = Bullet(
-            self.bullet_image,
-            0.5,
-            barrel_x,
-            barrel_y,
-            self.angle,
-            self  # Pass source tank to prevent self-damage
-        )
-
-        self.bullet_list.append(bullet)
-        self.new_bullets.append(bullet)
-        return bullet
-
-    def cleanup_bullets(self, window_width, window_height):
-        """Remove bullets that have gone off-screen"""
-        for bullet in self.bullet_list:
-            if (bullet.center_x < 0 or bullet.center_x > window_width or
-                    bullet.center_y < 0 or bullet.center_y > window_height):
-                bullet.remove_from_sprite_lists()
-
-    def check_bullet_collisions(self, other_tanks, effects_manager=None):
-        """Check for collisions between this tank's bullets and other tanks"""
-        hit_tank = None
-        for bullet in self.bullet_list:
-            for tank in other_tanks:
-                # Remove the "not tank.destroyed" condition - bullets can hit dead tanks too
-                if tank != self and arcade.check_for_collision(bullet, tank):
-                    # Create explosion effect at bullet impact point
-                    if effects_manager:
-                        explosion = ExplosionEffect(bullet.center_x, bullet.center_y)
-                        effects_manager.add_effect(explosion)
-
-                    bullet.remove_from_sprite_lists()
-
-                    # Only deal damage if tank is still alive
-                    if not tank.destroyed:
-                        tank.take_damage()
-                        hit_tank = tank
-                    else:
-                        # Tank is already dead, but bullet still hits it (creates explosion)
-                        hit_tank = tank
-                    break
-            if hit_tank:
-                break
-        return hit_tank
+        self.effects_list.append(FireEffect.spawn(fire_x, fire_y, self.angle))
+
+        # Queued for the next network update
+        self.new_bullets.append({"x": barrel_x, "y": barrel_y, "angle": self.angle, "speed": BULLET_SPEED})
+        return bullet_index
 
     def take_damage(self, damage=1):
         """Handle taking damage"""
-        self.health -= damage
-        if self.health <= 0:
-            self.destroyed = True
-            dead_texture_path = f":assets:images/tanks/dead.png"
-            self.texture = arcade.load_texture(dead_texture_path)
-            print(f"Tank {self.player_id} destroyed!")
+        self.state.take_damage(damage)
+        self.sync()
         return self.destroyed
 
     def handle_key_press(self, key, modifiers=None):
         """Handle key press for this tank"""
-        if key == arcade.key.SPACE and not self.destroyed:
-            self.is_rotating = False
-            self.is_moving = True
+        if key == arcade.key.SPACE and self.state.press():
             return self.fire()
         return None
 
     def handle_key_release(self, key, modifiers=None):
         """Handle key release for this tank"""
-        if key == arcade.key.SPACE and not self.destroyed:
-            self.is_moving = False
-            self.is_rotating = True
-            self.clockwise = not self.clockwise
+        if key == arcade.key.SPACE:
+            self.state.release()
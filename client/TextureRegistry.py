@@ -0,0 +1,89 @@
+import time
+
+import arcade
+from arcade.texture_atlas import DefaultTextureAtlas
+
+# Starting size of the game atlas, it grows on its own if a map needs more
+ATLAS_SIZE = (2048, 2048)
+
+
+class TextureRegistry:
+    """
+    Every texture the game uses, loaded once by path. Game sprites are packed
+    into one shared atlas; sprite lists made with sprite_list() draw from it,
+    so tanks, bullets, effects and entities never need a texture switch.
+    """
+
+    textures = {}  # path -> Texture
+    load_seconds = 0.0
+    _atlas = None
+
+    @classmethod
+    def get(cls, path, fallback=None):
+        """Texture for a path, loaded on first use. A missing file falls back to another path if given."""
+        texture = cls.textures.get(path)
+        if texture is not None:
+            return texture
+
+        start = time.perf_counter()
+        try:
+            texture = arcade.load_texture(path)
+            cls.load_seconds += time.perf_counter() - start
+        except FileNotFoundError:
+            if fallback is None:
+                raise
+            print(f"WARNING: Texture {path} missing, using {fallback}")
+            texture = cls.get(fallback)
+        cls.textures[path] = texture
+        return texture
+
+    @classmethod
+    def atlas(cls):
+        """The shared game atlas, created with the first sprite list (needs a window)"""
+        if cls._atlas is None:
+            cls._atlas = DefaultTextureAtlas(ATLAS_SIZE)
+        return cls._atlas
+
+    @classmethod
+    def sprite_list(cls, **kwargs):
+        """A SpriteList drawing from the shared atlas"""
+        return arcade.SpriteList(atlas=cls.atlas(), **kwargs)
+
+    @classmethod
+    def preload(cls, *path_groups):
+        """Load the given paths and pack them into the atlas ahead of the match"""
+        atlas = cls.atlas()
+        start = time.perf_counter()
+        for paths in path_groups:
+            for path in paths:
+                try:
+                    texture = cls.get(path)
+                except FileNotFoundError as e:
+                    print(f"ERROR: Failed to preload texture: {e}")
+                    continue
+                if not atlas.has_texture(texture):
+                    atlas.add(texture)
+        stats = cls.stats()
+        print(f"Preloaded {stats['textures']} textures in {(time.perf_counter() - start) * 1000:.0f} ms, "
+              f"atlas {stats['atlas_size'][0]}x{stats['atlas_size'][1]} "
+              f"({stats['atlas_textures']} textures, {stats['atlas_bytes'] / 2 ** 20:.1f} MiB)")
+        return stats
+
+    @classmethod
+    def stats(cls):
+        """Counts, pixel memory and load time of the registry and its atlas"""
+        image_bytes = sum(texture.width * texture.height * 4 for texture in set(cls.textures.values()))
+        stats = {
+            "textures": len(cls.textures),
+            "image_bytes": image_bytes,
+            "load_ms": round(cls.load_seconds * 1000, 1),
+            "atlas_size": (0, 0),
+            "atlas_textures": 0,
+            "atlas_bytes": 0,
+        }
+        if cls._atlas is not None:
+            width, height = cls._atlas.size
+            stats["atlas_size"] = (width, height)
+            stats["atlas_textures"] = len(cls._atlas.textures)
+            stats["atlas_bytes"] = width * height * 4
+        return stats
@@ -1,6 +1,10 @@
 import arcade
 import random
 
+from client.SoundBank import SoundBank
+
+DESTROY_SOUND = ":assets:sounds/hush.mp3"
+
 class Tree(arcade.Sprite):
     def __init__(self):
         super().__init__(":assets:images/bush.png")
@@ -10,7 +14,7 @@ class Tree(arcade.Sprite):
         # self.health = random.randint(2, 5)  # Each tree gets 2–5 health points
         self.health = 1
 
-        self.destroy_sound = arcade.load_sound(":assets:sounds/hush.mp3")
+        SoundBank.ensure_voices(DESTROY_SOUND)
 
     def update(self, bullet_list):
         hit_list = arcade.check_for_collision_with_list(self, bullet_list)
@@ -18,6 +22,6 @@ class Tree(arcade.Sprite):
             bullet.remove_from_sprite_lists()
             self.health -= 1
             if self.health <= 0:
-                arcade.play_sound(self.destroy_sound)
+                SoundBank.play(DESTROY_SOUND)
                 self.remove_from_sprite_lists()
                 break
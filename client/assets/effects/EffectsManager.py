@@ -1,9 +1,10 @@
-import arcade
+from client.TextureRegistry import TextureRegistry
 
 
 class EffectsManager:
-    def __init__(self):
-        self.effects_list = arcade.SpriteList()
+    def __init__(self, effects_list=None):
+        # A headless run passes its own sprite list, the shared atlas needs a window
+        self.effects_list = effects_list if effects_list is not None else TextureRegistry.sprite_list()
 
     def add_effect(self, effect):
         self.effects_list.append(effect)
@@ -18,5 +19,13 @@ class EffectsManager:
         for effect in finished_effects:
             effect.remove_from_sprite_lists()
 
+    def clear(self):
+        """Drop all running effects, returning pooled ones to their pool"""
+        for effect in list(self.effects_list):
+            if hasattr(effect, 'release'):
+                effect.release()
+            else:
+                effect.remove_from_sprite_lists()
+
     def draw(self):
         self.effects_list.draw()
@@ -1,9 +1,21 @@
 import arcade
 
+from client.ObjectPool import ObjectPool
+from client.TextureRegistry import TextureRegistry
+
+EXPLOSION_FRAMES = [f":assets:images/vybuch/hit/hit{i}.png" for i in range(5)]
+EXPLOSION_FALLBACK = ":assets:images/vybuch/hit/hit2.png"
+
 
 class ExplosionEffect(arcade.Sprite):
     """Simple frame-based explosion effect"""
 
+    # Frames are shared by every explosion, loaded on first use
+    _textures = None
+
+    # Shared pool of explosions, see configure_pool
+    pool = None
+
     def __init__(self, x, y, scale=1.2):
         super().__init__()
 
@@ -12,15 +24,7 @@ class ExplosionEffect(arcade.Sprite):
         self.center_y = y
         self.scale = scale
 
-        # Load explosion textures
-        self.explosion_textures = []
-        for i in range(5):
-            try:
-                texture = arcade.load_texture(f":assets:images/vybuch/hit/hit{i}.png")
-                self.explosion_textures.append(texture)
-            except FileNotFoundError:
-                texture = arcade.load_texture(":assets:images/vybuch/hit/hit2.png")
-                self.explosion_textures.append(texture)
+        self.explosion_textures = self.load_textures()
 
         # Animation state
         self.current_frame = 0
@@ -31,6 +35,43 @@ class ExplosionEffect(arcade.Sprite):
         # Set initial texture
         self.texture = self.explosion_textures[0]
 
+    @classmethod
+    def load_textures(cls):
+        if cls._textures is None:
+            cls._textures = [TextureRegistry.get(path, EXPLOSION_FALLBACK) for path in EXPLOSION_FRAMES]
+        return cls._textures
+
+    @classmethod
+    def configure_pool(cls, size):
+        if cls.pool is None:
+            cls.pool = ObjectPool(lambda: cls(0, 0), size, "explosion")
+        else:
+            cls.pool.reserve(size)
+
+    @classmethod
+    def spawn(cls, x, y):
+        """Take an explosion from the pool and restart its animation at (x, y)"""
+        if cls.pool is None:
+            cls.configure_pool(0)
+        effect = cls.pool.acquire()
+        effect.reset(x, y)
+        return effect
+
+    def reset(self, x, y):
+        self.center_x = x
+        self.center_y = y
+        self.current_frame = 0
+        self.frame_timer = 0.0
+        self.is_finished = False
+        self.alpha = 255
+        self.texture = self.explosion_textures[0]
+
+    def release(self):
+        """Remove from all lists and hand back to the pool"""
+        self.remove_from_sprite_lists()
+        if ExplosionEffect.pool is not None:
+            ExplosionEffect.pool.release(self)
+
     def update(self, delta_time: float = 1 / 60):
         """Update the explosion animation"""
         if self.is_finished:
@@ -48,9 +89,8 @@ class ExplosionEffect(arcade.Sprite):
             if self.current_frame >= len(self.explosion_textures):
                 self.is_finished = True
                 self.alpha = 0  # Make invisible
-                self.remove_from_sprite_lists()
+                self.release()
                 return
 
             # Update texture to next frame
             self.texture = self.explosion_textures[self.current_frame]
-
@@ -1,18 +1,53 @@
-# Add to your imports at the top
-import time
-
 from arcade.sprite import Sprite
 
+from client.ObjectPool import ObjectPool
+from client.TextureRegistry import TextureRegistry
+
+FIRE_TEXTURE = ":assets:images/fire.png"
+
+
 class FireEffect(Sprite):
+    # Shared pool of muzzle flashes, see configure_pool
+    pool = None
+
     def __init__(self, image_file, scale, x, y, angle):
         super().__init__(image_file, scale)
         self.center_x = x
         self.center_y = y
         self.angle = angle
-        self.creation_time = time.time()
+        self.age = 0.0  # advanced by simulation steps
         self.lifetime = 0.15  # Effect lasts for 150ms
 
-    def update(self):
+    @classmethod
+    def configure_pool(cls, size):
+        if cls.pool is None:
+            cls.pool = ObjectPool(lambda: cls(TextureRegistry.get(FIRE_TEXTURE), 0.5, 0, 0, 0), size, "fire")
+        else:
+            cls.pool.reserve(size)
+
+    @classmethod
+    def spawn(cls, x, y, angle):
+        """Take a flash from the pool and place it"""
+        if cls.pool is None:
+            cls.configure_pool(0)
+        effect = cls.pool.acquire()
+        effect.reset(x, y, angle)
+        return effect
+
+    def reset(self, x, y, angle):
+        self.center_x = x
+        self.center_y = y
+        self.angle = angle
+        self.age = 0.0
+
+    def release(self):
+        """Remove from all lists and hand back to the pool"""
+        self.remove_from_sprite_lists()
+        if FireEffect.pool is not None:
+            FireEffect.pool.release(self)
+
+    def update(self, delta_time: float = 1 / 60):
         # Check if the effect should be removed
-        if time.time() - self.creation_time > self.lifetime:
-            self.remove_from_sprite_lists()
+        self.age += delta_time
+        if self.age > self.lifetime:
+            self.release()
@@ -1,15 +1,30 @@
 import arcade
 import pyglet
-import math
-from typing import List, Optional, Tuple
+from PIL import Image, ImageDraw, ImageFont
+from typing import Optional, Tuple
+
+# Font files for the names used with OutlinedText, the rasterizer needs the file itself
+FONT_FILES = {
+    "ARCO": ":assets:fonts/ARCO.ttf",
+}
+
+# pyglet lays text out at 96 dpi, font sizes are in points
+FONT_DPI = 96
 
 
 class OutlinedText:
     """
-    High-performance outlined text class with smooth circular outlines.
-    Manages its own batch and text objects for optimal performance.
+    Outlined text drawn as a single textured quad. Each distinct string is
+    rasterized once with its outline and packed into a shared texture bin,
+    so moving the text only moves the quad and all labels in a batch draw
+    from the same texture.
     """
 
+    # (text, font_name, font_size, stroke_width, text_color, outline_color) -> (texture region, baseline)
+    _textures = {}
+    _fonts = {}
+    _bin = None
+
     def __init__(self, text: str, x: float, y: float,
                  text_color: Tuple[int, int, int] = arcade.color.WHITE,
                  outline_color: Tuple[int, int, int] = arcade.color.BLACK,
@@ -27,7 +42,7 @@ class OutlinedText:
             font_size: Font size in points
             stroke_width: Outline thickness in pixels
             anchor_x, anchor_y: Text anchoring
-            num_outline_points: Smoothness of circular outline
+            num_outline_points: Unused, the outline is rasterized as a true stroke
             batch: Optional external batch (creates own if None)
         """
         self.text = text
@@ -46,68 +61,96 @@ class OutlinedText:
         self.external_batch = batch is not None
         self.batch = batch if batch else pyglet.graphics.Batch()
 
-        # Store text objects
-        self.text_objects: List[arcade.Text] = []
-
-        # Create the outlined text
-        self._create_text_objects()
-
-    def _generate_circular_offsets(self) -> List[Tuple[int, int]]:
-        """Generate smooth circular offsets for outline."""
-        offsets = []
-        if self.stroke_width > 0:
-            for i in range(self.num_outline_points):
-                angle = (2 * math.pi * i) / self.num_outline_points
-                x_offset = int(self.stroke_width * math.cos(angle))
-                y_offset = int(self.stroke_width * math.sin(angle))
-                offsets.append((x_offset, y_offset))
-        return offsets
-
-    def _create_text_objects(self):
-        """Create all text objects (outline + main text)."""
-        self.text_objects.clear()
-
-        # Create outline objects
-        outline_offsets = self._generate_circular_offsets()
-        for offset_x, offset_y in outline_offsets:
-            outline_text = arcade.Text(
-                self.text, self.x + offset_x, self.y + offset_y,
-                self.outline_color, self.font_size,
-                anchor_x=self.anchor_x, anchor_y=self.anchor_y,
-                batch=self.batch, font_name=self.font_name
-            )
-            self.text_objects.append(outline_text)
-
-        # Create main text object
-        main_text = arcade.Text(
-            self.text, self.x, self.y, self.text_color, self.font_size,
-            anchor_x=self.anchor_x, anchor_y=self.anchor_y,
-            batch=self.batch, font_name=self.font_name
+        self.baseline = 0
+        self.sprite = pyglet.sprite.Sprite(self._texture(), batch=self.batch)
+        self._place()
+
+    @classmethod
+    def _font(cls, font_name, font_size):
+        key = (font_name, font_size)
+        font = cls._fonts.get(key)
+        if font is None:
+            pixel_size = max(1, round(font_size * FONT_DPI / 72))
+            try:
+                path = arcade.resources.resolve(FONT_FILES.get(font_name, font_name))
+                font = ImageFont.truetype(str(path), pixel_size)
+            except (OSError, FileNotFoundError):
+                print(f"WARNING: Font {font_name} not found, outlined text uses the default font")
+                font = ImageFont.load_default(pixel_size)
+            cls._fonts[key] = font
+        return font
+
+    @classmethod
+    def rasterize(cls, text, font_name, font_size, stroke_width, text_color, outline_color):
+        """Cached texture of the outlined string and the baseline height inside it"""
+        key = (text, font_name, font_size, stroke_width, tuple(text_color), tuple(outline_color))
+        cached = cls._textures.get(key)
+        if cached is not None:
+            return cached
+
+        font = cls._font(font_name, font_size)
+        ascent, descent = font.getmetrics()
+        stroke = max(0, int(stroke_width))
+        left, _, right, _ = font.getbbox(text, anchor="ls", stroke_width=stroke)
+        width = max(1, right - left)
+        height = ascent + descent + 2 * stroke
+
+        image = Image.new("RGBA", (width, height), (0, 0, 0, 0))
+        ImageDraw.Draw(image).text(
+            (-left, stroke + ascent), text, font=font, anchor="ls",
+            fill=tuple(text_color), stroke_width=stroke, stroke_fill=tuple(outline_color)
         )
-        self.text_objects.append(main_text)
+        if cls._bin is None:
+            cls._bin = pyglet.image.atlas.TextureBin()
+        texture = cls._bin.add(pyglet.image.ImageData(width, height, "RGBA", image.tobytes(), pitch=-width * 4))
+
+        cached = cls._textures[key] = (texture, descent + stroke)
+        return cached
+
+    def _texture(self):
+        texture, self.baseline = self.rasterize(self.text, self.font_name, self.font_size, self.stroke_width,
+                                                self.text_color, self.outline_color)
+        return texture
+
+    def _place(self):
+        """Move the quad so the anchor point sits on (x, y)"""
+        width, height = self.sprite.width, self.sprite.height
+        offset_x = {"left": 0, "center": width / 2, "right": width}.get(self.anchor_x, 0)
+        offset_y = {"bottom": 0, "baseline": self.baseline, "center": height / 2, "top": height}.get(self.anchor_y, 0)
+        self.sprite.position = (round(self.x - offset_x), round(self.y - offset_y), 0)
+
+    @property
+    def width(self) -> int:
+        return self.sprite.width
+
+    @property
+    def height(self) -> int:
+        return self.sprite.height
 
     def update_text(self, new_text: str):
         """Update the displayed text."""
         self.text = new_text
-        self._create_text_objects()
+        self.sprite.image = self._texture()
+        self._place()
 
     def update_position(self, x: float, y: float):
         """Move the text to a new position."""
         self.x = x
         self.y = y
-        self._create_text_objects()
+        self._place()
 
     def update_colors(self, text_color: Tuple[int, int, int],
                       outline_color: Tuple[int, int, int]):
         """Change text and outline colors."""
         self.text_color = text_color
         self.outline_color = outline_color
-        self._create_text_objects()
+        self.sprite.image = self._texture()
 
     def update_stroke_width(self, stroke_width: int):
         """Change outline thickness."""
         self.stroke_width = stroke_width
-        self._create_text_objects()
+        self.sprite.image = self._texture()
+        self._place()
 
     def draw(self):
         """Draw the outlined text (only needed if not using external batch)."""
@@ -9,14 +9,26 @@ from arcade.gui import (
     UIManager, UITextureButton, UIAnchorLayout, UIBoxLayout, UILabel, UISlider
 )
 from arcade.types import Color
-from client.Bullet import Bullet
+from client.AssetPreloader import AssetPreloader, texture_groups
+from client.BackgroundCache import BackgroundCache
+from client.FramePacer import FramePacer
+from client.BulletManager import BulletManager, BULLET_SPEED
 from client.Tank import Tank
+from client.TextureRegistry import TextureRegistry
 from client.assets.effects.FireEffect import FireEffect
 from non_player.StaticEntity import StaticEntity
 from non_player.EntityManager import EntityManager
+from core.Arena import Arena
+from core.CollisionGrid import CollisionGrid, bake_collision_grid, bake_digest
+from core.Profiler import Profiler
+from core.World import World, step
+from network.MapSync import hash_file
 from client.assets.effects.EffectsManager import EffectsManager
 from client.assets.effects.ExplosionEffect import ExplosionEffect
-from client.assets.effects.OutlinedText import OutlinedText
+from client.NetGraph import NetGraph
+from client.ScoreboardOverlay import ScoreboardOverlay
+from client.SoundBank import SoundBank
+from client.StaticLayer import StaticLayer
 
 
 
@@ -27,6 +39,9 @@ arcade.resources.add_resource_handle("assets", str(path.resolve()))
 path = project_root / ".config" / "maps"
 arcade.resources.add_resource_handle("maps", str(path.resolve()))
 
+# Baked static collision grids, one per map version and resolution
+COLLISION_CACHE_DIR = project_root / ".cache" / "collision"
+
 TEX_EXIT_BUTTON = arcade.load_texture(":assets:images/exit.png")
 
 # Load settings
@@ -40,35 +55,13 @@ except json.JSONDecodeError:
     settings = {}
 
 
-class MapBoundary:
-    """Represents a map boundary for collision detection"""
-
-    def __init__(self, x, y, width, height):
-        self.x = x
-        self.y = y
-        self.width = width
-        self.height = height
-        self.center_x = x + width / 2
-        self.center_y = y + height / 2
-
-    def check_collision_with_point(self, x, y):
-        """Check if a point collides with this boundary"""
-        return (self.x <= x <= self.x + self.width and
-                self.y <= y <= self.y + self.height)
-
-    def check_collision_with_sprite(self, sprite):
-        """Check if a sprite collides with this boundary"""
-        return (sprite.center_x - sprite.width / 2 < self.x + self.width and
-                sprite.center_x + sprite.width / 2 > self.x and
-                sprite.center_y - sprite.height / 2 < self.y + self.height and
-                sprite.center_y + sprite.height / 2 > self.y)
-
-
 class GameView(arcade.View):
     def __init__(self, window, client_or_server, is_client, color_assignments=None, spawn_assignments=None):
         super().__init__()
 
-        window.set_vsync(True)
+        # Frame pacing: "vsync", "capped" (precise sleep to fps_cap) or "uncapped" for benchmarks
+        self.frame_pacer = FramePacer(window, settings.get("frame_pacing", "vsync"), settings.get("fps_cap", 120),
+                                      settings.get("frame_budgets_ms"))
 
 
         # Fixed game resolution - this defines the logical game world size
@@ -91,20 +84,46 @@ class GameView(arcade.View):
         self.map_data = None
         self.spawn_positions = []
         self.background = None
+        # "high", "medium" or "low", lower tiers keep a smaller background in memory
+        self.background_quality = settings.get("background_quality", "high")
 
-        # Map boundaries
-        self.map_boundaries = []
+        # Walls are baked this thick outside of the arena
         self.boundary_thickness = 20
 
+        # Walls and indestructible entities baked into an occupancy grid (0 disables it)
+        self.collision_grid_resolution = settings.get("collision_grid_resolution", 8)
+
         # Static entities
         self.entity_manager = EntityManager()
-        self.static_entities = arcade.SpriteList()
+        self.static_entities = TextureRegistry.sprite_list()
+        self.map_entities = []  # Entities in map file order, used to address them in state snapshots
+        self.static_layer = StaticLayer(self.GAME_WIDTH, self.GAME_HEIGHT)
+
+        # Textures and sounds were decoded on worker threads during the lobby, only
+        # packing them into the shared atlas is left for the main thread
+        AssetPreloader.wait(timeout=10)
+        TextureRegistry.preload(*texture_groups())
+
+        # Reusable bullets and effects, sized so a busy fight does not allocate
+        pool_sizes = settings.get("pool_sizes", {})
+        FireEffect.configure_pool(pool_sizes.get("fire", 16))
+        ExplosionEffect.configure_pool(pool_sizes.get("explosion", 32))
+
+        # Overlapping shots and destructions per clip, and all sound effects together
+        voice_limits = settings.get("sound_voices", {})
+        SoundBank.configure(voice_limits.get("per_clip", 4), voice_limits.get("total", 16))
+
+        # Every bullet in flight, for all tanks
+        self.bullets = BulletManager(self.GAME_WIDTH, self.GAME_HEIGHT, pool_size=pool_sizes.get("bullet", 128))
+
+        # Simulation state, the sprites below are views of it
+        self.world = World(self.GAME_WIDTH, self.GAME_HEIGHT, self.bullets)
 
         # Load the map first
         self.load_map(self.current_map)
 
         # Tanks
-        self.tanks = arcade.SpriteList()
+        self.tanks = TextureRegistry.sprite_list()
         self.other_player_tanks = {}
         self.player_tank = None
 
@@ -112,6 +131,7 @@ class GameView(arcade.View):
         self.scoreboard = {}
         self.death_order = []
         self.show_scoreboard = False
+        self.scoreboard_overlay = ScoreboardOverlay()
 
         # Initialize player tank with map spawn data
         self.setup_player_tank()
@@ -136,6 +156,24 @@ class GameView(arcade.View):
         self.last_resize_time = 0
         self.resize_delay = 0.05
 
+        # Fixed-step simulation, rendering interpolates between the last two ticks
+        self.tick_rate = settings.get("simulation_rate", 60)
+        self.tick_dt = 1 / self.tick_rate
+        self.tick = 0
+        self.tick_accumulator = 0.0
+        self.max_steps_per_frame = 8
+        self.previous_tank_poses = {}
+
+        # Network statistics overlay (toggle with N)
+        self.netgraph = NetGraph(client_or_server)
+        self.show_netgraph = settings.get("show_netgraph", False)
+        self.tank_update_seq = 0
+
+        # Frame time statistics overlay (toggle with F), text refreshed a few times per second
+        self.show_frame_stats = settings.get("show_frame_stats", False)
+        self.frame_stats_text = arcade.Text("", 10, 10, arcade.color.WHITE, 12)
+        self.frame_stats_refresh = 0
+
         self.setup_cameras()
 
         self.effects_manager = EffectsManager()
@@ -206,13 +244,14 @@ class GameView(arcade.View):
 
     def load_map(self, map_name):
         """Load map data from JSON file and create game objects"""
+        self.world.set_collision_grid(None)
         if not map_name:
             print("ERROR: No map name provided")
             self.setup_default_map()
             return
 
         try:
-            map_file_path = project_root / ".config" / "maps" / f"{map_name}.json"
+            map_file_path = self.resolve_map_file(map_name)
             if not map_file_path.exists():
                 print(f"ERROR: Map file not found: {map_file_path}")
                 self.setup_default_map()
@@ -227,7 +266,7 @@ class GameView(arcade.View):
             self.load_background()
 
             # Setup map boundaries
-            self.setup_map_boundaries()
+            self.setup_arena()
 
             # Load spawn positions
             self.load_spawn_positions()
@@ -235,6 +274,9 @@ class GameView(arcade.View):
             # Load static entities
             self.load_static_entities()
 
+            # Bake walls and indestructible entities into the collision grid
+            self.load_collision_grid(map_name, map_file_path)
+
         except json.JSONDecodeError as e:
             print(f"ERROR: Invalid JSON in map file {map_name}: {e}")
             self.setup_default_map()
@@ -242,6 +284,28 @@ class GameView(arcade.View):
             print(f"ERROR: Failed to load map {map_name}: {e}")
             self.setup_default_map()
 
+    def get_map_downloader(self):
+        """Map downloader of the client connection, None when hosting"""
+        if self.is_client and self.client_or_server:
+            return getattr(self.client_or_server, 'map_downloader', None)
+        return None
+
+    def resolve_map_file(self, map_name):
+        """Path of the map JSON, preferring the copy matching the server's content hash"""
+        downloader = self.get_map_downloader()
+        if downloader:
+            cached_path = downloader.resolve_map(map_name)
+            if cached_path:
+                return cached_path
+        return project_root / ".config" / "maps" / f"{map_name}.json"
+
+    def resolve_map_asset(self, resource):
+        """Resolve an asset referenced by the current map through the map cache"""
+        downloader = self.get_map_downloader()
+        if downloader:
+            return downloader.resolve_asset(self.current_map, resource)
+        return resource
+
     def setup_default_map(self):
         """Setup default map if loading fails"""
         print("Setting up default map")
@@ -264,15 +328,17 @@ class GameView(arcade.View):
 
         # Load default background
         self.load_background()
-        self.setup_map_boundaries()
+        self.setup_arena()
 
     def load_background(self):
         """Load and properly scale map background to fit fixed game resolution"""
         try:
             bg_path = self.map_data.get("map_info", {}).get("background", ":assets:images/forestBG.jpg")
+            bg_path = self.resolve_map_asset(bg_path)
 
-            # Load the background texture
-            background_texture = arcade.load_texture(bg_path)
+            # Pre-resized background, decoded and scaled only once per source file
+            background_texture = BackgroundCache.get(bg_path, self.GAME_WIDTH, self.GAME_HEIGHT,
+                                                     self.background_quality)
             self.background = arcade.Sprite(background_texture)
 
             # Scale background to fit fixed game resolution
@@ -301,24 +367,11 @@ class GameView(arcade.View):
             self.background.center_x = self.GAME_WIDTH // 2
             self.background.center_y = self.GAME_HEIGHT // 2
 
-    def setup_map_boundaries(self):
-        """Create invisible boundary walls around the fixed game resolution edges"""
-        self.map_boundaries = [
-            # Top boundary
-            MapBoundary(-self.boundary_thickness, self.GAME_HEIGHT,
-                        self.GAME_WIDTH + 2 * self.boundary_thickness, self.boundary_thickness),
-            # Bottom boundary
-            MapBoundary(-self.boundary_thickness, -self.boundary_thickness,
-                        self.GAME_WIDTH + 2 * self.boundary_thickness, self.boundary_thickness),
-            # Left boundary
-            MapBoundary(-self.boundary_thickness, 0,
-                        self.boundary_thickness, self.GAME_HEIGHT),
-            # Right boundary
-            MapBoundary(self.GAME_WIDTH, 0,
-                        self.boundary_thickness, self.GAME_HEIGHT)
-        ]
-
-        print(f"Created {len(self.map_boundaries)} map boundaries for game resolution {self.GAME_WIDTH}x{self.GAME_HEIGHT}")
+    def setup_arena(self):
+        """Bound the playable area by the fixed game resolution, or the map's own arena outline"""
+        arena = self.world.arena = Arena.from_map(self.map_data or {}, self.GAME_WIDTH, self.GAME_HEIGHT)
+        shape = f"{len(arena.polygon)}-point outline" if arena.polygon else "rectangle"
+        print(f"Arena is a {shape} for game resolution {self.GAME_WIDTH}x{self.GAME_HEIGHT}")
 
     def load_spawn_positions(self):
         """Load tank spawn positions from map data"""
@@ -372,7 +425,9 @@ class GameView(arcade.View):
                         rotation=rotation
                     )
 
-                    # Add to both the entity manager and sprite list
+                    # Add its state to the world, the sprite to the entity manager and sprite list
+                    self.world.add_entity(entity.state)
+                    self.map_entities.append(entity)
                     self.entity_manager.add_entity(entity)
                     self.static_entities.append(entity)
 
@@ -385,28 +440,40 @@ class GameView(arcade.View):
         except Exception as e:
             print(f"ERROR: Failed to load static entities: {e}")
 
-    def check_tank_boundary_collision(self, tank, new_x, new_y):
-        """Check if tank would collide with map boundaries at new position"""
-        # Create a temporary position to test
-        old_x, old_y = tank.center_x, tank.center_y
-        tank.center_x, tank.center_y = new_x, new_y
-
-        collision = False
-        for boundary in self.map_boundaries:
-            if boundary.check_collision_with_sprite(tank):
-                collision = True
-                break
+    def load_collision_grid(self, map_name, map_file_path):
+        """Load the baked collision grid of the map from cache, baking it if the map changed"""
+        resolution = self.collision_grid_resolution
+        if not resolution:
+            return
 
-        # Restore original position
-        tank.center_x, tank.center_y = old_x, old_y
-        return collision
+        try:
+            # Align the world edges with cell edges so walls do not spill into the arena
+            margin = math.ceil(self.boundary_thickness / resolution) * resolution
+            # The bake digest covers the bake rules and the baked hit boxes, which change with
+            # entity textures, scales and the hit box algorithm even when the map file does not
+            bake_key = bake_digest(self.world.entities, self.world.arena)[:16]
+            key = f"{hash_file(map_file_path)[:16]}-{bake_key}-{self.GAME_WIDTH}x{self.GAME_HEIGHT}-{resolution}"
+            grid_path = COLLISION_CACHE_DIR / f"{map_name}-{key}.grid"
+
+            if grid_path.exists():
+                grid = CollisionGrid.load(grid_path)
+            else:
+                start = time.perf_counter()
+                grid = bake_collision_grid(
+                    self.world.entities, self.world.arena, -margin, -margin,
+                    self.GAME_WIDTH + 2 * margin, self.GAME_HEIGHT + 2 * margin, resolution
+                )
+                # Grids baked from older versions of this map are stale now
+                for old_grid in COLLISION_CACHE_DIR.glob(f"{map_name}-*.grid"):
+                    old_grid.unlink(missing_ok=True)
+                grid.save(grid_path)
+                print(f"Baked collision grid for {map_name}: {grid.cols}x{grid.rows} cells, "
+                      f"{grid.count_solid()} occupied, {len(grid.polygons)} hit boxes, {(time.perf_counter() - start) * 1000:.0f} ms")
+        except (OSError, ValueError) as e:
+            print(f"ERROR: Collision grid unavailable, using per-entity checks: {e}")
+            return
 
-    def check_bullet_boundary_collision(self, bullet):
-        """Check if bullet collides with map boundaries"""
-        for boundary in self.map_boundaries:
-            if boundary.check_collision_with_sprite(bullet):
-                return True
-        return False
+        self.world.set_collision_grid(grid)
 
     def setup_player_tank(self):
         """Setup the player tank with proper spawn position and color"""
@@ -462,12 +529,12 @@ class GameView(arcade.View):
                 tank_color = "blue"
 
         # Create player tank
-        self.player_tank = Tank(tank_color=tank_color, player_id=player_id)
+        self.player_tank = Tank(tank_color=tank_color, player_id=player_id, bullet_manager=self.bullets)
         self.player_tank.center_x = spawn_position[0]
         self.player_tank.center_y = spawn_position[1]
         self.player_tank.angle = spawn_rotation
         self.player_tank.is_rotating = True
-        self.tanks.append(self.player_tank)
+        self.add_tank(self.player_tank)
 
         if player_id not in self.scoreboard:
             self.scoreboard[player_id] = 0
@@ -494,6 +561,7 @@ class GameView(arcade.View):
         self.manager.add(anchor)
 
     def on_draw(self):
+        draw_start = time.perf_counter()
         arcade.set_background_color(arcade.color.DARK_GRAY)
         # Clear the screen
         self.clear()
@@ -501,50 +569,107 @@ class GameView(arcade.View):
         # Draw game content with game camera
         self.game_camera.use()
 
-        # Draw background
-        if self.background:
-            arcade.draw_sprite(self.background)
+        # Background and static entities, cached until one of them changes
+        with Profiler.scope("draw.static_layer"):
+            self.static_layer.draw(self.background, self.static_entities)
 
-        # Draw static entities
-        self.static_entities.draw()
-
-        # Draw game elements
-        for tank in self.tanks:
-            tank.bullet_list.draw()
-            tank.effects_list.draw()
-        self.tanks.draw()
+        # Draw game elements between the last two simulation ticks
+        with Profiler.scope("draw.dynamic"):
+            alpha = self.render_alpha()
+            self.interpolate_tanks(alpha)
+            self.bullets.draw(alpha)
+            for tank in self.tanks:
+                tank.effects_list.draw()
+            self.tanks.draw()
 
-        self.effects_manager.draw()
+            self.effects_manager.draw()
 
         # Draw debug information
         if self.show_hitboxes:
-            for tank in self.tanks:
-                tank.bullet_list.draw_hit_boxes(arcade.color.RED,self.hitbox_line_thickness)
+            self.bullets.sprite_list.draw_hit_boxes(arcade.color.RED,self.hitbox_line_thickness)
             self.tanks.draw_hit_boxes(arcade.color.GREEN,self.hitbox_line_thickness)
             self.static_entities.draw_hit_boxes(arcade.color.BLUE,self.hitbox_line_thickness)
 
-            for boundary in self.map_boundaries:
-                arcade.draw_lrbt_rectangle_outline(
-                    boundary.x, boundary.x + boundary.width,
-                    boundary.y, boundary.y + boundary.height,
-                    arcade.color.YELLOW, 2
-                )
+            arcade.draw_polygon_outline(self.world.arena.outline, arcade.color.YELLOW, 2)
+
+        # Back to the simulation pose
+        for tank in self.tanks:
+            tank.sync()
 
         # Switch to UI camera for UI elements
         self.ui_camera.use()
 
         if self.show_scoreboard:
-            self.draw_scoreboard_overlay()
+            with Profiler.scope("draw.scoreboard"):
+                self.draw_scoreboard_overlay()
+
+        if self.show_netgraph:
+            self.netgraph.draw(10, self.window.height - 10)
+
+        if self.show_frame_stats:
+            if draw_start - self.frame_stats_refresh >= 0.25:
+                self.frame_stats_refresh = draw_start
+                self.frame_stats_text.text = self.frame_pacer.summary()
+            self.frame_stats_text.draw()
 
         # Draw UI elements
-        self.manager.draw()
+        with Profiler.scope("draw.ui"):
+            self.manager.draw()
 
         if self.show_hitboxes:
             # Draw viewport bounds
             vp = self.game_camera.viewport
             arcade.draw_rect_outline(LBWH(vp[0] + vp[2] / 2, vp[1] + vp[3] / 2, vp[2], vp[3]), arcade.color.RED, 3)
 
+        self.frame_pacer.record("draw", draw_start)
+        Profiler.record("game.draw", draw_start)
+        self.frame_pacer.frame_done()
+
     def on_update(self, delta_time):
+        """Run as many fixed simulation ticks as the elapsed frame time covers"""
+        self.tick_accumulator += delta_time
+        steps = 0
+        start = time.perf_counter()
+        while self.tick_accumulator >= self.tick_dt:
+            if steps == self.max_steps_per_frame:
+                # Far behind (e.g. the window was dragged), drop the backlog instead of spiralling
+                self.tick_accumulator = 0.0
+                break
+            if steps and not self.frame_pacer.budget_left("simulation", start):
+                # Out of simulation time for this frame, the remaining ticks run in the next one
+                break
+
+            self.previous_tank_poses.clear()
+            for tank in self.tanks:
+                self.previous_tank_poses[tank] = (tank.center_x, tank.center_y, tank.angle)
+
+            with Profiler.scope("game.tick"):
+                self.simulation_step(self.tick_dt)
+            self.tick += 1
+            self.tick_accumulator -= self.tick_dt
+            steps += 1
+        self.frame_pacer.record("simulation", start)
+        Profiler.record("game.simulation", start)
+
+    def render_alpha(self):
+        """How far the render time is between the previous and the current tick"""
+        return min(self.tick_accumulator / self.tick_dt, 1.0)
+
+    def interpolate_tanks(self, alpha):
+        """
+        Show tank sprites at their render pose between the last two ticks.
+        Only the sprites move, tank.sync() puts them back on the simulation pose.
+        """
+        for tank in self.tanks:
+            pose = (tank.center_x, tank.center_y, tank.angle)
+            previous = self.previous_tank_poses.get(tank)
+            if previous is not None:
+                tank.show_pose(previous[0] + (pose[0] - previous[0]) * alpha,
+                               previous[1] + (pose[1] - previous[1]) * alpha,
+                               previous[2] + (pose[2] - previous[2]) * alpha)
+
+    def simulation_step(self, delta_time):
+        """Advance the game by one fixed tick"""
 
         # Handle game end sequence
         if self.game_ended:
@@ -574,71 +699,26 @@ class GameView(arcade.View):
             # Check for game end condition (only if enabled)
         self.check_game_end_condition()
 
-        self.effects_manager.update(delta_time)
-
-        all_bullets = arcade.SpriteList()
+        with Profiler.scope("game.effects"):
+            self.effects_manager.update(delta_time)
 
-        # Update tanks with sliding collision
-        for tank in self.tanks:
-            all_bullets.extend(tank.bullet_list)
-
-            # Store old position for collision checking
-            old_x, old_y = tank.center_x, tank.center_y
-
-            # Let tank update normally (including recoil) but skip regular movement
-            tank.update(delta_time, self.GAME_WIDTH, self.GAME_HEIGHT, skip_movement=True)
-
-            # Check if recoil caused collision and revert if needed
-            if (self.check_tank_boundary_collision(tank, tank.center_x, tank.center_y) or
-                    self.check_tank_static_entity_collision(tank, tank.center_x, tank.center_y)):
-                # Recoil caused collision, revert to old position
-                tank.center_x, tank.center_y = old_x, old_y
-
-            # Store position after recoil (but before movement)
-            post_recoil_x, post_recoil_y = tank.center_x, tank.center_y
-
-            # Now handle movement collision detection separately
-            if tank.is_moving and not tank.destroyed:
-                if tank.destroyed and tank.player_id not in self.death_order:
-                    self.record_tank_death(tank)
-
-                # Calculate what the movement should have been
-                angle_rad = math.radians(tank.angle)
-                intended_delta_x = tank.speed * math.sin(angle_rad) * delta_time
-                intended_delta_y = tank.speed * math.cos(angle_rad) * delta_time
-
-                # Try X movement only
-                new_x = post_recoil_x + intended_delta_x
-                if not (self.check_tank_boundary_collision(tank, new_x, post_recoil_y) or
-                        self.check_tank_static_entity_collision(tank, new_x, post_recoil_y)):
-                    tank.center_x = new_x
-
-                # Try Y movement only
-                new_y = post_recoil_y + intended_delta_y
-                if not (self.check_tank_boundary_collision(tank, tank.center_x, new_y) or
-                        self.check_tank_static_entity_collision(tank, tank.center_x, new_y)):
-                    tank.center_y = new_y
-
-            # # Check bullet collisions with other tanks
-            tank.check_bullet_collisions(
-                [t for t in self.tanks if t != tank],
-                self.effects_manager
-            )
-
-            # Check bullet collisions with boundaries
-            for bullet in list(tank.bullet_list):
-                if self.check_bullet_boundary_collision(bullet):
-                    explosion = ExplosionEffect(bullet.center_x, bullet.center_y)
-                    self.effects_manager.add_effect(explosion)
-                    bullet.remove_from_sprite_lists()
-
-        # Update entity manager with bullet collisions
-        self.entity_manager.update(all_bullets, self.effects_manager)
+            for tank in self.tanks:
+                tank.update_effects(delta_time)
+
+        # Tanks, bullets and entities advance in the core world, the sprites then follow
+        with Profiler.scope("game.world_step"):
+            for impact_x, impact_y, kind, target in step(self.world, delta_time):
+                self.effects_manager.add_effect(ExplosionEffect.spawn(impact_x, impact_y))
+                if kind == "entity" and not target.is_indestructible:
+                    target.view.show_damage()
+            for tank in self.tanks:
+                tank.sync()
 
         # Remove destroyed entities from our sprite list
-        for entity in self.static_entities:
-            if not entity.is_alive():
-                entity.remove_from_sprite_lists()
+        with Profiler.scope("game.entity_cleanup"):
+            for entity in self.static_entities:
+                if not entity.is_alive():
+                    self.remove_entity(entity)
 
     def toggle_pause_menu(self, event=None):
         if self.popup_active:
@@ -650,8 +730,8 @@ class GameView(arcade.View):
             layout = UIBoxLayout(vertical=True, space_between=50)
 
             def create_textured_button(text, click_handler):
-                normal_texture = arcade.load_texture(":assets:buttons/green_normal.png")
-                hover_texture = arcade.load_texture(":assets:buttons/green_hover.png")
+                normal_texture = TextureRegistry.get(":assets:buttons/green_normal.png")
+                hover_texture = TextureRegistry.get(":assets:buttons/green_hover.png")
                 button = UITextureButton(
                     texture=normal_texture,
                     texture_hovered=hover_texture,
@@ -697,6 +777,12 @@ class GameView(arcade.View):
             self.player_tank.handle_key_press(key)
         elif key == arcade.key.H:
             self.show_hitboxes = not self.show_hitboxes
+        elif key == arcade.key.N:
+            self.show_netgraph = not self.show_netgraph
+        elif key == arcade.key.F:
+            self.show_frame_stats = not self.show_frame_stats
+        elif key == arcade.key.P:
+            self.export_profile()
         elif key == arcade.key.ESCAPE:
             self.toggle_pause_menu()
         elif key == arcade.key.TAB:
@@ -717,6 +803,7 @@ class GameView(arcade.View):
     def on_back_click(self, event):
         """Handle exit from game with proper cleanup"""
         print("Exiting game...")
+        self.frame_pacer.restore()
 
         # Unschedule specific functions instead of unschedule_all
         functions_to_unschedule = [
@@ -776,17 +863,29 @@ class GameView(arcade.View):
                 updates_to_process = self.client_or_server.pending_tank_updates.copy()
                 self.client_or_server.pending_tank_updates.clear()
 
-        for update in updates_to_process:
+        start = time.perf_counter()
+        for i, update in enumerate(updates_to_process):
+            if i and not self.frame_pacer.budget_left("network", start):
+                # Out of budget, the rest go back to the front of the queue for the next run
+                with self.client_or_server.tank_updates_lock:
+                    self.client_or_server.pending_tank_updates[:0] = updates_to_process[i:]
+                break
             self.process_tank_update(update)
+        self.frame_pacer.record("network", start)
+        Profiler.record("game.apply_network", start)
 
     def send_tank_update(self, delta_time=None):
         """Send player tank state to server/clients"""
         if self.game_over or self.popup_active or not self.client_or_server:
             return
 
+        # Sequence number lets receivers estimate packet loss
+        self.tank_update_seq += 1
+
         tank_data = {
             "type": "tank_state",
             "player_id": self.player_tank.player_id,
+            "seq": self.tank_update_seq,
             "x": self.player_tank.center_x,
             "y": self.player_tank.center_y,
             "angle": self.player_tank.angle,
@@ -800,21 +899,14 @@ class GameView(arcade.View):
             self.initial_position_sent = True
 
         if hasattr(self.player_tank, 'new_bullets') and self.player_tank.new_bullets:
-            bullet_data = []
-            for bullet in self.player_tank.new_bullets:
-                bullet_data.append({
-                    "x": bullet.center_x,
-                    "y": bullet.center_y,
-                    "angle": bullet.angle,
-                    "speed": bullet.speed
-                })
-            tank_data["new_bullets"] = bullet_data
+            tank_data["new_bullets"] = self.player_tank.new_bullets
             self.player_tank.new_bullets = []
 
-        if self.is_client:
-            self.client_or_server.game_send_my_state(tank_data)
-        else:
-            self.client_or_server.game_broadcast_data(tank_data)
+        with Profiler.scope("game.send_state"):
+            if self.is_client:
+                self.client_or_server.game_send_my_state(tank_data)
+            else:
+                self.client_or_server.game_broadcast_data(tank_data)
 
     def process_tank_update(self, data):
         """Handle received tank state update"""
@@ -834,6 +926,7 @@ class GameView(arcade.View):
                     if tank and not tank.destroyed:
                         tank.take_damage(100)  # Kill the tank
                         tank.destroyed = True
+                        self.bullets.kill_owner(tank.state)  # Drop its shots still in flight
                         print(f"Marked tank {player_id} as dead due to disconnect")
                     else:
                         print(f"Tank {player_id} was already destroyed")
@@ -849,7 +942,7 @@ class GameView(arcade.View):
         if player_id not in self.other_player_tanks:
             print(f"Creating new tank for player: {player_id}")
             tank_color = data.get("tank_color", "blue")
-            new_tank = Tank(tank_color=tank_color, player_id=player_id)
+            new_tank = Tank(tank_color=tank_color, player_id=player_id, bullet_manager=self.bullets)
 
             if data.get("initial_spawn", False):
                 new_tank.center_x = data.get("x")
@@ -871,7 +964,7 @@ class GameView(arcade.View):
                     new_tank.angle = spawn_data["rotation"]
 
             self.other_player_tanks[player_id] = new_tank
-            self.tanks.append(new_tank)
+            self.add_tank(new_tank)
 
             if player_id not in self.scoreboard:
                 self.scoreboard[player_id] = 0
@@ -887,22 +980,11 @@ class GameView(arcade.View):
 
         if "new_bullets" in data:
             for bullet_info in data["new_bullets"]:
-                bullet = Bullet(
-                    ":assets:images/bullet.png",
-                    0.5,
-                    bullet_info["x"],
-                    bullet_info["y"],
-                    bullet_info["angle"],
-                    tank
-                )
-                bullet.speed = bullet_info.get("speed", 800)
-                bullet.direction_radians = math.radians(bullet.angle)
-                tank.bullet_list.append(bullet)
+                self.bullets.spawn(bullet_info["x"], bullet_info["y"], bullet_info["angle"], tank.state,
+                                   speed=bullet_info.get("speed", BULLET_SPEED))
 
                 # Add fire effect
-                fire_effect = FireEffect(":assets:images/fire.png", 0.5,
-                                         bullet.center_x, bullet.center_y, bullet.angle)
-                tank.effects_list.append(fire_effect)
+                tank.effects_list.append(FireEffect.spawn(bullet_info["x"], bullet_info["y"], bullet_info["angle"]))
 
     def check_game_end_condition(self):
         """Check if only one player is alive and handle game end"""
@@ -975,8 +1057,10 @@ class GameView(arcade.View):
         # Reset multiplayer state
         self.initial_position_sent = False
 
-        # Reset effects
-        self.effects_manager = EffectsManager()
+        # Reset effects, pooled ones go back to their pools
+        self.effects_manager.clear()
+        print(f"Pool stats after round: {self.get_pool_stats()}")
+        print(f"Frame stats after round: {self.frame_pacer.stats()}")
 
         # Start game timer
         self.start_game_timer()
@@ -986,21 +1070,24 @@ class GameView(arcade.View):
     def clear_game_objects(self):
         print("Clearing game objects...")
 
-        # Clear tanks and their components
+        # Clear the simulation, then tanks and their components
+        self.world.clear()
         for tank in self.tanks:
-            tank.bullet_list.clear()
-            tank.effects_list.clear()
+            for effect in list(tank.effects_list):
+                effect.release()
             if hasattr(tank, 'new_bullets'):
                 tank.new_bullets.clear()
             tank.remove_from_sprite_lists()
 
         self.tanks.clear()
         self.other_player_tanks.clear()
+        self.previous_tank_poses.clear()
 
         # Clear static entities
         for entity in self.static_entities:
             entity.remove_from_sprite_lists()
         self.static_entities.clear()
+        self.map_entities = []
 
         # Reset entity manager
         self.entity_manager = EntityManager()
@@ -1013,21 +1100,15 @@ class GameView(arcade.View):
 
         print("Game objects cleared successfully")
 
-    def check_tank_static_entity_collision(self, tank, new_x, new_y):
-        """Check if tank would collide with static entities at new position"""
-        # Store original position
-        old_x, old_y = tank.center_x, tank.center_y
-
-        # Set temporary position
-        tank.center_x, tank.center_y = new_x, new_y
-
-        # Check collision with static entities using Arcade 3.0.1 feature
-        collision_list = arcade.check_for_collision_with_list(tank, self.static_entities)
+    def add_tank(self, tank):
+        """Show a tank and put its state into the simulation"""
+        self.tanks.append(tank)
+        self.world.add_tank(tank.state)
 
-        # Restore original position
-        tank.center_x, tank.center_y = old_x, old_y
-
-        return len(collision_list) > 0
+    def remove_entity(self, entity):
+        """Take a static entity out of the simulation and all sprite lists"""
+        self.world.remove_entity(entity.state)
+        self.entity_manager.remove_entity(entity)
 
     def load_map_and_setup(self, map_name):
         """Client method: load map and setup after server selection"""
@@ -1045,6 +1126,88 @@ class GameView(arcade.View):
 
         print("Client setup complete")
 
+    def send_state_snapshot(self, addr):
+        """Server method: send the full match state to a client that just reconnected"""
+        if self.is_client:
+            return
+
+        tanks = []
+        for tank in self.tanks:
+            tanks.append([
+                tank.player_id, tank.tank_color,
+                round(tank.center_x, 1), round(tank.center_y, 1), round(tank.angle, 1),
+                tank.destroyed, tank.is_moving, tank.is_rotating
+            ])
+
+        # Only destructible entities that took damage differ from the map file
+        entities = [
+            [entity.entity_index, entity.current_hp]
+            for entity in self.map_entities
+            if not entity.is_indestructible and entity.current_hp < entity.max_hp
+        ]
+
+        snapshot = {
+            "map": self.current_map,
+            "scoreboard": self.scoreboard,
+            "death_order": self.death_order,
+            "tanks": tanks,
+            "entities": entities,
+        }
+        self.client_or_server.send_command("state_snapshot", addr, require_ack=True, data=snapshot)
+        print(f"Sent state snapshot to {addr}: {len(tanks)} tanks, {len(entities)} damaged entities")
+
+    def apply_state_snapshot(self, data):
+        """Client method: resync the match after a reconnect"""
+        map_name = data.get("map")
+        if map_name and map_name != self.current_map:
+            self.load_map_and_setup(map_name)
+
+        for player_id, tank_color, x, y, angle, destroyed, is_moving, is_rotating in data.get("tanks", []):
+            if player_id == self.player_tank.player_id:
+                tank = self.player_tank
+            else:
+                tank = self.other_player_tanks.get(player_id)
+                if tank is None:
+                    tank = Tank(tank_color=tank_color, player_id=player_id, bullet_manager=self.bullets)
+                    self.other_player_tanks[player_id] = tank
+                    self.add_tank(tank)
+                tank.is_moving = is_moving
+                tank.is_rotating = is_rotating
+
+            tank.center_x, tank.center_y, tank.angle = x, y, angle
+            if destroyed and not tank.destroyed:
+                tank.take_damage(100)
+
+        for index, hp in data.get("entities", []):
+            if 0 <= index < len(self.map_entities):
+                entity = self.map_entities[index]
+                entity.current_hp = hp
+                if hp <= 0:
+                    self.remove_entity(entity)
+
+        self.scoreboard = dict(data.get("scoreboard", self.scoreboard))
+        self.death_order = list(data.get("death_order", self.death_order))
+        print(f"Applied state snapshot: {len(data.get('tanks', []))} tanks")
+
+    def export_profile(self):
+        """Export the profiler ring as a Chrome trace, or start recording if the profiler is off"""
+        if not Profiler.enabled:
+            Profiler.configure(True, settings.get("profiler_capacity", 65536))
+            print("Profiler recording, press P again to export a trace")
+            return
+        try:
+            Profiler.export()
+        except OSError as e:
+            print(f"ERROR: Failed to export profiler trace: {e}")
+
+    def get_pool_stats(self):
+        """Hit/miss counters of the bullet and effect pools"""
+        return {
+            "bullet": self.bullets.sprite_pool.stats(),
+            "fire": FireEffect.pool.stats(),
+            "explosion": ExplosionEffect.pool.stats(),
+        }
+
     def record_tank_death(self, tank):
         """Record when a tank dies for scoreboard purposes"""
         if tank.player_id not in self.death_order and tank.destroyed:
@@ -1101,96 +1264,11 @@ class GameView(arcade.View):
                 print(f"{third_last} gets 1 point for 3rd place!")
 
     def draw_scoreboard_overlay(self):
-        """Draw the scoreboard overlay with darkened background"""
-        # Draw darkened background
-        arcade.draw_lbwh_rectangle_filled(0, 0, self.window.width, self.window.height, Color(0, 0, 0, 170))
-
-        # Get sorted scoreboard data
+        """Draw the scoreboard overlay, rebuilt by the overlay only when scores or colors change"""
         sorted_scores = sorted(self.scoreboard.items(), key=lambda x: x[1], reverse=True)
-
-        if not sorted_scores:
-            return
-
-        # Calculate layout dimensions
-        title_y = self.window.height // 2 + 150
-        entry_height = 70
-        start_y = title_y - 100
-
-        # Draw title
-        title_text = OutlinedText(
-            "SCOREBOARD",
-            self.window.width // 2, title_y,
-            text_color=arcade.color.WHITE,
-            outline_color=arcade.color.BLACK,
-            font_size=48,
-            stroke_width=8,
-            anchor_x="center",
-            anchor_y="center"
-        )
-        title_text.draw()
-
-        # Calculate positioning for entries
-        max_name_width = 0
-        score_width = 60  # Approximate width for scores
-
-        # First pass: calculate maximum name width for alignment
-        for player_id, score in sorted_scores:
-            name_width = len(player_id) * 14  # Approximate character width at font size 24
-            max_name_width = max(max_name_width, name_width)
-
-        # Entry layout calculations
-        color_rect_width = 40
-        name_start_x = self.window.width // 2 - 250
-        color_rect_x = name_start_x - color_rect_width - 10
-        score_end_x = self.window.width // 2 + 250
-        dots_start_x = name_start_x + max_name_width + 20
-        dots_end_x = score_end_x - score_width - 10
-
-        # Draw each player entry
-        for i, (player_id, score) in enumerate(sorted_scores):
-            y_pos = start_y - (i * entry_height)
-
-            # Get tank color for this player
-            tank_color = self.get_player_tank_color(player_id)
-            color_rgb = self.get_color_rgb(tank_color)
-
-            # Draw tank color indicator (rounded rectangle)
-            arcade.draw_lbwh_rectangle_filled(
-                color_rect_x, y_pos - 15, color_rect_width, 30, color_rgb
-            )
-
-            # Draw black border around color indicator
-            arcade.draw_lbwh_rectangle_outline(
-                color_rect_x, y_pos - 15, color_rect_width, 30, arcade.color.BLACK, 2
-            )
-
-            # Draw player name with outline
-            name_text = OutlinedText(
-                player_id,
-                name_start_x, y_pos,
-                text_color=arcade.color.WHITE,
-                outline_color=arcade.color.BLACK,
-                font_size=24,
-                stroke_width=3,
-                anchor_x="left",
-                anchor_y="center"
-            )
-            name_text.draw()
-
-            # Draw score
-            score_text = f"{score}"
-            arcade.Text(
-                score_text,
-                score_end_x, y_pos,
-                arcade.color.WHITE,
-                font_size=24,
-                anchor_x="right",
-                anchor_y="center",
-                font_name="ARCO"
-            ).draw()
-
-            # Draw dots between name and score
-            self.draw_connecting_dots(dots_start_x, y_pos, dots_end_x)
+        rows = [(player_id, score, self.get_color_rgb(self.get_player_tank_color(player_id)))
+                for player_id, score in sorted_scores]
+        self.scoreboard_overlay.draw(rows, self.window.width, self.window.height)
 
     def get_player_tank_color(self, player_id):
         """Get the tank color for a specific player"""
@@ -1216,29 +1294,6 @@ class GameView(arcade.View):
         }
         return color_map.get(color_name.lower(), arcade.color.DODGER_BLUE)
 
-    def draw_connecting_dots(self, start_x, y, end_x):
-        """Draw connecting dots between player name and score with variable spacing"""
-        available_width = end_x - start_x
-
-        if available_width <= 0:
-            return
-
-        # Calculate optimal dot spacing
-        dot_diameter = 3
-        min_spacing = 8
-        ideal_spacing = 12
-
-        # Try ideal spacing first
-        num_dots = int(available_width // ideal_spacing)
-
-        if num_dots > 0:
-            # Adjust spacing to distribute dots evenly
-            actual_spacing = available_width / num_dots
-
-            for i in range(num_dots):
-                dot_x = start_x + (i * actual_spacing) + (actual_spacing / 2)
-                arcade.draw_circle_filled(dot_x, y, dot_diameter // 2, arcade.color.GRAY)
-
     def handle_player_disconnect(self, player_name):
         """Handle player disconnection from main thread (called by server)"""
         print(f"Handling player disconnect for {player_name}")
@@ -1250,6 +1305,7 @@ class GameView(arcade.View):
                 if tank and not tank.destroyed:
                     tank.take_damage(100)  # Kill the tank
                     tank.destroyed = True
+                    self.bullets.kill_owner(tank.state)  # Drop its shots still in flight
                     print(f"Marked tank {player_name} as dead due to disconnect")
             except Exception as e:
                 print(f"Error handling tank destruction for {player_name}: {e}")
@@ -0,0 +1,85 @@
+from core.CollisionGrid import point_in_polygon, segment_hits_rect, segment_edges_toi
+
+
+class Arena:
+    """
+    Playable area of a map. Usually the rectangle of the game resolution,
+    tested analytically on raw coordinates. A map may give an "arena" outline
+    instead, then the same queries run against that polygon.
+    """
+
+    __slots__ = ("left", "bottom", "right", "top", "polygon")
+
+    def __init__(self, left, bottom, right, top, outline=None):
+        self.left = left
+        self.bottom = bottom
+        self.right = right
+        self.top = top
+        self.polygon = tuple(outline) if outline else None
+        if self.polygon:
+            xs = [p[0] for p in self.polygon]
+            ys = [p[1] for p in self.polygon]
+            self.left, self.bottom, self.right, self.top = min(xs), min(ys), max(xs), max(ys)
+
+    @classmethod
+    def from_map(cls, map_data, width, height):
+        """Arena of a map: its "arena" outline of {"x", "y"} points if it has one, else the whole world"""
+        points = [(point["x"], point["y"]) for point in map_data.get("arena", [])]
+        if len(points) < 3:
+            if points:
+                print(f"WARNING: Arena outline needs at least 3 points, got {len(points)}; using the full map")
+            points = None
+        return cls(0, 0, width, height, points)
+
+    @property
+    def outline(self):
+        """Corner points, counter-clockwise for the rectangle"""
+        if self.polygon:
+            return self.polygon
+        return ((self.left, self.bottom), (self.right, self.bottom),
+                (self.right, self.top), (self.left, self.top))
+
+    def contains_point(self, x, y):
+        if not (self.left <= x <= self.right and self.bottom <= y <= self.top):
+            return False
+        return self.polygon is None or point_in_polygon(x, y, self.polygon)
+
+    def contains_box(self, left, bottom, right, top):
+        """Is the whole axis aligned box inside the arena?"""
+        if left < self.left or bottom < self.bottom or right > self.right or top > self.top:
+            return False
+        if self.polygon is None:
+            return True
+        # All corners inside and no outline edge cutting through, so concave notches are caught too
+        for x, y in ((left, bottom), (right, bottom), (right, top), (left, top)):
+            if not point_in_polygon(x, y, self.polygon):
+                return False
+        j = len(self.polygon) - 1
+        for i in range(len(self.polygon)):
+            if segment_hits_rect(*self.polygon[j], *self.polygon[i], left, bottom, right, top):
+                return False
+            j = i
+        return True
+
+    def segment_exit(self, x0, y0, x1, y1):
+        """
+        Fraction 0..1 along the segment at which it leaves the arena, 0 if it
+        starts outside, or None if it stays inside.
+        """
+        if not self.contains_point(x0, y0):
+            return 0.0
+        if self.polygon is not None:
+            return segment_edges_toi(x0, y0, x1, y1, self.polygon)
+
+        exit_t = None
+        for start, delta, low, high in ((x0, x1 - x0, self.left, self.right),
+                                        (y0, y1 - y0, self.bottom, self.top)):
+            if delta > 0 and start + delta > high:
+                t = (high - start) / delta
+            elif delta < 0 and start + delta < low:
+                t = (low - start) / delta
+            else:
+                continue
+            if exit_t is None or t < exit_t:
+                exit_t = t
+        return exit_t
@@ -0,0 +1,331 @@
+import math
+
+import numpy as np
+
+BULLET_SPEED = 800  # pixels per second
+
+
+class BulletStore:
+    """
+    Every bullet in flight, stored as a structure of NumPy arrays.
+    Live bullets are packed into the first `count` slots; integration,
+    bounds culling and the static broadphase run as vectorized batches.
+    Owners are whatever fired the bullet, normally a TankState.
+    """
+
+    def __init__(self, world_width, world_height, capacity=256):
+        self.world_width = world_width
+        self.world_height = world_height
+        self.count = 0
+
+        self.capacity = 0
+        self.x = self.y = self.prev_x = self.prev_y = None
+        self.vx = self.vy = self.angle = self.age = None
+        self.damage = self.owner = None
+        self._grow(capacity)
+
+        # Owner slot -> owner, arrays store the slot so they stay numeric.
+        # owner_bullets[slot] holds that owner's live bullet indices, kept up to date on spawn and kill.
+        self.owners = []
+        self.owner_slots = {}
+        self.owner_bullets = []
+
+        # Static broadphase data
+        self.grid = None
+        self.grid_integral = None
+        self.grid_table = None
+        self.entity_version = None
+        self.entities = []
+        self.entity_boxes = np.empty((0, 4))
+
+        # Broadphase scratch whose size depends on targets too, see _buffer
+        self._buffers = {}
+
+    def _grow(self, capacity):
+        def resized(array, dtype):
+            new_array = np.zeros(capacity, dtype=dtype)
+            if array is not None:
+                new_array[:self.count] = array[:self.count]
+            return new_array
+
+        self.x = resized(self.x, np.float64)
+        self.y = resized(self.y, np.float64)
+        self.prev_x = resized(self.prev_x, np.float64)
+        self.prev_y = resized(self.prev_y, np.float64)
+        self.vx = resized(self.vx, np.float64)
+        self.vy = resized(self.vy, np.float64)
+        self.angle = resized(self.angle, np.float64)
+        self.age = resized(self.age, np.float64)
+        self.damage = resized(self.damage, np.int32)
+        self.owner = resized(self.owner, np.int32)
+        self.capacity = capacity
+
+        # Scratch buffers so the per-frame passes allocate no new arrays
+        self._scratch = np.zeros(capacity, dtype=np.float64)
+        self._bounds = np.zeros((4, capacity), dtype=np.float64)
+        self._render = np.zeros((2, capacity), dtype=np.float64)
+        self._mask = np.zeros(capacity, dtype=bool)
+        self._mask_b = np.zeros(capacity, dtype=bool)
+        self._cells = np.zeros((4, capacity), dtype=np.float64)
+        self._cell_index = np.zeros((4, capacity), dtype=np.intp)
+        self._table_index = np.zeros(capacity, dtype=np.intp)
+        self._solid = np.zeros(capacity, dtype=np.int32)
+        self._solid_b = np.zeros(capacity, dtype=np.int32)
+
+    def _buffer(self, name, size, dtype):
+        """Scratch array of `size` elements, only reallocated when it has to grow"""
+        buffer = self._buffers.get(name)
+        if buffer is None or len(buffer) < size:
+            buffer = np.zeros(max(size, 2 * len(buffer) if buffer is not None else 64), dtype=dtype)
+            if name == "range":
+                buffer[:] = np.arange(len(buffer))
+            self._buffers[name] = buffer
+        return buffer[:size]
+
+    def _select(self, mask, name):
+        """Indices of the set entries of mask, written into the named scratch array"""
+        count = int(np.count_nonzero(mask))
+        selected = self._buffer(name, count, np.intp)
+        np.compress(mask, self._buffer("range", len(mask), np.intp), out=selected)
+        return selected
+
+    def _owner_slot(self, owner):
+        slot = self.owner_slots.get(owner)
+        if slot is None:
+            slot = len(self.owners)
+            self.owners.append(owner)
+            self.owner_slots[owner] = slot
+            self.owner_bullets.append(set())
+        return slot
+
+    def bullets_of(self, owner):
+        """Live bullet indices fired by an owner (do not modify)"""
+        slot = self.owner_slots.get(owner)
+        return self.owner_bullets[slot] if slot is not None else ()
+
+    def kill_owner(self, owner):
+        """Remove every bullet fired by an owner"""
+        self.kill(list(self.bullets_of(owner)))
+
+    def __len__(self):
+        return self.count
+
+    def spawn(self, x, y, angle, owner, speed=BULLET_SPEED, damage=1):
+        """Add a bullet and return its slot index"""
+        if self.count == self.capacity:
+            self._grow(self.capacity * 2)
+
+        index = self.count
+        direction = math.radians(angle)
+        self.x[index] = self.prev_x[index] = x
+        self.y[index] = self.prev_y[index] = y
+        self.vx[index] = math.sin(direction) * speed
+        self.vy[index] = math.cos(direction) * speed
+        self.angle[index] = angle
+        self.age[index] = 0.0
+        self.damage[index] = damage
+        owner_slot = self._owner_slot(owner)
+        self.owner[index] = owner_slot
+        self.owner_bullets[owner_slot].add(index)
+
+        self.count += 1
+        return index
+
+    def _slot_removed(self, index, last):
+        """Hook for views: the bullet in `index` is gone and the one in `last` took its slot"""
+
+    def kill(self, indices):
+        """Remove bullets by slot index. The last live bullet moves into each freed slot."""
+        for index in sorted(set(int(i) for i in indices), reverse=True):
+            if index >= self.count:
+                continue
+            last = self.count - 1
+            self.owner_bullets[self.owner[index]].discard(index)
+            if index != last:
+                moved = self.owner_bullets[self.owner[last]]
+                moved.discard(last)
+                moved.add(index)
+                for array in (self.x, self.y, self.prev_x, self.prev_y, self.vx, self.vy,
+                              self.angle, self.age, self.damage, self.owner):
+                    array[index] = array[last]
+            self._slot_removed(index, last)
+            self.count = last
+
+    def clear(self):
+        self.count = 0
+        self.owners = []
+        self.owner_slots = {}
+        self.owner_bullets = []
+
+    def update(self, delta_time):
+        """Move every bullet, remembering where it started for swept collision"""
+        n = self.count
+        if not n:
+            return
+
+        step = self._scratch[:n]
+        self.prev_x[:n] = self.x[:n]
+        self.prev_y[:n] = self.y[:n]
+        np.multiply(self.vx[:n], delta_time, out=step)
+        self.x[:n] += step
+        np.multiply(self.vy[:n], delta_time, out=step)
+        self.y[:n] += step
+        self.age[:n] += delta_time
+
+    def cull_out_of_bounds(self):
+        """Drop bullets that left the world"""
+        n = self.count
+        x, y = self.x[:n], self.y[:n]
+        outside, test = self._mask[:n], self._mask_b[:n]
+        np.less(x, 0, out=outside)
+        np.greater(x, self.world_width, out=test)
+        outside |= test
+        np.less(y, 0, out=test)
+        outside |= test
+        np.greater(y, self.world_height, out=test)
+        outside |= test
+        if outside.any():
+            self.kill(np.flatnonzero(outside))
+
+    def segment_bounds(self):
+        """Bounding boxes of the paths travelled in the last update"""
+        n = self.count
+        left, bottom, right, top = self._bounds[:, :n]
+        np.minimum(self.prev_x[:n], self.x[:n], out=left)
+        np.minimum(self.prev_y[:n], self.y[:n], out=bottom)
+        np.maximum(self.prev_x[:n], self.x[:n], out=right)
+        np.maximum(self.prev_y[:n], self.y[:n], out=top)
+        return left, bottom, right, top
+
+    def set_static_grid(self, grid):
+        """Prepare a summed area table of the baked collision grid for wall broadphase"""
+        self.grid = grid
+        if grid is None:
+            self.grid_integral = None
+            self.grid_table = None
+            return
+        cells = np.unpackbits(np.frombuffer(bytes(grid.bits), dtype=np.uint8), bitorder="little")
+        solid = cells[:grid.cols * grid.rows].reshape(grid.rows, grid.cols).astype(np.int32)
+        self.grid_integral = np.zeros((grid.rows + 1, grid.cols + 1), dtype=np.int32)
+        self.grid_integral[1:, 1:] = solid.cumsum(axis=0).cumsum(axis=1)
+        self.grid_table = self.grid_integral.ravel()
+
+    def wall_candidates(self, bounds):
+        """Slots whose path box touches a solid grid cell or leaves the grid"""
+        grid = self.grid
+        n = len(bounds[0])
+        cells, index = self._cells[:, :n], self._cell_index[:, :n]
+        outside, test = self._mask[:n], self._mask_b[:n]
+        for axis, (edge, origin) in enumerate(zip(bounds, (grid.origin_x, grid.origin_y) * 2)):
+            np.subtract(edge, origin, out=cells[axis])
+            cells[axis] /= grid.cell_size
+            np.floor(cells[axis], out=cells[axis])
+        np.less(cells[0], 0, out=outside)
+        np.less(cells[1], 0, out=test)
+        outside |= test
+        np.greater_equal(cells[2], grid.cols, out=test)
+        outside |= test
+        np.greater_equal(cells[3], grid.rows, out=test)
+        outside |= test
+
+        np.clip(cells[0::2], 0, grid.cols - 1, out=cells[0::2])
+        np.clip(cells[1::2], 0, grid.rows - 1, out=cells[1::2])
+        np.copyto(index, cells, casting="unsafe")
+        col0, row0, col1, row1 = index
+        col1 += 1
+        row1 += 1
+
+        # Solid cells in the box from the summed area table, with flat indices into it
+        width = grid.cols + 1
+        table, flat = self.grid_table, self._table_index[:n]
+        solid, corner = self._solid[:n], self._solid_b[:n]
+        np.multiply(row1, width, out=flat)
+        flat += col1
+        np.take(table, flat, out=solid, mode="clip")
+        np.multiply(row0, width, out=flat)
+        flat += col1
+        solid -= np.take(table, flat, out=corner, mode="clip")
+        np.multiply(row1, width, out=flat)
+        flat += col0
+        solid -= np.take(table, flat, out=corner, mode="clip")
+        np.multiply(row0, width, out=flat)
+        flat += col0
+        solid += np.take(table, flat, out=corner, mode="clip")
+
+        np.greater(solid, 0, out=test)
+        outside |= test
+        return self._select(outside, "wall_slots")
+
+    def entity_candidates(self, spatial_hash, bounds):
+        """
+        Parallel arrays of bullet slots and indices into self.entities whose
+        boxes overlap, for entities in the spatial hash
+        """
+        version = (id(spatial_hash), spatial_hash.version)
+        if self.entity_version != version:
+            self.entity_version = version
+            self.entities = list(spatial_hash.polygons)
+            boxes = [spatial_hash.polygons[entity][1] for entity in self.entities]
+            self.entity_boxes = np.array(boxes, dtype=np.float64).reshape(-1, 4)
+
+        return self.overlap_pairs(bounds, self.entity_boxes, name="entity")
+
+    def tank_candidates(self, bounds, tanks, tank_boxes):
+        """
+        Parallel arrays of bullet slots and indices into tanks whose boxes
+        overlap, never pairing a bullet with its own tank
+        """
+        count = len(tanks)
+        boxes = self._buffer("tank_boxes", 4 * count, np.float64).reshape(count, 4)
+        owners = self._buffer("tank_owners", count, np.int32)
+        for target in range(count):
+            boxes[target] = tank_boxes[target]
+            owners[target] = self.owner_slots.get(tanks[target], -1)
+        return self.overlap_pairs(bounds, boxes, owners, name="tank")
+
+    def overlap_pairs(self, bounds, boxes, target_owners=None, name="pair"):
+        """
+        Shared broadphase: one vectorized box test of every bullet path against
+        every target, written into a targets x bullets scratch mask. Returns
+        parallel arrays of bullet slots and target indices, target major. They
+        live in scratch named after `name` and are only valid until the next
+        call with that name. With target_owners, bullets fired by the target
+        itself are skipped.
+        """
+        left, bottom, right, top = bounds
+        n, count = len(left), len(boxes)
+        size = n * count
+        overlap = self._buffer("pair_mask", size, bool).reshape(count, n)
+        test = self._buffer("pair_test", size, bool).reshape(count, n)
+        np.less_equal(left, boxes[:, 2:3], out=overlap)
+        np.greater_equal(right, boxes[:, 0:1], out=test)
+        overlap &= test
+        np.less_equal(bottom, boxes[:, 3:4], out=test)
+        overlap &= test
+        np.greater_equal(top, boxes[:, 1:2], out=test)
+        overlap &= test
+        if target_owners is not None:
+            np.not_equal(self.owner[:n], target_owners[:, None], out=test)
+            overlap &= test
+
+        pairs = self._select(overlap.reshape(size), name + "_pairs")
+        slots = self._buffer(name + "_slots", len(pairs), np.intp)
+        targets = self._buffer(name + "_targets", len(pairs), np.intp)
+        if n:
+            np.remainder(pairs, n, out=slots)
+            np.floor_divide(pairs, n, out=targets)
+        return slots, targets
+
+    def outside_candidates(self, bounds, left, bottom, right, top):
+        """Slots whose path box is not entirely inside the given box"""
+        b_left, b_bottom, b_right, b_top = bounds
+        n = len(b_left)
+        outside, test = self._mask[:n], self._mask_b[:n]
+        np.less(b_left, left, out=outside)
+        np.greater(b_right, right, out=test)
+        outside |= test
+        np.less(b_bottom, bottom, out=test)
+        outside |= test
+        np.greater(b_top, top, out=test)
+        outside |= test
+        return self._select(outside, "outside_slots")
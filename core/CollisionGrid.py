@@ -0,0 +1,376 @@
+import hashlib
+import math
+import struct
+from pathlib import Path
+
+# File header: magic, format version, columns, rows, cell size, origin x, origin y
+GRID_MAGIC = b"TTCG"
+GRID_VERSION = 2
+GRID_HEADER = struct.Struct("!4sHIIfff")
+COUNT = struct.Struct("!I")
+
+# Bump when bake_collision_grid changes what it bakes or how, cached grids are keyed by it
+BAKE_VERSION = 2
+
+
+def point_in_polygon(x, y, polygon):
+    """Even-odd rule, works for concave polygons"""
+    inside = False
+    j = len(polygon) - 1
+    for i in range(len(polygon)):
+        xi, yi = polygon[i]
+        xj, yj = polygon[j]
+        if (yi > y) != (yj > y) and x < (xj - xi) * (y - yi) / (yj - yi) + xi:
+            inside = not inside
+        j = i
+    return inside
+
+
+def segment_hits_rect(x0, y0, x1, y1, left, bottom, right, top):
+    """Liang-Barsky clip of a segment against a rectangle"""
+    dx, dy = x1 - x0, y1 - y0
+    t0, t1 = 0.0, 1.0
+    for p, q in ((-dx, x0 - left), (dx, right - x0), (-dy, y0 - bottom), (dy, top - y0)):
+        if p == 0:
+            if q < 0:
+                return False
+            continue
+        t = q / p
+        if p < 0:
+            if t > t1:
+                return False
+            t0 = max(t0, t)
+        else:
+            if t < t0:
+                return False
+            t1 = min(t1, t)
+    return t0 <= t1
+
+
+def polygon_overlaps_rect(polygon, left, bottom, right, top):
+    """True if a simple (possibly concave) polygon and a rectangle overlap"""
+    x, y = polygon[0]
+    if left <= x <= right and bottom <= y <= top:
+        return True
+    if point_in_polygon((left + right) / 2, (bottom + top) / 2, polygon):
+        return True
+    j = len(polygon) - 1
+    for i in range(len(polygon)):
+        if segment_hits_rect(*polygon[j], *polygon[i], left, bottom, right, top):
+            return True
+        j = i
+    return False
+
+
+def polygons_intersect(polygon_a, polygon_b):
+    """Separating axis test for two convex polygons, touching counts as intersecting"""
+    for polygon in (polygon_a, polygon_b):
+        j = len(polygon) - 1
+        for i in range(len(polygon)):
+            # Edge normal as the candidate axis
+            axis_x = polygon[i][1] - polygon[j][1]
+            axis_y = polygon[j][0] - polygon[i][0]
+            j = i
+            a = [x * axis_x + y * axis_y for x, y in polygon_a]
+            b = [x * axis_x + y * axis_y for x, y in polygon_b]
+            if max(a) < min(b) or max(b) < min(a):
+                return False
+    return True
+
+
+def segment_polygon_toi(x0, y0, x1, y1, polygon):
+    """
+    Time of impact of the segment (x0, y0) -> (x1, y1) with a polygon,
+    as a fraction 0..1 along the segment, or None if it misses.
+    """
+    if point_in_polygon(x0, y0, polygon):
+        return 0.0
+    return segment_edges_toi(x0, y0, x1, y1, polygon)
+
+
+def segment_edges_toi(x0, y0, x1, y1, polygon):
+    """Fraction along the segment where it first crosses a polygon edge, or None"""
+    dx, dy = x1 - x0, y1 - y0
+    best = None
+    j = len(polygon) - 1
+    for i in range(len(polygon)):
+        ax, ay = polygon[j]
+        bx, by = polygon[i]
+        j = i
+        ex, ey = bx - ax, by - ay
+        denom = dx * ey - dy * ex
+        if denom == 0:
+            continue  # parallel to this edge
+        t = ((ax - x0) * ey - (ay - y0) * ex) / denom
+        u = ((ax - x0) * dy - (ay - y0) * dx) / denom
+        if 0 <= t <= 1 and 0 <= u <= 1 and (best is None or t < best):
+            best = t
+    return best
+
+
+def segment_rect_toi(x0, y0, x1, y1, left, bottom, right, top):
+    """Time of impact of a segment with an axis aligned rectangle, or None"""
+    dx, dy = x1 - x0, y1 - y0
+    t0, t1 = 0.0, 1.0
+    for p, q in ((-dx, x0 - left), (dx, right - x0), (-dy, y0 - bottom), (dy, top - y0)):
+        if p == 0:
+            if q < 0:
+                return None
+            continue
+        t = q / p
+        if p < 0:
+            t0 = max(t0, t)
+        else:
+            t1 = min(t1, t)
+        if t0 > t1:
+            return None
+    return t0
+
+
+class CollisionGrid:
+    """
+    Broadphase grid for everything that never moves or breaks: indestructible
+    static entities and the area outside the arena. A set bit in `bits` means
+    the cell holds static geometry. Cells outside the arena are solid as a
+    whole, entity cells keep the entity hit boxes touching them and queries
+    test those exactly. Points outside the grid count as solid too.
+    """
+
+    def __init__(self, origin_x, origin_y, width, height, cell_size=8):
+        self.origin_x = origin_x
+        self.origin_y = origin_y
+        self.cell_size = cell_size
+        self.cols = max(1, math.ceil(width / cell_size))
+        self.rows = max(1, math.ceil(height / cell_size))
+        self.bits = bytearray((self.cols * self.rows + 7) // 8)  # occupied, the broadphase
+        self.solid_bits = bytearray(len(self.bits))  # solid as a whole, outside the arena
+        self.polygons = []  # baked entity hit boxes in world space
+        self.cell_polygons = {}  # cell index -> indices into polygons
+
+    def _cell_of(self, x, y):
+        return (math.floor((x - self.origin_x) / self.cell_size),
+                math.floor((y - self.origin_y) / self.cell_size))
+
+    def _cell_rect(self, col, row):
+        left = self.origin_x + col * self.cell_size
+        bottom = self.origin_y + row * self.cell_size
+        return left, bottom, left + self.cell_size, bottom + self.cell_size
+
+    def is_solid_cell(self, col, row):
+        """Is the whole cell solid? Cells holding only entity hit boxes are not."""
+        if not (0 <= col < self.cols and 0 <= row < self.rows):
+            return True
+        index = row * self.cols + col
+        return bool(self.solid_bits[index >> 3] & (1 << (index & 7)))
+
+    def is_occupied_cell(self, col, row):
+        if not (0 <= col < self.cols and 0 <= row < self.rows):
+            return True
+        index = row * self.cols + col
+        return bool(self.bits[index >> 3] & (1 << (index & 7)))
+
+    def set_cell(self, col, row):
+        """Make the whole cell solid"""
+        if 0 <= col < self.cols and 0 <= row < self.rows:
+            index = row * self.cols + col
+            self.bits[index >> 3] |= 1 << (index & 7)
+            self.solid_bits[index >> 3] |= 1 << (index & 7)
+
+    def count_solid(self):
+        """Cells holding any static geometry"""
+        return sum(bin(byte).count("1") for byte in self.bits)
+
+    def _cell_polygons(self, col, row):
+        if not (0 <= col < self.cols and 0 <= row < self.rows):
+            return ()
+        return self.cell_polygons.get(row * self.cols + col, ())
+
+    def fill_rect(self, left, bottom, right, top):
+        """Mark every cell touched by an axis aligned rectangle as solid"""
+        col0, row0 = self._cell_of(left, bottom)
+        # Half-open on the far side, a wall ending on a cell edge does not spill into the next cell
+        col1, row1 = self._cell_of(right - 1e-6, top - 1e-6)
+        for row in range(max(row0, 0), min(row1, self.rows - 1) + 1):
+            for col in range(max(col0, 0), min(col1, self.cols - 1) + 1):
+                self.set_cell(col, row)
+
+    def add_polygon(self, polygon):
+        """Store a hit box with every cell it overlaps (conservative rasterization)"""
+        polygon = tuple(polygon)
+        polygon_index = len(self.polygons)
+        self.polygons.append(polygon)
+        col0, row0 = self._cell_of(min(p[0] for p in polygon), min(p[1] for p in polygon))
+        col1, row1 = self._cell_of(max(p[0] for p in polygon), max(p[1] for p in polygon))
+        for row in range(max(row0, 0), min(row1, self.rows - 1) + 1):
+            for col in range(max(col0, 0), min(col1, self.cols - 1) + 1):
+                if polygon_overlaps_rect(polygon, *self._cell_rect(col, row)):
+                    index = row * self.cols + col
+                    self.bits[index >> 3] |= 1 << (index & 7)
+                    self.cell_polygons.setdefault(index, []).append(polygon_index)
+
+    def check_polygon(self, polygon):
+        """
+        Does the polygon touch a solid cell or a baked hit box? The grid only
+        picks the candidates, solid cells and hit boxes get an exact test.
+        """
+        col0, row0 = self._cell_of(min(p[0] for p in polygon), min(p[1] for p in polygon))
+        col1, row1 = self._cell_of(max(p[0] for p in polygon), max(p[1] for p in polygon))
+        tested = set()
+        for row in range(row0, row1 + 1):
+            for col in range(col0, col1 + 1):
+                if not self.is_occupied_cell(col, row):
+                    continue
+                if self.is_solid_cell(col, row):
+                    if polygon_overlaps_rect(polygon, *self._cell_rect(col, row)):
+                        return True
+                    continue
+                for i in self._cell_polygons(col, row):
+                    if i not in tested:
+                        tested.add(i)
+                        if polygons_intersect(polygon, self.polygons[i]):
+                            return True
+        return False
+
+    def raycast(self, x0, y0, x1, y1):
+        """
+        Walk the cells crossed by a segment (Amanatides & Woo) and return the
+        fraction 0..1 at which it first enters a solid cell or crosses a baked
+        hit box, or None. Hit boxes in the walked cells get an exact test, the
+        walk stops once no later cell can be hit earlier.
+        """
+        col, row = self._cell_of(x0, y0)
+        if self.is_solid_cell(col, row):
+            return 0.0
+        best = None
+        tested = set()
+
+        def test_cell(col, row):
+            nonlocal best
+            for i in self._cell_polygons(col, row):
+                if i not in tested:
+                    tested.add(i)
+                    t = segment_polygon_toi(x0, y0, x1, y1, self.polygons[i])
+                    if t is not None and (best is None or t < best):
+                        best = t
+
+        test_cell(col, row)
+        end_col, end_row = self._cell_of(x1, y1)
+
+        dx, dy = x1 - x0, y1 - y0
+        step_col = 1 if dx > 0 else -1
+        step_row = 1 if dy > 0 else -1
+        if dx:
+            t_max_x = (self.origin_x + (col + (step_col > 0)) * self.cell_size - x0) / dx
+            t_delta_x = self.cell_size / abs(dx)
+        else:
+            t_max_x = t_delta_x = math.inf
+        if dy:
+            t_max_y = (self.origin_y + (row + (step_row > 0)) * self.cell_size - y0) / dy
+            t_delta_y = self.cell_size / abs(dy)
+        else:
+            t_max_y = t_delta_y = math.inf
+
+        while (col, row) != (end_col, end_row):
+            if t_max_x < t_max_y:
+                t = t_max_x
+                col += step_col
+                t_max_x += t_delta_x
+            else:
+                t = t_max_y
+                row += step_row
+                t_max_y += t_delta_y
+            if t > 1 or (best is not None and best <= t):
+                return best
+            if self.is_solid_cell(col, row):
+                return t
+            test_cell(col, row)
+        return best
+
+    def to_bytes(self):
+        """Header, both bit sets, the hit boxes as float64 points, then the cell -> hit box lists"""
+        parts = [GRID_HEADER.pack(GRID_MAGIC, GRID_VERSION, self.cols, self.rows,
+                                  self.cell_size, self.origin_x, self.origin_y),
+                 bytes(self.bits), bytes(self.solid_bits), COUNT.pack(len(self.polygons))]
+        for polygon in self.polygons:
+            parts.append(COUNT.pack(len(polygon)))
+            parts.append(struct.pack(f"!{2 * len(polygon)}d", *(v for point in polygon for v in point)))
+        parts.append(COUNT.pack(len(self.cell_polygons)))
+        for index, polygon_indices in sorted(self.cell_polygons.items()):
+            parts.append(struct.pack(f"!II{len(polygon_indices)}I", index, len(polygon_indices), *polygon_indices))
+        return b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, data):
+        magic, version, cols, rows, cell_size, origin_x, origin_y = GRID_HEADER.unpack_from(data)
+        if magic != GRID_MAGIC or version != GRID_VERSION:
+            raise ValueError("Not a collision grid or outdated format")
+        grid = cls(origin_x, origin_y, cols * cell_size, rows * cell_size, cell_size)
+        grid.cols, grid.rows = cols, rows
+        size = (cols * rows + 7) // 8
+        offset = GRID_HEADER.size
+        try:
+            grid.bits = bytearray(data[offset:offset + size])
+            grid.solid_bits = bytearray(data[offset + size:offset + 2 * size])
+            if len(grid.solid_bits) != size:
+                raise ValueError("Truncated collision grid")
+            offset += 2 * size
+
+            (count,), offset = COUNT.unpack_from(data, offset), offset + COUNT.size
+            for _ in range(count):
+                (points,), offset = COUNT.unpack_from(data, offset), offset + COUNT.size
+                values = struct.unpack_from(f"!{2 * points}d", data, offset)
+                offset += 16 * points
+                grid.polygons.append(tuple(zip(values[::2], values[1::2])))
+
+            (count,), offset = COUNT.unpack_from(data, offset), offset + COUNT.size
+            for _ in range(count):
+                index, length = struct.unpack_from("!II", data, offset)
+                offset += 8
+                grid.cell_polygons[index] = list(struct.unpack_from(f"!{length}I", data, offset))
+                offset += 4 * length
+        except struct.error:
+            raise ValueError("Truncated collision grid")
+        if offset != len(data):
+            raise ValueError("Corrupt collision grid")
+        return grid
+
+    def save(self, path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(self.to_bytes())
+
+    @classmethod
+    def load(cls, path):
+        return cls.from_bytes(Path(path).read_bytes())
+
+
+def bake_collision_grid(entities, arena, origin_x, origin_y, width, height, cell_size=8):
+    """
+    Rasterize indestructible entities and everything outside the arena into a CollisionGrid.
+    Args:
+        entities: EntityStates, only indestructible ones are baked
+        arena: Arena, cells not fully inside it are solid
+    """
+    grid = CollisionGrid(origin_x, origin_y, width, height, cell_size)
+    for row in range(grid.rows):
+        for col in range(grid.cols):
+            if not arena.contains_box(*grid._cell_rect(col, row)):
+                grid.set_cell(col, row)
+    for entity in entities:
+        if entity.is_indestructible:
+            grid.add_polygon(entity.polygon())
+    return grid
+
+
+def bake_digest(entities, arena):
+    """
+    Hash of everything a baked grid depends on besides its layout: the bake
+    rules, the world space hit boxes of the baked entities (so texture,
+    scale, rotation and hit box algorithm) and the arena outline.
+    """
+    digest = hashlib.sha256(f"bake-{BAKE_VERSION}".encode())
+    for entity in entities:
+        if entity.is_indestructible:
+            digest.update(repr([(round(x, 3), round(y, 3)) for x, y in entity.polygon()]).encode())
+    digest.update(repr([(round(x, 3), round(y, 3)) for x, y in arena.outline]).encode())
+    return digest.hexdigest()
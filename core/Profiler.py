@@ -0,0 +1,166 @@
+import atexit
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parent.parent
+TRACE_DIR = project_root / ".cache" / "traces"
+
+
+class _NullScope:
+    """Returned by Profiler.scope() while disabled, entering and leaving it does nothing"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SCOPE = _NullScope()
+
+
+class _Scope:
+    __slots__ = ("name", "start")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        Profiler.record(self.name, self.start)
+        return False
+
+
+class Lap:
+    """
+    Span timer for loops that cannot be wrapped in a with block, e.g. a
+    receive loop full of `continue`: start() after a message arrives and
+    stop() at the top of the next iteration.
+    """
+
+    __slots__ = ("name", "start_time")
+
+    def __init__(self, name):
+        self.name = name
+        self.start_time = None
+
+    def start(self):
+        self.start_time = time.perf_counter() if Profiler.enabled else None
+
+    def stop(self):
+        if self.start_time is not None:
+            Profiler.record(self.name, self.start_time)
+            self.start_time = None
+
+
+class Profiler:
+    """
+    Timings of named frame phases and network handlers in a fixed-size ring
+    buffer, newest entries overwriting the oldest. While disabled a scope is a
+    shared no-op, so the instrumentation can stay in the hot paths. The ring
+    exports as Chrome trace JSON (chrome://tracing or ui.perfetto.dev).
+    """
+
+    enabled = False
+    capacity = 0
+    _names = []
+    _starts = []
+    _durations = []
+    _threads = []
+    _thread_names = {}
+    _next = 0
+    _exit_hook = False
+    _origin = time.perf_counter()
+
+    @classmethod
+    def configure(cls, enabled=True, capacity=65536, export_at_exit=True):
+        """(Re)allocate the ring and switch recording on or off"""
+        cls.enabled = False
+        cls.capacity = max(1, capacity)
+        cls._names = [None] * cls.capacity
+        cls._starts = [0.0] * cls.capacity
+        cls._durations = [0.0] * cls.capacity
+        cls._threads = [0] * cls.capacity
+        cls._next = 0
+        cls.enabled = enabled
+        if enabled and export_at_exit and not cls._exit_hook:
+            atexit.register(cls._export_at_exit)
+            cls._exit_hook = True
+
+    @classmethod
+    def scope(cls, name):
+        """Context manager timing its block as `name`"""
+        return _Scope(name) if cls.enabled else _NULL_SCOPE
+
+    @classmethod
+    def lap(cls, name):
+        return Lap(name)
+
+    @classmethod
+    def record(cls, name, start, end=None):
+        """Store a span that started at perf_counter() `start`"""
+        if not cls.enabled:
+            return
+        if end is None:
+            end = time.perf_counter()
+        # Threads racing for a slot can at worst overwrite one entry
+        i = cls._next
+        cls._next = (i + 1) % cls.capacity
+        thread = threading.get_ident()
+        if thread not in cls._thread_names:
+            cls._thread_names[thread] = threading.current_thread().name
+        cls._names[i] = name
+        cls._starts[i] = start
+        cls._durations[i] = end - start
+        cls._threads[i] = thread
+
+    @classmethod
+    def events(cls):
+        """Recorded spans in time order as (name, start, duration, thread id)"""
+        spans = zip(list(cls._names), list(cls._starts), list(cls._durations), list(cls._threads))
+        return sorted((span for span in spans if span[0] is not None), key=lambda span: span[1])
+
+    @classmethod
+    def export(cls, path=None):
+        """Write the ring as Chrome trace JSON, returns the path"""
+        if path is None:
+            path = TRACE_DIR / f"trace-{time.strftime('%Y%m%d-%H%M%S')}.json"
+        path = Path(path)
+        pid = os.getpid()
+
+        trace_events = [
+            {"name": "thread_name", "ph": "M", "pid": pid, "tid": thread, "args": {"name": name}}
+            for thread, name in cls._thread_names.items()
+        ]
+        for name, start, duration, thread in cls.events():
+            trace_events.append({
+                "name": name,
+                "cat": name.split(".", 1)[0],
+                "ph": "X",
+                "ts": round((start - cls._origin) * 1e6, 1),
+                "dur": round(duration * 1e6, 1),
+                "pid": pid,
+                "tid": thread,
+            })
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w") as file:
+            json.dump({"traceEvents": trace_events, "displayTimeUnit": "ms"}, file)
+        print(f"Exported {len(trace_events) - len(cls._thread_names)} profiler spans to {path}")
+        return path
+
+    @classmethod
+    def _export_at_exit(cls):
+        if cls.enabled and any(name is not None for name in cls._names):
+            try:
+                cls.export()
+            except OSError as e:
+                print(f"ERROR: Failed to export profiler trace: {e}")
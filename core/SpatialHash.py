@@ -0,0 +1,89 @@
+import math
+
+from core.CollisionGrid import polygons_intersect
+
+
+def polygon_bounds(points):
+    """Return (left, bottom, right, top) of a polygon"""
+    xs = [p[0] for p in points]
+    ys = [p[1] for p in points]
+    return min(xs), min(ys), max(xs), max(ys)
+
+
+class SpatialHash:
+    """
+    Uniform grid over static entities for broadphase collision queries.
+    Entities never move, so their hit box polygon and cells are computed
+    once on insert; a query only looks at entities in the cells it touches.
+    Entities are EntityStates, anything with a polygon() method works.
+    """
+
+    def __init__(self, cell_size=128):
+        self.cell_size = cell_size
+        self.cells = {}  # (cell_x, cell_y) -> list of entities
+        self.entity_cells = {}  # entity -> list of cell keys
+        self.polygons = {}  # entity -> (polygon, bounds)
+        self.version = 0  # bumped on every change so derived data can be rebuilt lazily
+
+    def _cell_range(self, left, bottom, right, top):
+        size = self.cell_size
+        for cell_x in range(math.floor(left / size), math.floor(right / size) + 1):
+            for cell_y in range(math.floor(bottom / size), math.floor(top / size) + 1):
+                yield cell_x, cell_y
+
+    def __len__(self):
+        return len(self.entity_cells)
+
+    def insert(self, entity):
+        if entity in self.entity_cells:
+            return
+        polygon = tuple(entity.polygon())
+        bounds = polygon_bounds(polygon)
+        keys = list(self._cell_range(*bounds))
+        for key in keys:
+            self.cells.setdefault(key, []).append(entity)
+        self.entity_cells[entity] = keys
+        self.polygons[entity] = (polygon, bounds)
+        self.version += 1
+
+    def remove(self, entity):
+        """Forget an entity, e.g. after it was destroyed"""
+        keys = self.entity_cells.pop(entity, None)
+        if keys is None:
+            return
+        for key in keys:
+            bucket = self.cells.get(key)
+            if bucket is None:
+                continue
+            bucket.remove(entity)
+            if not bucket:
+                del self.cells[key]
+        del self.polygons[entity]
+        self.version += 1
+
+    def clear(self):
+        self.cells.clear()
+        self.entity_cells.clear()
+        self.polygons.clear()
+        self.version += 1
+
+    def query(self, left, bottom, right, top):
+        """Entities whose bounding box overlaps the given box"""
+        found = []
+        seen = set()
+        for key in self._cell_range(left, bottom, right, top):
+            for entity in self.cells.get(key, ()):
+                if entity in seen:
+                    continue
+                seen.add(entity)
+                e_left, e_bottom, e_right, e_top = self.polygons[entity][1]
+                if e_left <= right and e_right >= left and e_bottom <= top and e_top >= bottom:
+                    found.append(entity)
+        return found
+
+    def first_collision(self, polygon):
+        """Return an entity whose hit box intersects the polygon, or None"""
+        for entity in self.query(*polygon_bounds(polygon)):
+            if polygons_intersect(polygon, self.polygons[entity][0]):
+                return entity
+        return None
@@ -0,0 +1,188 @@
+import math
+
+
+def world_points(local_points, x, y, angle):
+    """
+    Place a hit box given relative to its center at (x, y), rotated clockwise
+    by angle degrees. Same transform arcade applies to sprite hit boxes.
+    """
+    rad = math.radians(-angle)
+    cos, sin = math.cos(rad), math.sin(rad)
+    return [(px * cos - py * sin + x, px * sin + py * cos + y) for px, py in local_points]
+
+
+def box_points(width, height):
+    """Rectangular hit box centered on the origin, for states created without a sprite"""
+    half_w, half_h = width / 2, height / 2
+    return ((-half_w, -half_h), (half_w, -half_h), (half_w, half_h), (-half_w, half_h))
+
+
+def state_property(name):
+    """Attribute of a view that reads and writes the bound state object"""
+    return property(lambda view: getattr(view.state, name),
+                    lambda view, value: setattr(view.state, name, value))
+
+
+class TankState:
+    """
+    Everything the simulation knows about a tank: pose, movement, firing and
+    recoil timers. Plain slotted data, the Tank sprite is only a view of it.
+    """
+
+    __slots__ = ("player_id", "tank_color", "x", "y", "angle", "hit_box",
+                 "speed", "rotation_speed", "is_rotating", "is_moving", "clockwise", "barrel_length",
+                 "health", "destroyed", "fire_cooldown", "tick", "tick_dt", "last_fire_tick",
+                 "is_recoiling", "recoil_start_tick", "recoil_duration", "recoil_distance", "view")
+
+    def __init__(self, player_id=None, tank_color="blue", x=0.0, y=0.0, angle=0.0, hit_box=None):
+        self.player_id = player_id
+        self.tank_color = tank_color
+        self.x = x
+        self.y = y
+        self.angle = angle
+        # Scaled hit box points relative to the center, before rotation
+        self.hit_box = tuple(hit_box) if hit_box else box_points(50, 60)
+
+        # Movement properties
+        self.rotation_speed = 100  # degrees per second
+        self.is_rotating = True
+        self.is_moving = False
+        self.speed = 200  # pixels per second
+        self.clockwise = True
+        self.barrel_length = 50
+
+        # Game properties
+        self.health = 1
+        self.destroyed = False
+        self.fire_cooldown = 0.5  # SHOOTING COOLDOWN
+
+        # Simulation clock: timers count ticks, never read the wall clock
+        self.tick = 0
+        self.tick_dt = 1 / 60  # length of the last simulation step
+        self.last_fire_tick = None
+
+        # Recoil properties
+        self.is_recoiling = False
+        self.recoil_start_tick = 0
+        self.recoil_duration = 0.2
+        self.recoil_distance = 170
+
+        # Whatever presents this tank, the simulation never touches it
+        self.view = None
+
+    def polygon(self, x=None, y=None):
+        """World space hit box, optionally as if the tank were centered at (x, y)"""
+        return world_points(self.hit_box, self.x if x is None else x, self.y if y is None else y, self.angle)
+
+    def update(self, delta_time, skip_movement=False):
+        self.tick += 1
+        self.tick_dt = delta_time
+
+        if self.destroyed:
+            return
+
+        # Handle recoil if active
+        if self.is_recoiling:
+            elapsed = (self.tick - self.recoil_start_tick) * self.tick_dt
+            if elapsed < self.recoil_duration:
+                # Move in the opposite direction of the barrel
+                angle_rad = math.radians(self.angle + 180)
+                # Quadratic ease-out
+                progress = elapsed / self.recoil_duration
+                ease_factor = 1 - (1 - progress) * (1 - progress)
+                recoil_speed = (self.recoil_distance / self.recoil_duration) * (1 - ease_factor)
+                self.x += recoil_speed * math.sin(angle_rad) * delta_time
+                self.y += recoil_speed * math.cos(angle_rad) * delta_time
+            else:
+                self.is_recoiling = False
+
+        # Always handle rotation, regardless of skip_movement
+        if self.is_rotating:
+            if self.clockwise:
+                self.angle += self.rotation_speed * delta_time
+            else:
+                self.angle -= self.rotation_speed * delta_time
+
+        if not skip_movement and self.is_moving:
+            dx, dy = self.move_delta(delta_time)
+            self.x += dx
+            self.y += dy
+
+    def move_delta(self, delta_time):
+        """Distance driven forward in one step"""
+        angle_rad = math.radians(self.angle)
+        return self.speed * math.sin(angle_rad) * delta_time, self.speed * math.cos(angle_rad) * delta_time
+
+    def barrel_position(self):
+        """Position at the end of the barrel"""
+        angle_rad = math.radians(self.angle)
+        return (self.x + math.sin(angle_rad) * self.barrel_length,
+                self.y + math.cos(angle_rad) * self.barrel_length)
+
+    def fire(self, bullets):
+        """Spawn a bullet in the store if the cooldown has elapsed. Returns its slot or None."""
+        if self.last_fire_tick is not None and (self.tick - self.last_fire_tick) * self.tick_dt < self.fire_cooldown:
+            return None
+
+        self.last_fire_tick = self.tick
+        self.is_recoiling = True
+        self.recoil_start_tick = self.tick
+
+        # Owned by this tank to prevent self-damage
+        barrel_x, barrel_y = self.barrel_position()
+        return bullets.spawn(barrel_x, barrel_y, self.angle, self)
+
+    def take_damage(self, damage=1):
+        self.health -= damage
+        if self.health <= 0:
+            self.destroyed = True
+        return self.destroyed
+
+    def press(self):
+        """Drive forward while the fire key is held"""
+        if self.destroyed:
+            return False
+        self.is_rotating = False
+        self.is_moving = True
+        return True
+
+    def release(self):
+        """Stop and rotate the other way"""
+        if self.destroyed:
+            return
+        self.is_moving = False
+        self.is_rotating = True
+        self.clockwise = not self.clockwise
+
+
+class EntityState:
+    """Simulation state of a static entity: placement, hit box and hit points"""
+
+    __slots__ = ("entity_type", "x", "y", "angle", "hit_box",
+                 "max_hp", "current_hp", "is_indestructible", "entity_index", "view")
+
+    def __init__(self, entity_type, x, y, angle=0.0, hp=3, hit_box=None):
+        self.entity_type = entity_type
+        self.x = x
+        self.y = y
+        self.angle = angle
+        self.hit_box = tuple(hit_box) if hit_box else box_points(64, 64)
+        self.max_hp = hp
+        self.current_hp = hp
+        self.is_indestructible = (hp == 0)
+        self.entity_index = None
+        self.view = None
+
+    def polygon(self):
+        """World space hit box. Entities never move, the spatial hash keeps it once inserted."""
+        return world_points(self.hit_box, self.x, self.y, self.angle)
+
+    def take_damage(self, damage=1):
+        """Returns True if this destroyed the entity"""
+        if self.is_indestructible:
+            return False
+        self.current_hp -= damage
+        return self.current_hp <= 0
+
+    def is_alive(self):
+        return self.current_hp > 0 or self.is_indestructible
@@ -0,0 +1,205 @@
+from core.Arena import Arena
+from core.BulletStore import BulletStore
+from core.CollisionGrid import segment_polygon_toi
+from core.Profiler import Profiler
+from core.SpatialHash import SpatialHash, polygon_bounds
+
+
+class World:
+    """
+    All simulation state of a match: arena, tank and entity states, bullets
+    and the static collision structures. Nothing here needs arcade, so the
+    same world steps inside the game, on a server or in a benchmark.
+    """
+
+    def __init__(self, width, height, bullets=None, cell_size=128):
+        self.width = width
+        self.height = height
+        self.arena = Arena(0, 0, width, height)
+        self.tanks = []
+        self.entities = []  # Map file order, used to address them in state snapshots
+        # Broadphase for entities not baked into the collision grid
+        self.spatial_hash = SpatialHash(cell_size)
+        self.collision_grid = None
+        self.bullets = bullets if bullets is not None else BulletStore(width, height)
+        self.tick = 0
+
+        # Per-step scratch, reused every step: earliest hit per bullet slot,
+        # tank hit boxes with their bounds, and the hits handed back by step()
+        self.bullet_hits = {}
+        self.tank_polygons = []
+        self.tank_bounds = []
+        self.applied_hits = []
+
+    def add_tank(self, tank):
+        if tank not in self.tanks:
+            self.tanks.append(tank)
+
+    def remove_tank(self, tank):
+        if tank in self.tanks:
+            self.tanks.remove(tank)
+
+    def add_entity(self, entity):
+        entity.entity_index = len(self.entities)
+        self.entities.append(entity)
+        self.spatial_hash.insert(entity)
+
+    def remove_entity(self, entity):
+        self.spatial_hash.remove(entity)
+
+    def set_collision_grid(self, grid):
+        """Use a baked grid for walls and indestructible entities, or None for per-entity checks"""
+        self.collision_grid = grid
+        self.bullets.set_static_grid(grid)
+        for entity in self.entities:
+            if entity.is_indestructible:
+                if grid is None:
+                    self.spatial_hash.insert(entity)
+                else:
+                    self.spatial_hash.remove(entity)
+
+    def clear(self):
+        self.tanks = []
+        self.entities = []
+        self.spatial_hash.clear()
+        self.collision_grid = None
+        self.bullets.clear()
+        self.bullets.set_static_grid(None)
+        self.tick = 0
+
+    def tank_blocked(self, tank, x, y):
+        """Would the tank hit a wall or a static entity if it were centered at (x, y)?"""
+        with Profiler.scope("world.static_collision"):
+            polygon = tank.polygon(x, y)
+            if self.collision_grid is None:
+                # Raw bounding box against the arena, no need to build a sprite or move it
+                if not self.arena.contains_box(*polygon_bounds(polygon)):
+                    return True
+            elif self.collision_grid.check_polygon(polygon):
+                return True
+            # Walls and indestructible entities are in the grid, only destructibles are left in the hash
+            return self.spatial_hash.first_collision(polygon) is not None
+
+
+def step(world, delta_time):
+    """
+    Advance the world by one fixed tick: tanks drive, recoil and slide along
+    obstacles, then every bullet moves and its earliest hit is applied.
+    Returns the hits as (x, y, kind, target) with kind "tank", "entity" or
+    "wall", so views can show explosions and destroyed targets. The list is
+    reused, it is only valid until the next step.
+
+    Profiler scopes: world.movement spans the tank loop, including the
+    nested world.static_collision checks of tank_blocked.
+    """
+    world.tick += 1
+
+    with Profiler.scope("world.movement"):
+        for tank in world.tanks:
+            old_x, old_y = tank.x, tank.y
+
+            # Recoil and rotation, regular movement is checked axis by axis below
+            tank.update(delta_time, skip_movement=True)
+
+            # Recoil into an obstacle is undone
+            if world.tank_blocked(tank, tank.x, tank.y):
+                tank.x, tank.y = old_x, old_y
+
+            if tank.is_moving and not tank.destroyed:
+                post_recoil_x, post_recoil_y = tank.x, tank.y
+                delta_x, delta_y = tank.move_delta(delta_time)
+
+                # Try X and Y separately so tanks slide along walls
+                new_x = post_recoil_x + delta_x
+                if not world.tank_blocked(tank, new_x, post_recoil_y):
+                    tank.x = new_x
+                new_y = post_recoil_y + delta_y
+                if not world.tank_blocked(tank, tank.x, new_y):
+                    tank.y = new_y
+
+    # Move all bullets in one batch, then sweep them against tanks, entities and walls
+    with Profiler.scope("world.bullet_move"):
+        world.bullets.update(delta_time)
+    hits = resolve_bullet_hits(world)
+    with Profiler.scope("world.bullet_move"):
+        world.bullets.cull_out_of_bounds()
+    return hits
+
+
+def offer_hit(hits, i, t, kind, target):
+    """Keep the hit if it is the earliest one of bullet slot i so far"""
+    if t is not None and (i not in hits or t < hits[i][0]):
+        hits[i] = (t, kind, target)
+
+
+def resolve_bullet_hits(world):
+    """
+    Find the earliest hit of every bullet along its path since the last update
+    and apply them in one batch. The vectorized broadphase in the bullet store
+    picks the candidates, only those get an exact segment test. Coordinates
+    are read from the store's arrays for candidates only, no per-bullet copies.
+    """
+    bullets = world.bullets
+    applied = world.applied_hits
+    applied.clear()
+    n = bullets.count
+    if not n:
+        return applied
+
+    bounds = bullets.segment_bounds()
+    x0s, y0s, x1s, y1s = bullets.prev_x, bullets.prev_y, bullets.x, bullets.y
+    hits = world.bullet_hits
+    hits.clear()
+
+    # Dead tanks still stop bullets. The broadphase yields candidate pairs,
+    # only those get the polygon-precise test.
+    tanks = world.tanks
+    with Profiler.scope("world.bullet_tank_hits"):
+        polygons, tank_bounds = world.tank_polygons, world.tank_bounds
+        polygons.clear()
+        tank_bounds.clear()
+        for tank in tanks:
+            polygon = tank.polygon()
+            polygons.append(polygon)
+            tank_bounds.append(polygon_bounds(polygon))
+        slots, targets = bullets.tank_candidates(bounds, tanks, tank_bounds)
+        for i, target in zip(slots, targets):
+            t = segment_polygon_toi(x0s[i], y0s[i], x1s[i], y1s[i], polygons[target])
+            offer_hit(hits, i, t, "tank", tanks[target])
+
+    with Profiler.scope("world.bullet_static_hits"):
+        # Destructible entities, plus indestructible ones when there is no baked grid
+        spatial_hash = world.spatial_hash
+        slots, targets = bullets.entity_candidates(spatial_hash, bounds)
+        for i, target in zip(slots, targets):
+            entity = bullets.entities[target]
+            t = segment_polygon_toi(x0s[i], y0s[i], x1s[i], y1s[i], spatial_hash.polygons[entity][0])
+            offer_hit(hits, i, t, "entity", entity)
+
+        if world.collision_grid is not None:
+            for i in bullets.wall_candidates(bounds):
+                offer_hit(hits, i, world.collision_grid.raycast(x0s[i], y0s[i], x1s[i], y1s[i]), "wall", None)
+        else:
+            # Analytic exit test, only for paths whose box is not inside the arena's box.
+            # A polygon arena can be crossed inside its box, there every path is tested.
+            arena = world.arena
+            if arena.polygon is None:
+                candidates = bullets.outside_candidates(bounds, arena.left, arena.bottom, arena.right, arena.top)
+            else:
+                candidates = range(n)
+            for i in candidates:
+                offer_hit(hits, i, arena.segment_exit(x0s[i], y0s[i], x1s[i], y1s[i]), "wall", None)
+
+    for i, (t, kind, target) in hits.items():
+        impact_x = float(x0s[i] + (x1s[i] - x0s[i]) * t)
+        impact_y = float(y0s[i] + (y1s[i] - y0s[i]) * t)
+        applied.append((impact_x, impact_y, kind, target))
+
+        if kind == "tank" and not target.destroyed:
+            target.take_damage()
+        elif kind == "entity" and not target.is_indestructible:
+            if target.take_damage(int(bullets.damage[i])):
+                world.remove_entity(target)
+
+    bullets.kill(hits)
+    return applied
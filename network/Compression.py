@@ -0,0 +1,71 @@
+import zlib
+
+# Compressed datagrams start with this two byte marker: 0xFF, which can never
+# appear in UTF-8 text, then "Z". Plain JSON/text messages and compressed ones
+# can therefore share the same socket.
+COMPRESSED_MAGIC = b"\xffZ"
+
+# Messages shorter than this are sent as-is, compression would not pay off
+COMPRESSION_THRESHOLD = 160
+
+COMPRESSION_LEVEL = 9
+
+# Preset dictionary with the strings that repeat in control messages.
+# zlib favours matches near the end of the dictionary, so the most common
+# fragments go last. Changing this breaks compatibility between versions.
+PRESET_DICTIONARY = (
+    b'"map_selected", "map_name": "forest"lava"snow"stones"'
+    b'"server_disconnect"'
+    b'"127.0.0.1", 5000], "'
+    b'players:[[["'
+    b' (yellow)", [["192.168.'
+    b' (green)", [["'
+    b' (red)", [["'
+    b' (blue)", [["'
+    b' (host)"], [["'
+    b'{"type": "player_list_update", "players": [[["'
+    b'"spawn_assignments": {"'
+    b'{"type": "command", "command": "game_start", "color_assignments": {"'
+    b'": "yellow", "'
+    b'": "green", "'
+    b'": "red", "'
+    b'": "blue", "'
+    b'}, "id": "17'
+    b'", "require_ack": true}'
+)
+
+
+class CompressionError(ValueError):
+    """Raised when a compressed datagram cannot be inflated"""
+
+
+def compress_message(text, threshold=COMPRESSION_THRESHOLD):
+    """
+    Encode a control message for the wire.
+    Returns compressed bytes with the magic prefix, or the plain UTF-8 bytes
+    when the message is below the threshold or compression does not shrink it.
+    """
+    raw = text.encode() if isinstance(text, str) else text
+    if len(raw) < threshold:
+        return raw
+
+    # Raw deflate (negative wbits) drops the zlib header and checksum
+    compressor = zlib.compressobj(COMPRESSION_LEVEL, zlib.DEFLATED, -15, 9,
+                                  zlib.Z_DEFAULT_STRATEGY, PRESET_DICTIONARY)
+    packed = COMPRESSED_MAGIC + compressor.compress(raw) + compressor.flush()
+    return packed if len(packed) < len(raw) else raw
+
+
+def is_compressed(data):
+    return data[:len(COMPRESSED_MAGIC)] == COMPRESSED_MAGIC
+
+
+def decode_datagram(data):
+    """Decode a received datagram to text, inflating it first if it is compressed"""
+    if is_compressed(data):
+        try:
+            decompressor = zlib.decompressobj(-15, PRESET_DICTIONARY)
+            data = decompressor.decompress(data[len(COMPRESSED_MAGIC):]) + decompressor.flush()
+        except zlib.error as e:
+            raise CompressionError(f"Invalid compressed datagram: {e}") from e
+    return data.decode()
@@ -0,0 +1,187 @@
+import json
+import socket
+import statistics
+import threading
+import time
+
+# Servers listen for discovery beacons on their own port so broadcasts reach
+# them regardless of which address the game socket is bound to. One server per
+# host: the port is not shared, a second local server runs without discovery.
+DISCOVERY_PORT = 5001
+DISCOVERY_GAME = "tactical-tanks"
+
+
+class DiscoveryResponder:
+    """
+    Server side: answers LAN discovery beacons and latency probes
+    with the server's name, player count and map. Only one responder per
+    host can bind the discovery port.
+    """
+
+    def __init__(self, get_info, port=DISCOVERY_PORT):
+        """
+        Args:
+            get_info (callable): Returns a dict describing the server (name, players, map, ...)
+            port (int): UDP port to listen on for beacons
+        """
+        self.get_info = get_info
+        self.port = port
+        self.running = False
+        self.socket = None
+        self.thread = None
+
+    def start(self):
+        try:
+            self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            # Exclusive bind, neither SO_REUSEPORT nor SO_REUSEADDR (which shares a UDP
+            # port on Linux too, and UDP has no TIME_WAIT to skip). Linux hands each
+            # unicast datagram (loopback discover, every probe) to just one of the
+            # sharing sockets, so a second server would miss loopback discovery and
+            # could answer the other's probes.
+            self.socket.bind(("", self.port))
+            self.socket.settimeout(0.5)
+        except OSError as e:
+            print(f"LAN discovery unavailable (another server on this host?): {e}")
+            self.socket = None
+            return
+
+        self.running = True
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+        print(f"LAN discovery listening on port {self.port}")
+
+    def stop(self):
+        self.running = False
+        if self.socket:
+            try:
+                self.socket.close()
+            except OSError:
+                pass
+            self.socket = None
+
+    def _run(self):
+        while self.running:
+            try:
+                data, addr = self.socket.recvfrom(1024)
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+
+            try:
+                message = json.loads(data.decode())
+            except (UnicodeDecodeError, json.JSONDecodeError):
+                continue
+
+            if message.get("game") != DISCOVERY_GAME or message.get("type") not in ("discover", "probe"):
+                continue
+
+            reply = dict(self.get_info())
+            reply.update({
+                "type": "discovery_reply",
+                "game": DISCOVERY_GAME,
+                "kind": message.get("type"),
+                "sent": message.get("sent"),
+            })
+            try:
+                self.socket.sendto(json.dumps(reply).encode(), addr)
+            except OSError as e:
+                print(f"Error answering discovery from {addr}: {e}")
+
+
+class DiscoveredServer:
+    """A server found on the LAN together with its measured latency"""
+
+    def __init__(self, ip, port, name, players, max_players, map_name, in_game, discovery_addr):
+        self.ip = ip
+        self.port = port
+        self.name = name
+        self.players = players
+        self.max_players = max_players
+        self.map_name = map_name
+        self.in_game = in_game
+        self.discovery_addr = discovery_addr
+        self.rtt_samples = []
+
+    @property
+    def rtt(self):
+        """Median RTT in seconds, None until a reply was measured"""
+        return statistics.median(self.rtt_samples) if self.rtt_samples else None
+
+    @property
+    def joinable(self):
+        return not self.in_game and self.players < self.max_players
+
+    def __repr__(self):
+        rtt = f"{self.rtt * 1000:.1f}ms" if self.rtt is not None else "?"
+        return f"<DiscoveredServer {self.name} {self.ip}:{self.port} {self.players}/{self.max_players} {rtt}>"
+
+
+def discover_servers(timeout=0.4, probes=3, port=DISCOVERY_PORT, settle_time=0.15):
+    """
+    Broadcast a discovery beacon and probe every responder in parallel.
+    Stops early once settle_time has passed and every responder answered all probes.
+    Returns DiscoveredServer objects sorted by measured RTT (fastest first).
+    """
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
+    sock.settimeout(0.05)
+
+    def send(message_type, addr):
+        payload = json.dumps({"type": message_type, "game": DISCOVERY_GAME, "sent": time.perf_counter()})
+        try:
+            sock.sendto(payload.encode(), addr)
+        except OSError as e:
+            print(f"Discovery send to {addr} failed: {e}")
+
+    servers = {}
+    try:
+        # Broadcast for the LAN, plus loopback for a server on this machine
+        send("discover", ("<broadcast>", port))
+        send("discover", ("127.0.0.1", port))
+
+        started = time.perf_counter()
+        deadline = started + timeout
+        while time.perf_counter() < deadline:
+            if (servers and time.perf_counter() - started > settle_time and
+                    all(len(s.rtt_samples) > probes for s in servers.values())):
+                break
+            try:
+                data, addr = sock.recvfrom(2048)
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+
+            received_at = time.perf_counter()
+            try:
+                reply = json.loads(data.decode())
+            except (UnicodeDecodeError, json.JSONDecodeError):
+                continue
+            if reply.get("type") != "discovery_reply" or reply.get("game") != DISCOVERY_GAME:
+                continue
+
+            # A server bound to all interfaces reports 0.0.0.0, use the address it answered from
+            server_ip = reply.get("ip") or addr[0]
+            if server_ip in ("0.0.0.0", ""):
+                server_ip = addr[0]
+            key = (server_ip, reply.get("port"))
+
+            server = servers.get(key)
+            if server is None:
+                server = DiscoveredServer(
+                    server_ip, reply.get("port"), reply.get("name") or "Unknown",
+                    reply.get("players", 0), reply.get("max_players", 4),
+                    reply.get("map"), reply.get("in_game", False), addr
+                )
+                servers[key] = server
+                # Probe every new responder right away so all probes run concurrently
+                for _ in range(probes):
+                    send("probe", addr)
+
+            if reply.get("sent") is not None:
+                server.rtt_samples.append(received_at - reply["sent"])
+    finally:
+        sock.close()
+
+    return sorted(servers.values(), key=lambda s: s.rtt if s.rtt is not None else float("inf"))
@@ -0,0 +1,435 @@
+import hashlib
+import json
+import math
+import re
+import struct
+import threading
+import time
+from pathlib import Path
+
+# Binary file chunk datagram: magic, 32 byte sha256 digest, chunk index, total chunks, data.
+# 0xFE can never start a UTF-8 string, so chunks share the socket with text messages.
+FILE_CHUNK_MAGIC = b"\xfeC"
+CHUNK_HEADER = struct.Struct("!32sII")
+CHUNK_SIZE = 1200  # keeps each datagram under a typical 1500 byte MTU
+
+# How many chunks a client keeps in flight and how long before it re-requests them
+REQUEST_WINDOW = 64
+STALL_TIMEOUT = 0.5
+
+# Chunks per second the server sends one client, and how many it may ask for at once
+CHUNK_RATE = 2048  # about 2.4 MB/s, every bundled map in under 3 seconds
+CHUNK_BURST = 2 * REQUEST_WINDOW
+
+# What a manifest entry may describe. Anything else is refused before it touches the disk.
+HASH_PATTERN = re.compile(r"[0-9a-f]{64}")
+ALLOWED_SUFFIXES = (".json", ".png", ".jpg")
+MAX_FILE_SIZE = 64 * 1024 * 1024
+PART_SUFFIXES = (".part", ".part.json")
+
+
+def hash_bytes(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def hash_file(path):
+    """Return the sha256 hex digest of a file"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for block in iter(lambda: file.read(1 << 16), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def encode_chunk(content_hash, index, total, data):
+    return FILE_CHUNK_MAGIC + CHUNK_HEADER.pack(bytes.fromhex(content_hash), index, total) + data
+
+
+def decode_chunk(datagram):
+    """Return (content_hash, index, total, data) from a chunk datagram"""
+    header_end = len(FILE_CHUNK_MAGIC) + CHUNK_HEADER.size
+    digest, index, total = CHUNK_HEADER.unpack(datagram[len(FILE_CHUNK_MAGIC):header_end])
+    return digest.hex(), index, total, datagram[header_end:]
+
+
+def is_chunk(datagram):
+    return datagram[:len(FILE_CHUNK_MAGIC)] == FILE_CHUNK_MAGIC
+
+
+def is_valid_entry(entry):
+    """Does a manifest file entry have a sha256 hash, an allowed suffix and a sane size?"""
+    if not isinstance(entry, dict):
+        return False
+    content_hash, size = entry.get("hash"), entry.get("size")
+    return (isinstance(content_hash, str) and HASH_PATTERN.fullmatch(content_hash) is not None
+            and entry.get("suffix", "") in ALLOWED_SUFFIXES
+            and isinstance(size, int) and not isinstance(size, bool) and 0 <= size <= MAX_FILE_SIZE)
+
+
+def sanitize_manifest(manifest):
+    """Drop maps whose file or any asset entry is invalid, they could point outside the cache"""
+    if not isinstance(manifest, dict):
+        print("WARNING: Ignoring malformed map manifest")
+        return {}
+    valid = {}
+    for map_name, entry in manifest.items():
+        assets = entry.get("assets", {}) if isinstance(entry, dict) else None
+        if (is_valid_entry(entry) and isinstance(assets, dict)
+                and all(isinstance(resource, str) and is_valid_entry(asset) for resource, asset in assets.items())):
+            valid[map_name] = entry
+        else:
+            print(f"WARNING: Ignoring invalid manifest entry for map {map_name!r}")
+    return valid
+
+
+class ChunkBudget:
+    """Token bucket limiting how many file chunks the server sends one client"""
+
+    def __init__(self, rate=CHUNK_RATE, burst=CHUNK_BURST):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.last_refill = time.monotonic()
+
+    def take(self, wanted):
+        """Return how many of the wanted chunks may be sent now"""
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.last_refill) * self.rate)
+        self.last_refill = now
+        granted = max(0, min(wanted, int(self.tokens)))
+        self.tokens -= granted
+        return granted
+
+
+class MapLibrary:
+    """
+    Server side: builds the content-addressed manifest of all maps and their
+    backgrounds and serves file chunks on request.
+    """
+
+    def __init__(self, maps_dir, resolve_resource):
+        """
+        Args:
+            maps_dir (Path): Directory with <name>.json map files
+            resolve_resource (callable): Turns a resource path like ":assets:..." into a file Path
+        """
+        self.maps_dir = Path(maps_dir)
+        self.resolve_resource = resolve_resource
+        self.manifest = {}
+        self.files = {}  # content hash -> Path
+        self.file_data = {}  # content hash -> bytes, loaded on first request
+        self.lock = threading.Lock()
+        self.rebuild()
+
+    def _describe_file(self, path):
+        content_hash = hash_file(path)
+        self.files[content_hash] = path
+        return {"hash": content_hash, "size": path.stat().st_size, "suffix": path.suffix}
+
+    def rebuild(self):
+        """Hash every map and the assets it references"""
+        manifest = {}
+        for map_file in sorted(self.maps_dir.glob("*.json")):
+            try:
+                entry = self._describe_file(map_file)
+                with open(map_file, "r") as file:
+                    map_data = json.load(file)
+
+                assets = {}
+                background = map_data.get("map_info", {}).get("background")
+                if background:
+                    try:
+                        asset_path = Path(self.resolve_resource(background))
+                        assets[background] = self._describe_file(asset_path)
+                    except Exception as e:
+                        print(f"Map {map_file.stem}: cannot resolve background {background}: {e}")
+
+                entry["assets"] = assets
+                manifest[map_file.stem] = entry
+            except Exception as e:
+                print(f"Error adding map {map_file} to manifest: {e}")
+
+        self.manifest = manifest
+        print(f"Map manifest built for {len(manifest)} maps")
+
+    def get_map_hash(self, map_name):
+        entry = self.manifest.get(map_name)
+        return entry["hash"] if entry else None
+
+    def _get_data(self, content_hash):
+        with self.lock:
+            data = self.file_data.get(content_hash)
+            if data is None:
+                path = self.files.get(content_hash)
+                if path is None:
+                    return None
+                data = path.read_bytes()
+                self.file_data[content_hash] = data
+            return data
+
+    def get_chunks(self, content_hash, indices):
+        """Yield encoded chunk datagrams for the requested indices"""
+        if not isinstance(content_hash, str) or not isinstance(indices, list):
+            return
+        data = self._get_data(content_hash)
+        if data is None:
+            print(f"Requested unknown file {content_hash[:12]}")
+            return
+        total = max(1, math.ceil(len(data) / CHUNK_SIZE))
+        for index in indices[:REQUEST_WINDOW]:
+            if isinstance(index, int) and 0 <= index < total:
+                start = index * CHUNK_SIZE
+                yield encode_chunk(content_hash, index, total, data[start:start + CHUNK_SIZE])
+
+
+class MapCache:
+    """
+    Client side content-addressed cache. Files are stored as <hash><suffix>,
+    so a changed map or background is simply a different file.
+    """
+
+    def __init__(self, cache_dir, maps_dir, resolve_resource):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.maps_dir = Path(maps_dir)
+        self.resolve_resource = resolve_resource
+        self._local_hashes = {}  # path -> (mtime, size, hash)
+
+    def blob_path(self, content_hash, suffix=""):
+        # Both parts come from the server's manifest, never let them leave the cache directory
+        if not isinstance(content_hash, str) or HASH_PATTERN.fullmatch(content_hash) is None:
+            raise ValueError(f"Invalid content hash {content_hash!r}")
+        if suffix not in ALLOWED_SUFFIXES + PART_SUFFIXES + ("",):
+            raise ValueError(f"Invalid file suffix {suffix!r}")
+        return self.cache_dir / f"{content_hash}{suffix}"
+
+    def has_blob(self, content_hash, suffix=""):
+        return self.blob_path(content_hash, suffix).exists()
+
+    def _local_hash(self, path):
+        """Hash of a local file, memoised by modification time and size"""
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        cached = self._local_hashes.get(path)
+        if cached and cached[0] == stat.st_mtime and cached[1] == stat.st_size:
+            return cached[2]
+        content_hash = hash_file(path)
+        self._local_hashes[path] = (stat.st_mtime, stat.st_size, content_hash)
+        return content_hash
+
+    def _local_resource_path(self, resource):
+        try:
+            return Path(self.resolve_resource(resource))
+        except Exception:
+            return None
+
+    def find(self, entry, local_path):
+        """Return a path holding the file described by entry, preferring the local copy"""
+        if local_path is not None and self._local_hash(local_path) == entry["hash"]:
+            return local_path
+        blob = self.blob_path(entry["hash"], entry.get("suffix", ""))
+        if blob.exists():
+            return blob
+        return None
+
+    def find_map(self, map_name, entry):
+        return self.find(entry, self.maps_dir / f"{map_name}.json")
+
+    def find_asset(self, resource, entry):
+        return self.find(entry, self._local_resource_path(resource))
+
+    def missing_files(self, manifest):
+        """List manifest file entries that are neither installed locally nor cached"""
+        missing = []
+        for map_name, entry in manifest.items():
+            if self.find_map(map_name, entry) is None:
+                missing.append(entry)
+            for resource, asset_entry in entry.get("assets", {}).items():
+                if self.find_asset(resource, asset_entry) is None:
+                    missing.append(asset_entry)
+        return missing
+
+
+class FileTransfer:
+    """Resumable download of a single content-addressed file"""
+
+    def __init__(self, cache, entry):
+        if not is_valid_entry(entry):
+            raise ValueError(f"Invalid manifest entry {entry!r}")
+        self.cache = cache
+        self.hash = entry["hash"]
+        self.size = entry["size"]
+        self.suffix = entry.get("suffix", "")
+        self.total_chunks = max(1, math.ceil(self.size / CHUNK_SIZE))
+
+        self.part_path = cache.blob_path(self.hash, ".part")
+        self.state_path = cache.blob_path(self.hash, ".part.json")
+        self.received = set()
+        self.in_flight = set()
+        self.last_activity = 0
+
+        self._resume()
+
+    def _resume(self):
+        """Pick up chunks written by an earlier, interrupted transfer"""
+        if self.part_path.exists() and self.state_path.exists():
+            try:
+                with open(self.state_path, "r") as file:
+                    self.received = set(json.load(file))
+                print(f"Resuming transfer {self.hash[:12]}: {len(self.received)}/{self.total_chunks} chunks")
+                return
+            except (json.JSONDecodeError, OSError):
+                self.received = set()
+
+        with open(self.part_path, "wb") as file:
+            file.truncate(self.size)
+
+    def _save_state(self):
+        with open(self.state_path, "w") as file:
+            json.dump(sorted(self.received), file)
+
+    @property
+    def complete(self):
+        return len(self.received) >= self.total_chunks
+
+    @property
+    def progress(self):
+        return len(self.received) / self.total_chunks
+
+    def next_request(self, now):
+        """Return the chunk indices to request now, or an empty list"""
+        if now - self.last_activity > STALL_TIMEOUT:
+            # Nothing arrived for a while, assume the in-flight chunks were lost
+            self.in_flight.clear()
+
+        free_slots = REQUEST_WINDOW - len(self.in_flight)
+        if free_slots < REQUEST_WINDOW // 2:
+            return []
+
+        indices = []
+        for index in range(self.total_chunks):
+            if index not in self.received and index not in self.in_flight:
+                indices.append(index)
+                if len(indices) >= free_slots:
+                    break
+
+        if indices:
+            self.in_flight.update(indices)
+            self.last_activity = now
+        return indices
+
+    def write_chunk(self, index, data):
+        if index in self.received or not 0 <= index < self.total_chunks:
+            return
+        with open(self.part_path, "r+b") as file:
+            file.seek(index * CHUNK_SIZE)
+            file.write(data)
+        self.received.add(index)
+        self.in_flight.discard(index)
+        self.last_activity = time.time()
+
+        if len(self.received) % REQUEST_WINDOW == 0:
+            self._save_state()
+
+    def finish(self):
+        """Verify the downloaded file and move it into the cache. Returns True on success."""
+        if hash_file(self.part_path) != self.hash:
+            print(f"Transfer {self.hash[:12]} failed verification, restarting")
+            self.received.clear()
+            self.in_flight.clear()
+            self.state_path.unlink(missing_ok=True)
+            return False
+
+        self.part_path.replace(self.cache.blob_path(self.hash, self.suffix))
+        self.state_path.unlink(missing_ok=True)
+        return True
+
+
+class MapDownloader:
+    """
+    Client side: keeps the map cache in sync with the server's manifest.
+    Runs on the client listener thread; tick() issues requests and
+    handle_chunk() stores incoming data.
+    """
+
+    def __init__(self, cache, send_request):
+        """
+        Args:
+            cache (MapCache): Local content-addressed cache
+            send_request (callable): Sends a dict message to the server
+        """
+        self.cache = cache
+        self.send_request = send_request
+        self.manifest = {}
+        self.transfers = {}  # hash -> FileTransfer
+        self.lock = threading.Lock()
+
+    def set_manifest(self, manifest):
+        """Start fetching everything in the manifest we do not have yet"""
+        manifest = sanitize_manifest(manifest)
+        with self.lock:
+            self.manifest = manifest
+            for entry in self.cache.missing_files(manifest):
+                if entry["hash"] not in self.transfers:
+                    self.transfers[entry["hash"]] = FileTransfer(self.cache, entry)
+            if self.transfers:
+                print(f"Downloading {len(self.transfers)} map files from server")
+
+    def tick(self):
+        """Request the next window of chunks for the active transfer"""
+        with self.lock:
+            if not self.transfers:
+                return
+            transfer = next(iter(self.transfers.values()))
+            indices = transfer.next_request(time.time())
+        if indices:
+            self.send_request({"type": "file_request", "hash": transfer.hash, "chunks": indices})
+
+    def handle_chunk(self, datagram):
+        content_hash, index, total, data = decode_chunk(datagram)
+        with self.lock:
+            transfer = self.transfers.get(content_hash)
+            if transfer is None:
+                return
+            transfer.write_chunk(index, data)
+            if transfer.complete and transfer.finish():
+                del self.transfers[content_hash]
+                print(f"Map file {content_hash[:12]} downloaded")
+        # Keep the pipe full without waiting for the next listener timeout
+        self.tick()
+
+    def progress(self):
+        """Overall download progress between 0.0 and 1.0"""
+        with self.lock:
+            if not self.transfers:
+                return 1.0
+            total = sum(t.total_chunks for t in self.transfers.values())
+            done = sum(len(t.received) for t in self.transfers.values())
+            return done / total if total else 1.0
+
+    def is_ready(self, map_name=None):
+        with self.lock:
+            if map_name is None:
+                return not self.transfers
+            entry = self.manifest.get(map_name)
+            if entry is None:
+                return True
+            hashes = {entry["hash"]} | {a["hash"] for a in entry.get("assets", {}).values()}
+            return not hashes & set(self.transfers)
+
+    def resolve_map(self, map_name):
+        """Path of the map JSON to load, or None if we only know the local copy"""
+        entry = self.manifest.get(map_name)
+        if entry is None:
+            return None
+        return self.cache.find_map(map_name, entry)
+
+    def resolve_asset(self, map_name, resource):
+        """Path for an asset referenced by a map, or the original resource path"""
+        entry = self.manifest.get(map_name, {}).get("assets", {}).get(resource)
+        if entry is None:
+            return resource
+        path = self.cache.find_asset(resource, entry)
+        return str(path) if path else resource
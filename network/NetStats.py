@@ -0,0 +1,206 @@
+import threading
+import time
+from collections import deque
+
+
+class ConnectionStats:
+    """
+    Rolling network statistics for a single peer connection.
+    Tracks round-trip time, jitter, loss, bandwidth per message type,
+    retransmits and queue depths. Safe to update from the networking
+    thread and read from the main thread.
+    """
+
+    def __init__(self, window_size=256, bandwidth_window=2.0):
+        self.lock = threading.Lock()
+        self.created_at = time.time()
+
+        # Round-trip time samples in seconds
+        self.rtt_samples = deque(maxlen=window_size)
+        self.smoothed_rtt = None
+        self.jitter = 0.0
+        # The peer's own smoothed RTT as it reports it, kept apart from our raw samples
+        self.client_reported_rtt = None
+
+        # Totals
+        self.packets_sent = 0
+        self.packets_received = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.retransmits = 0
+
+        # Per message type totals: type -> [packets, bytes]
+        self.sent_by_type = {}
+        self.received_by_type = {}
+
+        # Recent traffic used to compute current bandwidth: (time, bytes)
+        self.bandwidth_window = bandwidth_window
+        self.recent_sent = deque()
+        self.recent_received = deque()
+
+        # Sequence tracking per stream for loss estimation
+        self.highest_seq = {}
+        self.expected_packets = 0
+        self.received_sequenced = 0
+
+        # Latest sampled queue depths: name -> depth
+        self.queue_depths = {}
+
+    def record_sent(self, msg_type, num_bytes, retransmit=False):
+        """Record an outgoing datagram"""
+        now = time.time()
+        with self.lock:
+            self.packets_sent += 1
+            self.bytes_sent += num_bytes
+            entry = self.sent_by_type.setdefault(msg_type, [0, 0])
+            entry[0] += 1
+            entry[1] += num_bytes
+            self.recent_sent.append((now, num_bytes))
+            if retransmit:
+                self.retransmits += 1
+
+    def record_received(self, msg_type, num_bytes):
+        """Record an incoming datagram"""
+        now = time.time()
+        with self.lock:
+            self.packets_received += 1
+            self.bytes_received += num_bytes
+            entry = self.received_by_type.setdefault(msg_type, [0, 0])
+            entry[0] += 1
+            entry[1] += num_bytes
+            self.recent_received.append((now, num_bytes))
+
+    def record_rtt(self, rtt):
+        """Add a round-trip time sample (seconds)"""
+        if rtt < 0:
+            return
+        with self.lock:
+            if self.smoothed_rtt is None:
+                self.smoothed_rtt = rtt
+            else:
+                # RFC 3550 style smoothed jitter and RFC 6298 style smoothed RTT
+                self.jitter += (abs(rtt - self.smoothed_rtt) - self.jitter) / 16
+                self.smoothed_rtt += (rtt - self.smoothed_rtt) / 8
+            self.rtt_samples.append(rtt)
+
+    def set_client_reported_rtt(self, rtt):
+        """Store the smoothed RTT the peer measured itself (seconds)"""
+        if not isinstance(rtt, (int, float)) or rtt < 0:
+            return
+        with self.lock:
+            self.client_reported_rtt = rtt
+
+    def record_sequence(self, stream, seq):
+        """Record a sequence number received on a stream to estimate packet loss"""
+        if seq is None:
+            return
+        with self.lock:
+            highest = self.highest_seq.get(stream)
+            if highest is None or seq < highest - 1000:
+                # New stream or sender restarted its counter
+                self.highest_seq[stream] = seq
+                self.expected_packets += 1
+                self.received_sequenced += 1
+                return
+
+            self.received_sequenced += 1
+            if seq > highest:
+                self.expected_packets += seq - highest
+                self.highest_seq[stream] = seq
+
+    def set_queue_depth(self, name, depth):
+        """Store the current depth of a named queue"""
+        with self.lock:
+            self.queue_depths[name] = depth
+
+    def _trim_recent(self, now):
+        cutoff = now - self.bandwidth_window
+        while self.recent_sent and self.recent_sent[0][0] < cutoff:
+            self.recent_sent.popleft()
+        while self.recent_received and self.recent_received[0][0] < cutoff:
+            self.recent_received.popleft()
+
+    @staticmethod
+    def _percentile(sorted_samples, fraction):
+        if not sorted_samples:
+            return None
+        index = min(len(sorted_samples) - 1, int(round(fraction * (len(sorted_samples) - 1))))
+        return sorted_samples[index]
+
+    def get_loss_percent(self):
+        with self.lock:
+            if self.expected_packets <= 0:
+                return 0.0
+            lost = max(0, self.expected_packets - self.received_sequenced)
+            return 100.0 * lost / self.expected_packets
+
+    def snapshot(self):
+        """Return a plain dict copy of the current statistics"""
+        now = time.time()
+        loss_percent = self.get_loss_percent()
+        with self.lock:
+            self._trim_recent(now)
+            samples = sorted(self.rtt_samples)
+            window = min(self.bandwidth_window, max(now - self.created_at, 1e-6))
+            send_rate = sum(size for _, size in self.recent_sent) / window
+            receive_rate = sum(size for _, size in self.recent_received) / window
+
+            def to_ms(value):
+                return None if value is None else value * 1000.0
+
+            return {
+                "rtt_ms": {
+                    "last": to_ms(self.rtt_samples[-1]) if self.rtt_samples else None,
+                    "smoothed": to_ms(self.smoothed_rtt),
+                    "p50": to_ms(self._percentile(samples, 0.50)),
+                    "p95": to_ms(self._percentile(samples, 0.95)),
+                    "p99": to_ms(self._percentile(samples, 0.99)),
+                    "samples": len(samples),
+                    "client_reported": to_ms(self.client_reported_rtt),
+                },
+                "jitter_ms": self.jitter * 1000.0,
+                "loss_percent": loss_percent,
+                "packets_sent": self.packets_sent,
+                "packets_received": self.packets_received,
+                "bytes_sent": self.bytes_sent,
+                "bytes_received": self.bytes_received,
+                "send_rate_bps": send_rate,
+                "receive_rate_bps": receive_rate,
+                "retransmits": self.retransmits,
+                "sent_by_type": {k: list(v) for k, v in self.sent_by_type.items()},
+                "received_by_type": {k: list(v) for k, v in self.received_by_type.items()},
+                "queue_depths": dict(self.queue_depths),
+            }
+
+    def rtt_history(self):
+        """Return the RTT samples in arrival order (seconds)"""
+        with self.lock:
+            return list(self.rtt_samples)
+
+
+def message_type_of(decoded):
+    """Best-effort message type label for a decoded datagram, used for bandwidth accounting"""
+    if decoded.startswith("{"):
+        # Avoid a full JSON parse just for accounting
+        marker = '"type": "'
+        start = decoded.find(marker)
+        if start != -1:
+            start += len(marker)
+            end = decoded.find('"', start)
+            if end != -1:
+                msg_type = decoded[start:end]
+                if msg_type == "command":
+                    cmd_marker = '"command": "'
+                    cmd_start = decoded.find(cmd_marker)
+                    if cmd_start != -1:
+                        cmd_start += len(cmd_marker)
+                        cmd_end = decoded.find('"', cmd_start)
+                        if cmd_end != -1:
+                            return f"command:{decoded[cmd_start:cmd_end]}"
+                return msg_type
+        return "json"
+    if decoded.startswith("players:"):
+        return "players"
+    if decoded.startswith("connection,"):
+        return "connection"
+    return decoded.split(",", 1)[0][:32] or "empty"
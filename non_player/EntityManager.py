@@ -1,5 +1,6 @@
 import arcade
 
+from client.TextureRegistry import TextureRegistry
 
 class EntityManager:
     """
@@ -9,7 +10,7 @@ class EntityManager:
 
     def __init__(self):
         self.entity_lists = {}  # Dict of SpriteList by entity type
-        self.all_entities = arcade.SpriteList()
+        self.all_entities = TextureRegistry.sprite_list()
 
     def add_entity(self, entity):
         """Add an entity to the manager."""
@@ -17,15 +18,14 @@ class EntityManager:
 
         # Create sprite list for this type if it doesn't exist
         if entity_type not in self.entity_lists:
-            self.entity_lists[entity_type] = arcade.SpriteList()
+            self.entity_lists[entity_type] = TextureRegistry.sprite_list()
 
         self.entity_lists[entity_type].append(entity)
         self.all_entities.append(entity)
 
-    def update(self, bullet_list, effects_manager=None):
-        """Update all entities with collision detection."""
-        for entity in self.all_entities:
-            entity.update(bullet_list, effects_manager)
+    def remove_entity(self, entity):
+        """Remove an entity from all lists. Collisions are the world's business."""
+        entity.remove_from_sprite_lists()
 
     def draw(self):
         """Draw all entities, grouped by type for optimization."""
@@ -45,4 +45,4 @@ class EntityManager:
         for entity_list in self.entity_lists.values():
             for entity in entity_list:
                 if not entity.is_alive():
-                    entity.remove_from_sprite_lists()
+                    self.remove_entity(entity)
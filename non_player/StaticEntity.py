@@ -1,10 +1,17 @@
 import arcade
 import random
 
-class StaticEntity(arcade.Sprite):
+from client.SoundBank import SoundBank
+from client.SpriteView import SpriteView
+from client.TextureRegistry import TextureRegistry
+from core.State import EntityState, state_property
+
+
+class StaticEntity(SpriteView, arcade.Sprite):
     """
     A general-purpose static (non-moving) entity class for game objects like trees, rocks, walls, etc.
     Supports different entity types, customizable health, and automatic hitbox calculation.
+    Sprite view of an EntityState, which holds the hit points the simulation works with.
     """
 
     # Class-level asset mapping for different entity types
@@ -24,8 +31,14 @@ class StaticEntity(arcade.Sprite):
         # Add more entity types as needed
     }
 
-    # Class-level sound cache for optimization
-    _destroy_sound = None
+    DESTROY_SOUND = ":assets:sounds/hush.mp3"
+
+    # Simulation fields live on the state
+    entity_type = state_property("entity_type")
+    max_hp = state_property("max_hp")
+    current_hp = state_property("current_hp")
+    is_indestructible = state_property("is_indestructible")
+    entity_index = state_property("entity_index")
 
     def __init__(self, x_pos, y_pos, entity_type="bush_big", hp=3, scale=1.0, rotation=0):
         """
@@ -38,50 +51,19 @@ class StaticEntity(arcade.Sprite):
             scale (float): Scale factor for the sprite (1.0 = original size)
             rotation (float): Rotation angle in degrees
         """
+        self.state = EntityState(entity_type, x_pos, y_pos, rotation, hp)
+        self.state.view = self
+
         # Get the appropriate image for the entity type
         image_path = self.ENTITY_ASSETS.get(entity_type, self.ENTITY_ASSETS["bush_big"])
-        super().__init__(image_path, scale)
-
-        # Set position and properties
-        self.center_x = x_pos
-        self.center_y = y_pos
-        self.angle = rotation
-        self.entity_type = entity_type
-        self.max_hp = hp
-        self.current_hp = hp
-        self.is_indestructible = (hp == 0)
-
-        # Load destroy sound once per class (optimization)
-        if StaticEntity._destroy_sound is None:
-            StaticEntity._destroy_sound = arcade.load_sound(":assets:sounds/hush.mp3")
-
-    def update(self, bullet_list, effects_manager=None):
-        """
-        Handle collision detection with bullets.
-        Args:
-            bullet_list: List or SpriteList of bullets to check collision against
-            effects_manager: Effects manager for creating explosion effects
-        """
-        # Check for collisions with bullets (ALWAYS check, even for indestructible)
-        hit_list = arcade.check_for_collision_with_list(self, bullet_list)
-
-        for bullet in hit_list:
-            # Create explosion effect if effects_manager is provided
-            if effects_manager is not None:
-                from client.assets.effects.ExplosionEffect import ExplosionEffect
-                explosion = ExplosionEffect(bullet.center_x, bullet.center_y)
-                effects_manager.add_effect(explosion)
-
-            # Always remove bullet on collision (even with indestructible entities)
-            bullet.remove_from_sprite_lists()
-
-            # Only deal damage to destructible entities
-            if not self.is_indestructible:
-                # Get damage from bullet if available, otherwise default to 1
-                damage = getattr(bullet, 'damage', 1)
-                # Deal damage and check if entity was destroyed
-                if self.take_damage(damage):
-                    break  # Entity destroyed, no need to process more bullets
+        super().__init__(TextureRegistry.get(image_path), scale)
+
+        # The state collides with the texture's hit box
+        self.state.hit_box = tuple(self.local_hit_box())
+        self.sync()
+
+        # Decoded once in the shared sound bank
+        SoundBank.ensure_voices(self.DESTROY_SOUND)
 
     def take_damage(self, damage=1):
         """
@@ -94,24 +76,25 @@ class StaticEntity(arcade.Sprite):
         if self.is_indestructible:
             return False
 
-        self.current_hp -= damage
-        print(f"Entity {self.entity_type} took {damage} damage. HP: {self.current_hp}/{self.max_hp}")
+        destroyed = self.state.take_damage(damage)
+        self.show_damage(damage)
+        return destroyed
 
-        if self.current_hp <= 0:
+    def show_damage(self, damage=1):
+        """Present damage the state already took, destroying the sprite if it ran out of HP"""
+        print(f"Entity {self.entity_type} took {damage} damage. HP: {self.current_hp}/{self.max_hp}")
+        if self.current_hp <= 0 and self.sprite_lists:
             self.destroy()
-            return True  # Entity was destroyed
-
-        return False  # Entity survived
 
     def destroy(self):
         """Handle entity destruction with sound and cleanup."""
         print(f"Entity {self.entity_type} destroyed!")
-        arcade.play_sound(StaticEntity._destroy_sound)
+        SoundBank.play(self.DESTROY_SOUND)
         self.remove_from_sprite_lists()
 
     def is_alive(self):
         """Check if entity is still alive or indestructible."""
-        return self.current_hp > 0 or self.is_indestructible
+        return self.state.is_alive()
 
     def get_health_percentage(self):
         """Get current health as a percentage (useful for health bars)."""
@@ -3,6 +3,7 @@ import threading
 import json
 import time
 import random
+import secrets
 from pathlib import Path
 
 
@@ -10,6 +11,12 @@ import arcade
 
 import traceback
 
+from network.NetStats import ConnectionStats, message_type_of
+from network.Compression import compress_message
+from network.MapSync import ChunkBudget, MapLibrary, REQUEST_WINDOW
+from network.Discovery import DiscoveryResponder
+from core.Profiler import Profiler
+
 
 class Server:
     def __init__(self, ip='127.0.0.1', port=5000, window=None):
@@ -21,6 +28,10 @@ class Server:
 
         self.pending_acks = {}
 
+        # Network statistics per client address
+        self.connection_stats = {}
+        self.connection_stats_lock = threading.Lock()
+
         # Enable address reuse
         self.server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
         print(f"Server socket created at {self.ip}:{self.port}")
@@ -45,6 +56,12 @@ class Server:
 
         self.player_name = settings.get("player_name")
 
+        # How long a player lost mid-match keeps their slot before their tank is killed
+        self.reconnect_grace = settings.get("reconnect_grace", 30.0)
+
+        # Opt-in zlib compression for bulky control messages (player lists, game_start)
+        self.compress_control = settings.get("compress_control_messages", False)
+        self.compression_threshold = settings.get("compression_threshold", 160)
 
         path = project_root / ".config" / "maps"
         arcade.resources.add_resource_handle("maps", str(path.resolve()))
@@ -54,6 +71,9 @@ class Server:
             if map_file.is_file():
                 self.all_maps.append(map_file.stem)
 
+        # Content hashes of every map and its background, pushed to clients in the lobby
+        self.map_library = MapLibrary(path, arcade.resources.resolve)
+
 
 
 
@@ -69,6 +89,23 @@ class Server:
 
         self.picked_map = None
 
+        # Answers LAN discovery beacons from the Join screen
+        self.discovery = DiscoveryResponder(self.get_discovery_info)
+
+    def get_discovery_info(self):
+        """Server description sent in LAN discovery replies"""
+        with self.clients_lock:
+            player_count = len(self.clients) + 1  # clients + host
+        return {
+            "name": getattr(self, 'player_name', None) or "host",
+            "ip": self.ip,
+            "port": self.port,
+            "players": player_count,
+            "max_players": 4,
+            "map": self.picked_map,
+            "in_game": self.picked_map is not None,
+        }
+
     def start(self):
         if not self.server_color:
             self.server_color = self.assign_server_color()
@@ -77,6 +114,8 @@ class Server:
         self.server_socket.bind((self.ip, self.port))
         print(f"Server started at {self.ip}:{self.port}")
 
+        self.discovery.start()
+
         client_thread = threading.Thread(target=self.handle_clients, daemon=True)
         client_thread.start()
 
@@ -170,14 +209,162 @@ class Server:
 
                 del self.player_colors[player_id]
     def run_command_checks(self):
-        """Run periodic checks for unacknowledged commands"""
+        """Run periodic checks for unacknowledged commands and silent clients"""
         while self.running:
-            self.check_unacknowledged_commands()
+            with Profiler.scope("server.command_checks"):
+                self.check_unacknowledged_commands()
+                self.check_client_timeouts()
             time.sleep(0.5)  # Check every half second
 
+    def check_client_timeouts(self):
+        """Drop silent clients in the lobby. In game, hold their slot for
+        reconnect_grace seconds before treating them as disconnected."""
+        current_time = time.time()
+        in_game = self.picked_map is not None
+        lobby_changed = False
+        to_eliminate = []
+
+        with self.clients_lock:
+            for client in self.clients[:]:
+                last_seen = self.client_last_seen.get(client['addr'], 0)
+                if current_time - last_seen <= self.client_timeout:
+                    continue
+
+                if not in_game:
+                    self.release_player_color(client['name'])
+                    self.release_client_id(client['client_id'])
+                    self.clients.remove(client)
+                    self.client_last_seen.pop(client['addr'], None)
+                    self.drop_connection_stats(client['addr'])
+                    lobby_changed = True
+                    print(f"Client {client['addr']} ({client['name']}) timed out in lobby")
+                elif client.get('status') != 'disconnected':
+                    client['status'] = 'disconnected'
+                    client['disconnected_at'] = current_time
+                    print(f"Lost {client['name']} during game, holding slot for {self.reconnect_grace}s")
+                elif (not client.get('eliminated') and
+                      current_time - client.get('disconnected_at', current_time) > self.reconnect_grace):
+                    to_eliminate.append(client['addr'])
+
+        # Outside the lock - handle_client_disconnect_in_game takes it itself
+        for client_addr in to_eliminate:
+            self.handle_client_disconnect_in_game(client_addr)
+
+        if lobby_changed:
+            self.broadcast_player_list_update()
+            if hasattr(self, 'lobby_update_callback') and self.lobby_update_callback:
+                arcade.schedule_once(lambda dt: self.lobby_update_callback(), 0)
+
+    def build_connection_accepted(self, client, reconnected=False):
+        """Connection acceptance message carrying the client's slot and session token"""
+        return json.dumps({
+            "type": "connection_accepted",
+            "assigned_name": client['name'],
+            "assigned_color": client['color'],
+            "client_id": client['client_id'],
+            "session_token": client.get('session_token'),
+            "reconnected": reconnected
+        })
+
+    def handle_reconnect(self, session_token, addr):
+        """Give a returning client its old slot, color and client_id, even from a new address"""
+        with self.clients_lock:
+            client = next((c for c in self.clients if c.get('session_token') == session_token), None)
+            if client is not None:
+                old_addr = client['addr']
+                client['addr'] = addr
+                client.pop('status', None)
+                client.pop('disconnected_at', None)
+
+        if client is None:
+            self._sendto(json.dumps({
+                "type": "connection_rejected",
+                "reason": "Session expired"
+            }), addr, "connection_rejected")
+            print(f"Rejected reconnect from {addr}: unknown session")
+            return
+
+        if old_addr != addr:
+            # Carry bookkeeping over to the new address
+            self.client_last_seen.pop(old_addr, None)
+            with self.connection_stats_lock:
+                if old_addr in self.connection_stats:
+                    self.connection_stats[addr] = self.connection_stats.pop(old_addr)
+            for data in list(self.pending_acks.values()):
+                if data["addr"] == old_addr:
+                    data["addr"] = addr
+
+        self.client_last_seen[addr] = time.time()
+        self._sendto(self.build_connection_accepted(client, reconnected=True), addr, "connection_accepted")
+        print(f"Client {client['name']} reconnected from {addr} (was {old_addr})")
+
+        in_game = self.picked_map is not None
+        if in_game:
+            # The game view owns the world state, build the snapshot on the main thread
+            view = self.window.current_view if self.window else None
+            if hasattr(view, 'send_state_snapshot'):
+                arcade.schedule_once(lambda dt, a=addr: view.send_state_snapshot(a), 0)
+        else:
+            self.broadcast_player_list_update()
+
     def get_server_ip(self):
         return self.ip, self.port
 
+    def get_connection_stats(self, addr):
+        """Return the ConnectionStats of a connected client, created on first use. None for unknown addresses."""
+        with self.connection_stats_lock:
+            stats = self.connection_stats.get(addr)
+        if stats is not None:
+            return stats
+
+        # Snapshot read without clients_lock, _sendto is called while it is held
+        if not any(client['addr'] == addr for client in self.clients[:]):
+            return None
+        with self.connection_stats_lock:
+            return self.connection_stats.setdefault(addr, ConnectionStats())
+
+    def drop_connection_stats(self, addr):
+        """Forget the statistics of a client that left"""
+        with self.connection_stats_lock:
+            self.connection_stats.pop(addr, None)
+
+    def _sendto(self, payload, addr, msg_type=None, retransmit=False):
+        """Send a datagram to a client and record it in the connection stats"""
+        if isinstance(payload, str):
+            payload = payload.encode()
+        self.server_socket.sendto(payload, addr)
+        stats = self.get_connection_stats(addr)
+        if stats is None:
+            return
+        if msg_type is None:
+            msg_type = message_type_of(payload[:64].decode(errors="ignore"))
+        stats.record_sent(msg_type, len(payload), retransmit=retransmit)
+
+    def encode_control(self, message):
+        """Encode a control-plane message, compressing it when enabled and large enough"""
+        if not self.compress_control:
+            return message.encode()
+        return compress_message(message, self.compression_threshold)
+
+    def get_network_stats(self):
+        """Return a snapshot of per-client connection statistics keyed by player name"""
+        with self.clients_lock:
+            clients_copy = self.clients[:]
+
+        # Pending reliable commands per client (broadcast commands count for everyone)
+        pending = list(self.pending_acks.values())
+        result = {}
+        for client in clients_copy:
+            addr = client['addr']
+            stats = self.get_connection_stats(addr)
+            if stats is None:
+                continue
+            targeted = [data for data in pending if not data["addr"] or data["addr"] == addr]
+            stats.set_queue_depth("pending_acks", len(targeted))
+            stats.set_queue_depth("ack_retries", sum(data["retries"] for data in targeted))
+            result[client['name']] = stats.snapshot()
+        return result
+
     def get_players_list(self):
         """Return a list of connected players in the same format as clients expect"""
         with self.clients_lock:
@@ -203,28 +390,21 @@ class Server:
     def handle_clients(self):
         # Set a timeout, so we can check the running flag periodically
         self.server_socket.settimeout(0.5)
+        message_lap = Profiler.lap("server.handle_message")
         while self.running:
+            message_lap.stop()
             try:
                 try:
                     data, addr = self.server_socket.recvfrom(1024)
+                    message_lap.start()
 
                     # Update last seen timestamp for this client
                     self.client_last_seen[addr] = time.time()
+                    stats = self.get_connection_stats(addr)
+                    if stats is not None:
+                        stats.record_received(message_type_of(data[:64].decode(errors="ignore")), len(data))
                 except socket.timeout:
-                    # Handle timeouts - check for disconnected clients
-                    current_time = time.time()
-                    with self.clients_lock:
-                        to_remove = []
-                        for client in self.clients:
-                            client_addr = client['addr']
-                            if client_addr not in self.client_last_seen or current_time - self.client_last_seen[client_addr] > self.client_timeout:
-                                to_remove.append(client)
-
-                        for client in to_remove:
-                            self.release_player_color(client['name'])
-                            self.clients.remove(client)
-                            print(f"Client {client['addr']} ({client['name']}) timed out")
-
+                    # Client timeouts are checked by run_command_checks
                     continue
                 except OSError as e:
                     if not self.running:
@@ -260,11 +440,45 @@ class Server:
                         # Remove from pending acknowledgments
                         cmd_id = data_dict.get("id")
                         if cmd_id in self.pending_acks:
-                            self.pending_acks.pop(cmd_id)
+                            pending = self.pending_acks.pop(cmd_id)
+                            # Only sample RTT from commands that were never retransmitted (Karn's rule)
+                            stats = self.get_connection_stats(addr)
+                            if pending["retries"] == 0 and stats is not None:
+                                stats.record_rtt(time.time() - pending["time_sent"])
                             print(f"Received ACK for command {cmd_id}")
                         continue
 
+                    if data_dict.get("type") == "heartbeat":
+                        stats = self.get_connection_stats(addr)
+                        if stats is not None:
+                            # Already smoothed by the client, not a sample of ours
+                            stats.set_client_reported_rtt(data_dict.get("rtt"))
+                        # Echo the timestamp so the client can measure RTT
+                        self._sendto(json.dumps({
+                            "type": "heartbeat_ack",
+                            "timestamp": data_dict.get("timestamp")
+                        }), addr, "heartbeat_ack")
+                        continue
+
+                    if data_dict.get("type") == "file_request":
+                        # Client is missing map files - send the requested chunks. Only to
+                        # connected clients and rate limited, one small request answers with up
+                        # to REQUEST_WINDOW large chunks and a spoofed address would amplify it.
+                        with self.clients_lock:
+                            client = next((c for c in self.clients if c['addr'] == addr), None)
+                        chunks = data_dict.get("chunks")
+                        if client is None or not isinstance(chunks, list):
+                            continue
+                        budget = client.setdefault('chunk_budget', ChunkBudget())
+                        chunks = chunks[:budget.take(min(len(chunks), REQUEST_WINDOW))]
+                        for chunk in self.map_library.get_chunks(data_dict.get("hash", ""), chunks):
+                            self._sendto(chunk, addr, "file_chunk")
+                        continue
+
                     if data_dict.get("type") == "tank_state":
+                        stats = self.get_connection_stats(addr)
+                        if stats is not None:
+                            stats.record_sequence(data_dict.get("player_id"), data_dict.get("seq"))
                         # Broadcast this tank state to all other clients
                         self.game_broadcast_data(data_dict, except_ip=addr)
 
@@ -282,18 +496,27 @@ class Server:
                     if len(parts) == 2:
                         base_name = parts[1]
 
+                    # Retransmitted handshake from a client we already accepted - repeat the answer
+                    with self.clients_lock:
+                        existing_client = next((c for c in self.clients if c['addr'] == addr), None)
+                    if existing_client:
+                        self._sendto(self.build_connection_accepted(existing_client), addr, "connection_accepted")
+                        continue
+
                     validation_result = self.validate_connection_request(base_name, addr)
 
                     if validation_result["accepted"]:
                         unique_name = self.get_unique_player_name(base_name)
                         assigned_color = self.assign_color_to_player(unique_name)
                         client_id = self.assign_client_id()
+                        session_token = secrets.token_hex(16)
 
                         client_data = {
                             'addr': addr,
                             'name': unique_name,
                             'color': assigned_color,
-                            'client_id': client_id
+                            'client_id': client_id,
+                            'session_token': session_token
                         }
 
                         with self.clients_lock:
@@ -301,21 +524,11 @@ class Server:
 
                         print(f"Connection accepted: {base_name} -> {unique_name} ({assigned_color}) ID:{client_id}")
 
-                        # Send connection confirmation
-                        connection_response = json.dumps({
-                            "type": "connection_accepted",
-                            "assigned_name": unique_name,
-                            "assigned_color": assigned_color,
-                            "client_id": client_id
-                        })
                         # Send connection acceptance
-                        connection_response = json.dumps({
-                            "type": "connection_accepted",
-                            "assigned_name": unique_name,
-                            "assigned_color": assigned_color,
-                            "client_id": client_id
-                        })
-                        self.server_socket.sendto(connection_response.encode(), addr)
+                        self._sendto(self.build_connection_accepted(client_data), addr, "connection_accepted")
+
+                        # Announce map content hashes so the client can prefetch in the lobby
+                        self.send_command("map_manifest", addr, require_ack=True)
 
                         # Broadcast to clients
                         self.broadcast_player_list_update()
@@ -329,9 +542,13 @@ class Server:
                             "type": "connection_rejected",
                             "reason": validation_result["reason"]
                         })
-                        self.server_socket.sendto(rejection_response.encode(), addr)
+                        self._sendto(rejection_response, addr, "connection_rejected")
                         print(f"Connection rejected for {addr}: {validation_result['reason']}")
 
+                # Client lost its connection (e.g. NAT rebind) and wants its slot back
+                elif decoded.startswith("reconnect,"):
+                    self.handle_reconnect(decoded.split(",", 1)[1], addr)
+
                 # Handle get_players command
                 elif decoded == "get_players":
                     print(f"Client {addr} requesting player list (fallback)")
@@ -349,7 +566,7 @@ class Server:
 
                         players_json = json.dumps(serializable_players)
                         response_msg = f"players:{players_json}"
-                        self.server_socket.sendto(response_msg.encode(), addr)
+                        self._sendto(self.encode_control(response_msg), addr, "players")
                         print(f"Sent fallback player list to {addr}")
                     except Exception as e:
                         print(f"Error sending player list to {addr}: {e}")
@@ -365,7 +582,7 @@ class Server:
                         "server_color": server_color
                     })
                     print(f"Server -> get_server_name: {response}")
-                    self.server_socket.sendto(response.encode(), addr)
+                    self._sendto(response, addr, "server_name")
 
 
                 # Handle disconnect message
@@ -402,51 +619,13 @@ class Server:
                     # Remove from last_seen
                     if addr in self.client_last_seen:
                         del self.client_last_seen[addr]
+                    self.drop_connection_stats(addr)
 
-                    # Update timeout handling to also release client IDs:
-            except socket.timeout:
-                # Handle timeouts - check for disconnected clients
-                current_time = time.time()
-                with self.clients_lock:
-                    to_remove = []
-                    for client in self.clients:
-                        client_addr = client['addr']
-                        if client_addr not in self.client_last_seen or current_time - self.client_last_seen[
-                            client_addr] > self.client_timeout:
-                            to_remove.append(client)
-
-                    for client in to_remove:
-                        client_addr = client['addr']
-
-                        # Check if we're in game - if so, handle as game disconnect
-                        in_game = hasattr(self, 'picked_map') and self.picked_map is not None
-
-                        if in_game:
-                            # Handle as game disconnect (this will broadcast to other clients)
-                            self.handle_client_disconnect_in_game(client_addr)
-                        else:
-                            # Handle as lobby disconnect and release client ID
-                            self.release_player_color(client['name'])
-                            self.release_client_id(client['client_id'])
-                            self.clients.remove(client)
-                            print(f"Client {client['addr']} ({client['name']}) timed out in lobby")
-
-                            # Broadcast to clients
-                            self.broadcast_player_list_update()
-
-                            # FIX: Also update server's own lobby view
-                            if hasattr(self, 'lobby_update_callback') and self.lobby_update_callback:
-                                arcade.schedule_once(lambda dt: self.lobby_update_callback(), 0)
-
-                        # Remove from last_seen
-                        if client_addr in self.client_last_seen:
-                            del self.client_last_seen[client_addr]
-
-                continue
             except Exception as e:
                 print(f"Error handling client data: {e}")
                 traceback.print_exc()
 
+        message_lap.stop()
         print("Client handler loop exited")
 
     def validate_connection_request(self, player_name, client_addr):
@@ -531,7 +710,8 @@ class Server:
                 print("✓ No duplicate colors detected")
             print(f"==============================")
 
-    def send_command(self, command, client_addr=None, require_ack=False, max_retries=10, retry_interval=1.0):
+    def send_command(self, command, client_addr=None, require_ack=False, max_retries=10, retry_interval=1.0,
+                     data=None):
         command_id = str(time.time())
 
         if command == "map_selected":
@@ -543,6 +723,7 @@ class Server:
                 "type": "command",
                 "command": "map_selected",
                 "map_name": self.picked_map,
+                "map_hash": self.map_library.get_map_hash(self.picked_map),
                 "id": command_id,
                 "require_ack": require_ack
             }
@@ -577,19 +758,37 @@ class Server:
             }
             command_msg = json.dumps(command_data)
             print(f"Game start color assignments: {color_assignments}")  # Debug output
+        elif command == "map_manifest":
+            command_data = {
+                "type": "command",
+                "command": "map_manifest",
+                "maps": self.map_library.manifest,
+                "id": command_id,
+                "require_ack": require_ack
+            }
+            command_msg = json.dumps(command_data)
         else:
-            command_msg = json.dumps({
+            command_data = {
                 "type": "command",
                 "command": command,
                 "id": command_id,
                 "require_ack": require_ack
-            })
+            }
+            # Extra payload fields for generic commands (e.g. state_snapshot)
+            if data:
+                command_data.update(data)
+            command_msg = json.dumps(command_data)
+
+        # Encode once so retransmissions reuse the (possibly compressed) payload
+        payload = self.encode_control(command_msg)
 
         if require_ack:
             self.pending_acks[command_id] = {
                 "time_sent": time.time(),
                 "retries": 0,
                 "command": command_msg,
+                "payload": payload,
+                "msg_type": f"command:{command}",
                 "addr": client_addr,
                 "max_retries": max_retries if command != "game_start" else 20,  # More retries for game_start
                 "retry_interval": retry_interval if command != "game_start" else 0.5  # Faster retries for game_start
@@ -602,7 +801,7 @@ class Server:
                 else:
                     actual_addr = client_addr[0] if isinstance(client_addr, tuple) and isinstance(client_addr[0], tuple) else client_addr
 
-                self.server_socket.sendto(command_msg.encode(), actual_addr)
+                self._sendto(payload, actual_addr, f"command:{command}")
                 print(f"Command '{command}' -> {client_addr}")
             except Exception as e:
                 print(f"Error sending command to {client_addr}: {e}")
@@ -611,7 +810,7 @@ class Server:
                 for client in self.clients:
                     try:
                         actual_addr = client['addr']
-                        self.server_socket.sendto(command_msg.encode(), actual_addr)
+                        self._sendto(payload, actual_addr, f"command:{command}")
                     except Exception as e:
                         print(f"Error sending command to {client}: {e}")
             print(f"Command '{command}' broadcast to all clients")
@@ -619,6 +818,7 @@ class Server:
     def shutdown(self):
         print("Shutting down server...")
         self.running = False
+        self.discovery.stop()
         # Unblock the recvfrom call with a quick message to self
         try:
             temp_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
@@ -646,13 +846,13 @@ class Server:
             if current_time - data["time_sent"] > retry_interval:
                 if data["retries"] < max_retries:
                     if data["addr"]:
-                        self.server_socket.sendto(data["command"].encode(), data["addr"])
+                        self._sendto(data["payload"], data["addr"], data["msg_type"], retransmit=True)
                     else:
                         # Fix: Use dictionary keys instead of indices
                         with self.clients_lock:
                             for client in self.clients:
                                 try:
-                                    self.server_socket.sendto(data["command"].encode(), client['addr'])
+                                    self._sendto(data["payload"], client['addr'], data["msg_type"], retransmit=True)
                                 except Exception as e:
                                     print(f"Error resending command to {client['name']}: {e}")
 
@@ -671,6 +871,7 @@ class Server:
         if not self.running:
             return
 
+        msg_type = game_data.get("type") if isinstance(game_data, dict) else None
         if isinstance(game_data, (dict, list)):
             data_json = json.dumps(game_data)
         else:
@@ -693,7 +894,7 @@ class Server:
 
                 # Set timeout to prevent hanging
                 self.server_socket.settimeout(0.1)
-                self.server_socket.sendto(data_json.encode(), client_addr)
+                self._sendto(data_json, client_addr, msg_type)
                 # print(f"Sent game data to {client['name']} at {client_addr}")
 
             except socket.timeout:
@@ -769,6 +970,8 @@ class Server:
 
                 # Don't remove from clients list during game, just mark as disconnected
                 disconnected_client['status'] = 'disconnected'
+                disconnected_client['eliminated'] = True
+                self.drop_connection_stats(client_addr)
                 print(f"Player {player_name} disconnected during game - marking as dead")
 
                 # Instead of broadcasting directly from networking thread,
@@ -861,10 +1064,11 @@ class Server:
 
             # Broadcast to all clients instantly
             message_json = json.dumps(update_message)
+            payload = self.encode_control(message_json)
             with self.clients_lock:
                 for client in self.clients:
                     try:
-                        self.server_socket.sendto(message_json.encode(), client['addr'])
+                        self._sendto(payload, client['addr'], "player_list_update")
                         print(f"Sent instant update to {client['name']}: {message_json[:100]}...")
                     except Exception as e:
                         print(f"Error broadcasting to {client['name']}: {e}")